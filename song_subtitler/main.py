@@ -4,10 +4,12 @@ import sys
 import traceback
 import argparse
 import re
+import time
 import urllib.parse # Needed for YouTube ID extraction
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
-from video_maker.subtitle_generator import SubtitleGenerator
-from video_maker.video_creator import VideoCreator
+from video_maker.subtitle_generator import SubtitleGenerator, DEFAULT_TRANSLATION_WORKERS
+from video_maker.video_creator import VideoCreator, RENDERERS, output_video_path, render_video_job
 
 CONFIG_DIR = 'config'
 CONFIG_FILE_NAME = 'video_config.json'
@@ -342,6 +344,136 @@ def validate_and_get_song_details(selected_song, songs_directory, lyrics_directo
     return song_name, artist_name, youtube_url, expected_mp3_path, lyrics_content, source_language # Return language
 
 
+# --- מצב אצווה (--all / --filter) ---
+
+DEFAULT_GEMINI_JOBS = 2
+DEFAULT_RENDER_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+
+def filter_songs(songs, pattern=None):
+    """מחזיר את השירים התקינים ברשימה, ואם צוין pattern - רק כאלה ששמם או שם הזמר מכילים אותו."""
+    valid_songs = [song for song in songs if isinstance(song, dict) and song.get('name') and song.get('youtube_url')]
+    if not pattern:
+        return valid_songs
+    pattern_lower = pattern.lower()
+    return [song for song in valid_songs
+            if pattern_lower in song['name'].lower() or pattern_lower in (song.get('artist') or '').lower()]
+
+def song_video_up_to_date(video_path, input_paths):
+    """הוידאו מעודכן אם הוא קיים וחדש יותר מכל קבצי הקלט שלו (MP3, כתוביות, קונפיגורציה)."""
+    if not os.path.exists(video_path):
+        return False
+    video_mtime = os.path.getmtime(video_path)
+    return all(os.path.getmtime(path) <= video_mtime for path in input_paths if path and os.path.exists(path))
+
+def print_batch_report(results, total_seconds):
+    status_names = {'done': 'הושלם', 'skipped': 'מעודכן (דולג)', 'failed': 'נכשל'}
+    print("\n--- דוח אצווה ---")
+    for result in results:
+        detail = f" - {result['detail']}" if result.get('detail') else ""
+        print(f"  {result['name']}: {status_names[result['status']]}{detail} | "
+              f"כתוביות {result['subtitles_seconds']:.1f} שנ' | רינדור {result['render_seconds']:.1f} שנ'")
+    counts = {status: sum(1 for result in results if result['status'] == status) for status in status_names}
+    print(f"סה\"כ {len(results)} שירים: {counts['done']} הושלמו, {counts['skipped']} דולגו, {counts['failed']} נכשלו. "
+          f"זמן כולל: {total_seconds:.1f} שנ'")
+
+def run_batch(songs, args, api_key):
+    """
+    מעבד את כל השירים שנבחרו: מדלג על שירים שהוידאו שלהם מעודכן, מריץ תמלול ותרגום ב-Gemini
+    לכמה שירים במקביל (עד args.jobs), ושולח כל שיר לרינדור במאגר תהליכים ברגע שהכתוביות שלו מוכנות.
+    מחזיר את רשימת התוצאות לכל שיר.
+    """
+    batch_start = time.time()
+    selected_songs = filter_songs(songs, args.filter)
+    # הליבות מחולקות בין תהליכי הרינדור, כדי שתהליכי הכתוביות וה-ffmpeg של כל רינדור לא יתחרו זה בזה
+    cpu_budget = max(1, (os.cpu_count() or 1) // args.render_workers)
+    print(f"\n--- מצב אצווה: {len(selected_songs)} שירים "
+          f"(עד {args.jobs} בקשות Gemini במקביל, {args.render_workers} תהליכי רינדור, {cpu_budget} ליבות לכל רינדור) ---")
+
+    subtitle_generator = SubtitleGenerator(
+        api_key=api_key,
+        srt_output_dir=SRT_FILES_DIR,
+        instructions_filepath=SYSTEM_INSTRUCTIONS_PATH,
+        translation_workers=args.translation_workers
+    )
+
+    results = []
+    pending = []
+    for song in selected_songs:
+        result = {'name': song['name'], 'status': 'failed', 'detail': '', 'subtitles_seconds': 0.0, 'render_seconds': 0.0}
+        results.append(result)
+        details = validate_and_get_song_details(song, SONGS_DIR, LYRICS_DIR)
+        song_name, artist_name, youtube_link, mp3_file_path, lyrics_content, source_language = details
+        if not all([song_name, youtube_link, mp3_file_path]):
+            result['detail'] = "פרטי שיר חסרים או קובץ MP3 לא נמצא"
+            continue
+
+        output_base_name = os.path.splitext(os.path.basename(mp3_file_path))[0]
+        srt_paths = subtitle_generator.cached_subtitle_paths(source_language, song_name, youtube_link, mp3_file_path, lyrics_content)
+        video_path = output_video_path(OUTPUT_DIR, output_base_name)
+        if not args.force_regenerate and srt_paths and song_video_up_to_date(video_path, [mp3_file_path, CONFIG_PATH, *srt_paths]):
+            result['status'] = 'skipped'
+            continue
+        pending.append((result, details, output_base_name))
+
+    def generate_subtitles(details):
+        song_name, _, youtube_link, mp3_file_path, lyrics_content, source_language = details
+        start = time.time()
+        subs = subtitle_generator.generate_or_load_subtitles(
+            source_language=source_language,
+            song_name=song_name,
+            youtube_url=youtube_link,
+            mp3_audio_path=mp3_file_path,
+            lyrics_content=lyrics_content,
+            force_regenerate=args.force_regenerate
+        )
+        return subs, time.time() - start
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as gemini_pool, \
+         ProcessPoolExecutor(max_workers=args.render_workers) as render_pool:
+        subtitle_futures = {
+            gemini_pool.submit(generate_subtitles, details): (result, details, output_base_name)
+            for result, details, output_base_name in pending
+        }
+        render_futures = {}
+        for future in as_completed(subtitle_futures):
+            result, details, output_base_name = subtitle_futures[future]
+            try:
+                (source_subs, target_subs), result['subtitles_seconds'] = future.result()
+            except Exception as e:
+                result['detail'] = f"שגיאה ביצירת כתוביות: {e}"
+                continue
+            if source_subs is None and target_subs is None:
+                result['detail'] = "לא ניתן היה ליצור או לטעון כתוביות"
+                continue
+
+            song_name, artist_name, _, mp3_file_path, _, _ = details
+            print(f"\nכתוביות מוכנות עבור '{song_name}', שולח לרינדור...")
+            render_futures[render_pool.submit(render_video_job, resolved_config, dict(
+                mp3_path=mp3_file_path,
+                song_title_text=song_name,
+                artist_name_text=artist_name,
+                source_subtitle_data=source_subs,
+                target_subtitle_data=target_subs,
+                output_video_filename_base=output_base_name
+            ), cpu_budget)] = result
+
+        for future in as_completed(render_futures):
+            result = render_futures[future]
+            try:
+                created_video_path, result['render_seconds'] = future.result()
+            except Exception as e:
+                result['detail'] = f"שגיאה ברינדור: {e}"
+                continue
+            if created_video_path:
+                result['status'] = 'done'
+            else:
+                result['detail'] = "יצירת הוידאו נכשלה"
+
+    print_batch_report(results, time.time() - batch_start)
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description="יוצר סרטוני כתוביות YouTube עם Gemini API.")
 
@@ -351,6 +483,10 @@ def main():
                        help="בחר שיר לעיבוד לפי מספר אינדקס (מהרשימה שתוצג), YouTube Video ID, או שם השיר המדויק (case-insensitive).")
     group.add_argument("--add", action='store_true',
                        help="הוסף שיר חדש לרשימה ועבד אותו. דורש שימוש ב--name ו--url (ו--artist אופציונלי).")
+    group.add_argument("--all", action='store_true',
+                       help="מצב אצווה: עבד את כל השירים ברשימה, תוך דילוג על שירים שהוידאו שלהם מעודכן.")
+    group.add_argument("--filter", metavar="TEXT",
+                       help="מצב אצווה: עבד רק שירים ששמם או שם הזמר מכילים את הטקסט (ללא תלות באותיות גדולות/קטנות).")
 
     # Arguments for adding a new song (used only if --add is specified)
     parser.add_argument("--name", help="שם השיר להוספה (חובה עם --add).")
@@ -364,9 +500,21 @@ def main():
                         help="אלץ יצירה מחדש של קבצי הכתוביות (SRT), גם אם הם קיימים.")
     parser.add_argument("-l", "--language", choices=['en', 'yi'],
                         help="ציין במפורש את שפת המקור של השיר ('en' לאנגלית, 'yi' ליידיש). עוקף הגדרה ב-JSON.")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_GEMINI_JOBS,
+                        help=f"מצב אצווה: מספר השירים המרבי שמתומללים ומתורגמים ב-Gemini במקביל (ברירת מחדל: {DEFAULT_GEMINI_JOBS}).")
+    parser.add_argument("--render-workers", type=int, default=DEFAULT_RENDER_WORKERS,
+                        help=f"מצב אצווה: מספר תהליכי רינדור הוידאו במקביל (ברירת מחדל: {DEFAULT_RENDER_WORKERS}).")
+    parser.add_argument("--translation-workers", type=int, default=DEFAULT_TRANSLATION_WORKERS,
+                        help=f"מספר המקטעים של שיר ארוך שמתורגמים לעברית ב-Gemini במקביל (ברירת מחדל: {DEFAULT_TRANSLATION_WORKERS}).")
+    parser.add_argument("--renderer", choices=RENDERERS,
+                        help="מנוע הרינדור: 'moviepy' (הרכבת כל פריים בפייתון), 'ass' (צריבת הכתוביות ב-ffmpeg/libass על תמונת רקע) או 'stills' (תמונה אחת לכל כתובית, מקודדת כמצגת עם קובץ ה-MP3 המקורי). עוקף את video_settings.renderer.")
 
 
     args = parser.parse_args()
+    if args.jobs < 1 or args.render_workers < 1 or args.translation_workers < 1:
+        parser.error("--jobs, --render-workers ו---translation-workers חייבים להיות לפחות 1.")
+    if args.renderer:
+        resolved_config['video_settings']['renderer'] = args.renderer
 
     print("--- יוצר וידאו כתוביות YouTube ---")
 
@@ -380,6 +528,10 @@ def main():
     if songs is None:
         sys.exit(1) # Error message already printed by load_song_list
 
+    if args.all or args.filter:
+        results = run_batch(songs, args, api_key)
+        sys.exit(1 if any(result['status'] == 'failed' for result in results) else 0)
+
     selected_song_data = None
     cli_lyrics_path = args.lyrics_file # Get lyrics path from CLI args
     cli_language_override = args.language # Get language override from CLI
@@ -470,6 +622,17 @@ def main():
         print("שגיאה באימות פרטי השיר או מציאת קובץ MP3. יוצא מהתוכנית.")
         sys.exit(1)
 
+    # --- הכנת הוידאו ברקע ---
+    # טעינת הפונטים, האודיו, הרקעים וכרטיס הכותרת אינה תלויה בכתוביות, ולכן רצה במקביל לקריאות ל-Gemini.
+    def prepare_video_creator():
+        video_creator = VideoCreator(resolved_config)
+        video_creator.prepare(mp3_file_path, song_name, artist_name)
+        return video_creator
+
+    prepare_executor = ThreadPoolExecutor(max_workers=1)
+    video_creator_future = prepare_executor.submit(prepare_video_creator)
+    prepare_executor.shutdown(wait=False)
+
     # --- Subtitle Generation/Loading ---
     print("\n--- יצירה או טעינה של כתוביות ---")
     if args.force_regenerate:
@@ -478,7 +641,8 @@ def main():
     subtitle_generator = SubtitleGenerator(
         api_key=api_key,
         srt_output_dir=SRT_FILES_DIR,
-        instructions_filepath=SYSTEM_INSTRUCTIONS_PATH
+        instructions_filepath=SYSTEM_INSTRUCTIONS_PATH,
+        translation_workers=args.translation_workers
     )
 
     source_subs, target_subs = subtitle_generator.generate_or_load_subtitles(
@@ -506,7 +670,7 @@ def main():
     # --- Video Creation ---
     print("\n--- יצירת הוידאו ---")
     try:
-        video_creator = VideoCreator(resolved_config)
+        video_creator = video_creator_future.result() # מחכה לסיום ההכנה (אם עדיין לא הסתיימה)
 
         output_base_name = os.path.splitext(os.path.basename(mp3_file_path))[0]
 
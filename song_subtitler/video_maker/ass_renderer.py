@@ -0,0 +1,122 @@
+import struct
+
+from PIL import ImageColor
+
+# Builds an Advanced SubStation Alpha (ASS) script for ffmpeg's libass filter.
+# Lines are placed with explicit \pos tags using the layout computed by VideoCreator,
+# so the burned-in subtitles follow the same wrapping and positions as the PIL renderer.
+
+
+def format_time_ass(seconds):
+    """Formats seconds as H:MM:SS.cc (ASS uses centiseconds)."""
+    centiseconds = int(round(max(0.0, seconds) * 100))
+    seconds_total, cs = divmod(centiseconds, 100)
+    minutes_total, secs = divmod(seconds_total, 60)
+    hours, minutes = divmod(minutes_total, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{cs:02d}"
+
+
+def ass_color(color, alpha=0):
+    """Converts a PIL color ("black", "#9FF0F4", ...) to ASS &HAABBGGRR."""
+    r, g, b = ImageColor.getrgb(color)[:3]
+    return f"&H{alpha:02X}{b:02X}{g:02X}{r:02X}"
+
+
+def escape_ass_text(text):
+    """Escapes characters that libass would read as override tags or line breaks (\\N, \\h)."""
+    return text.replace('\\', '\\\u2060').replace('{', '(').replace('}', ')').replace('\n', ' ')
+
+
+def font_win_metrics(font_path):
+    """
+    Returns (usWinAscent, usWinDescent) of a TrueType/OpenType font in em units, or None.
+    libass sizes a font so that win ascent + descent equals the ASS font size, while PIL
+    sizes it by the em square, so these are needed to match the PIL glyph scale.
+    """
+    try:
+        with open(font_path, 'rb') as f:
+            data = f.read()
+        num_tables = struct.unpack('>H', data[4:6])[0]
+        tables = {}
+        for i in range(num_tables):
+            tag, _, offset, _ = struct.unpack('>4sIII', data[12 + 16 * i:28 + 16 * i])
+            tables[tag] = offset
+        units_per_em = struct.unpack('>H', data[tables[b'head'] + 18:tables[b'head'] + 20])[0]
+        win_ascent, win_descent = struct.unpack('>HH', data[tables[b'OS/2'] + 74:tables[b'OS/2'] + 78])
+        return win_ascent / units_per_em, win_descent / units_per_em
+    except (OSError, KeyError, struct.error) as e:
+        print(f"Warning: Could not read font metrics from '{font_path}': {e}")
+        return None
+
+
+def ass_font_size(font, font_path):
+    """ASS font size that renders glyphs at the same scale as the PIL font."""
+    metrics = font_win_metrics(font_path)
+    if metrics:
+        return round(font.size * sum(metrics))
+    return sum(font.getmetrics())
+
+
+def ass_line_offset(font, font_path):
+    """
+    Pixels to subtract from a PIL text position to place the same line with \\an7\\pos:
+    libass puts the baseline the win ascent below the top, PIL the font's own ascent.
+    """
+    metrics = font_win_metrics(font_path)
+    if not metrics:
+        return 0
+    return font.size * metrics[0] - font.getmetrics()[0]
+
+
+def ass_style(name, font, font_path, style_cfg):
+    """
+    One [V4+ Styles] line for a subtitle style from video_config.json.
+    font is the loaded PIL font: its family name is what libass looks up in the fonts dir.
+    Encoding -1 lets libass detect the base direction per line (as python-bidi does).
+    """
+    family, face = font.getname()
+    bold = -1 if 'bold' in (face or '').lower() else 0
+    font_size = ass_font_size(font, font_path)
+    stroke_color = style_cfg.get('stroke_color')
+    stroke_width = style_cfg.get('stroke_width', 0) if stroke_color else 0
+    fields = [
+        name, family, font_size,
+        ass_color(style_cfg['color']), ass_color(style_cfg['color']),
+        ass_color(stroke_color or 'black'), ass_color('black', alpha=0xFF),
+        bold, 0, 0, 0, 100, 100, 0, 0,
+        1, stroke_width, 0,
+        7, 0, 0, 0, -1,
+    ]
+    return "Style: " + ",".join(str(field) for field in fields)
+
+
+def build_ass_script(resolution, styles, events):
+    """
+    resolution: (width, height) of the video.
+    styles: list of lines from ass_style().
+    events: list of (start, end, style_name, x, y, text) - one positioned line each.
+    """
+    video_w, video_h = resolution
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {video_w}",
+        f"PlayResY: {video_h}",
+        "WrapStyle: 2",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+        "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        *styles,
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    for start, end, style_name, x, y, text in events:
+        lines.append(
+            f"Dialogue: 0,{format_time_ass(start)},{format_time_ass(end)},{style_name},,0,0,0,,"
+            f"{{\\an7\\pos({x:.0f},{y:.0f})}}{escape_ass_text(text)}"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,29 @@
+import threading
+from PIL import ImageFont
+
+# Process-wide font registry keyed by (font_path, font_size).
+_fonts = {}
+_lock = threading.Lock()
+
+
+def get_font(font_path, font_size):
+    """Returns a shared FreeTypeFont for (font_path, font_size), loading it from disk only once."""
+    key = (font_path, font_size)
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+
+    with _lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = ImageFont.truetype(font_path, font_size)
+            _fonts[key] = font
+    return font
+
+
+def preload_fonts(font_specs):
+    """Loads every (font_path, font_size) pair up front so rendering never touches the disk."""
+    for font_path, font_size in font_specs:
+        if font_path and font_size:
+            get_font(font_path, font_size)
+    print(f"Preloaded {len(_fonts)} fonts.")
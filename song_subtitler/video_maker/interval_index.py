@@ -0,0 +1,29 @@
+import bisect
+
+
+class IntervalIndex:
+    """
+    Time -> interval lookup in O(log n).
+
+    Each interval is treated as half-open [start, end). The set of
+    intervals containing t can only change at an interval edge, so it is resolved once
+    per edge when the index is built and then found by bisecting the sorted edges.
+    """
+
+    def __init__(self, intervals):
+        bounds = list(intervals)
+        self.edges = sorted({edge for bound in bounds for edge in bound})
+        self.active = [
+            tuple(i for i, (start, end) in enumerate(bounds) if start <= edge < end)
+            for edge in self.edges
+        ]
+
+    def lookup_all(self, t):
+        """Indices of all intervals containing t, in list order."""
+        pos = bisect.bisect_right(self.edges, t) - 1
+        return self.active[pos] if pos >= 0 else ()
+
+    def lookup(self, t):
+        """Index of the first interval (in list order) containing t, or None."""
+        active = self.lookup_all(t)
+        return active[0] if active else None
@@ -0,0 +1,91 @@
+import json
+
+
+class SubtitleStreamParser:
+    """
+    Incremental parser for a streamed JSON array of objects (the Gemini subtitle response).
+    feed() takes each text chunk and returns the objects completed by it, so callers can
+    use subtitles while the stream is still running. Anything before the first '[' (such as
+    a Markdown fence) is skipped, and a single top-level object is accepted as a one-item array.
+    If the stream stops mid-array, the objects completed so far have already been returned
+    and `truncated` tells the caller the result is partial.
+    """
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.object_start = None
+        self.started = False
+        self.single_object = False
+        self.finished = False
+        self.errors = []
+
+    @property
+    def truncated(self):
+        return self.started and not self.finished
+
+    def feed(self, text):
+        """Scans a chunk and returns the list of objects (dicts) completed in it."""
+        if self.finished or not text:
+            return []
+        self.buffer += text
+        completed = []
+        buffer = self.buffer
+
+        for i in range(self.pos, len(buffer)):
+            ch = buffer[i]
+            if not self.started:
+                if ch == '[':
+                    self.started = True
+                    self.depth = 1
+                elif ch == '{':
+                    # A single object instead of an array: parse it as the array's only item
+                    self.started = self.single_object = True
+                    self.depth = 2
+                    self.object_start = i
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch == '"':
+                self.in_string = True
+            elif ch in '[{':
+                if ch == '{' and self.depth == 1:
+                    self.object_start = i
+                self.depth += 1
+            elif ch in ']}':
+                self.depth -= 1
+                if ch == '}' and self.depth == 1 and self.object_start is not None:
+                    self._emit(buffer[self.object_start:i + 1], completed)
+                    self.object_start = None
+                    if self.single_object:
+                        self.depth = 0
+                if self.depth == 0:
+                    self.finished = True
+                    break
+
+        # Keep only the unfinished object (if any) so the buffer does not grow with the stream
+        if self.object_start is None:
+            self.buffer, self.pos = '', 0
+        else:
+            self.buffer = buffer[self.object_start:]
+            self.pos = len(buffer) - self.object_start
+            self.object_start = 0
+        return completed
+
+    def _emit(self, object_text, completed):
+        try:
+            item = json.loads(object_text)
+        except json.JSONDecodeError as e:
+            self.errors.append(f"{e}: {object_text[:80]}")
+            return
+        completed.append(item)
@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+import datetime
+import threading
+
+CACHE_SUBDIR = 'cache'
+MANIFEST_FILE_NAME = 'manifest.json'
+
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SubtitleCache:
+    """
+    Content-addressed store for generated SRT files.
+    Each entry is keyed by a hash of everything that determines the Gemini output
+    (audio, lyrics, prompts, model, language and, for translations, the source subtitles),
+    so renaming a song still hits the cache while any changed input misses it.
+    manifest.json records the inputs behind every key and the SRT file exported for it.
+    """
+    def __init__(self, srt_output_dir):
+        self.cache_dir = os.path.join(srt_output_dir, CACHE_SUBDIR)
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_FILE_NAME)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock() # Batch mode generates several songs from threads
+        self._file_hashes = {}
+        self.entries = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read subtitle cache manifest '{self.manifest_path}': {e}. Starting with an empty cache.")
+
+    @staticmethod
+    def make_key(inputs):
+        return sha256_text(json.dumps(inputs, sort_keys=True, ensure_ascii=False))
+
+    def file_hash(self, path):
+        """sha256 of a file's bytes, memoized per (path, size, mtime)."""
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+        digest = self._file_hashes.get(memo_key)
+        if digest is None:
+            digest = self._file_hashes[memo_key] = sha256_file(path)
+        return digest
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.srt")
+
+    def lookup(self, key):
+        """Path of the cached SRT for key, or None if it was never recorded or the file is gone."""
+        with self._lock:
+            recorded = key in self.entries
+        if recorded and os.path.exists(self.path(key)):
+            return self.path(key)
+        return None
+
+    def is_recorded_export(self, export_path):
+        """True if some cache entry was exported to this SRT file name."""
+        export_name = os.path.basename(export_path)
+        with self._lock:
+            return any(entry.get('srt_file') == export_name for entry in self.entries.values())
+
+    def has_export(self, export_path, inputs):
+        """True if an entry exported to this SRT file name was generated with all of `inputs` (a subset of its inputs)."""
+        export_name = os.path.basename(export_path)
+        with self._lock:
+            return any(
+                entry.get('srt_file') == export_name
+                and all(entry.get('inputs', {}).get(name) == value for name, value in inputs.items())
+                for entry in self.entries.values()
+            )
+
+    def record(self, key, inputs, song_name, export_path):
+        with self._lock:
+            self.entries[key] = {
+                'song': song_name,
+                'srt_file': os.path.basename(export_path),
+                'inputs': inputs,
+                'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            }
+            temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.manifest_path)
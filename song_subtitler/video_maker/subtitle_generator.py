@@ -6,6 +6,86 @@ import yaml
 from google import genai # Using the original import structure
 from google.genai import types # Using the original import structure
 import datetime # Needed for SRT time formatting
+from concurrent.futures import ThreadPoolExecutor
+
+from .subtitle_cache import SubtitleCache, sha256_text
+from .stream_json import SubtitleStreamParser
+
+# Long songs are translated in chunks of TRANSLATION_CHUNK_SIZE subtitles, each sent with
+# TRANSLATION_CONTEXT_OVERLAP neighbouring subtitles on both sides for context.
+TRANSLATION_CHUNK_SIZE = 20
+TRANSLATION_CONTEXT_OVERLAP = 3
+DEFAULT_TRANSLATION_WORKERS = 4
+
+
+def translation_window_bounds(index):
+    """(start, end) slice of the source subtitles sent with translation chunk `index`, context included."""
+    chunk_start = index * TRANSLATION_CHUNK_SIZE
+    return max(0, chunk_start - TRANSLATION_CONTEXT_OVERLAP), chunk_start + TRANSLATION_CHUNK_SIZE + TRANSLATION_CONTEXT_OVERLAP
+
+
+class ChunkedTranslation:
+    """
+    Runs the Hebrew translation chunks of one song on a bounded thread pool.
+    add_source_item() is the on_item callback of the transcription stream: a chunk is sent
+    as soon as its subtitles and the context after them have arrived, so translation overlaps
+    the rest of the transcription. finish() sends the chunks that are left once the full
+    source list is known and stitches the results by id.
+    """
+    def __init__(self, generator, translation_config, user_input_template, language_context):
+        self.generator = generator
+        self.translation_config = translation_config
+        self.user_input_template = user_input_template
+        self.language_context = language_context
+        self.pool = ThreadPoolExecutor(max_workers=generator.translation_workers)
+        self.streamed_subs = []
+        self.started = {} # chunk index -> (window_subs, future)
+
+    def _submit(self, index, window_subs):
+        future = self.pool.submit(
+            self.generator._translate_window, window_subs, self.translation_config,
+            self.user_input_template, f"{self.language_context} [chunk {index + 1}]"
+        )
+        self.started[index] = (window_subs, future)
+
+    def add_source_item(self, item):
+        self.streamed_subs.append(item)
+        index = len(self.started)
+        window_start, window_end = translation_window_bounds(index)
+        if len(self.streamed_subs) >= window_end:
+            self._submit(index, self.streamed_subs[window_start:window_end])
+
+    def finish(self, source_subs):
+        """Translates source_subs, reusing the chunks started during streaming. Returns (data, complete)."""
+        windows = self.generator._translation_windows(source_subs)
+        if len(windows) == 1:
+            return self.generator._translate_window(source_subs, self.translation_config, self.user_input_template, self.language_context)
+
+        early_chunks = len(self.started)
+        for index, (_, window_subs) in enumerate(windows):
+            started = self.started.get(index)
+            if started is None or started[0] != window_subs:
+                if started is not None:
+                    started[1].cancel()
+                self._submit(index, window_subs)
+        # Chunks past the final list (can only happen if the parsed source differs from the stream)
+        for index in [index for index in self.started if index >= len(windows)]:
+            self.started.pop(index)[1].cancel()
+
+        if early_chunks:
+            print(f"Translating {len(source_subs)} subtitles in {len(windows)} chunks "
+                  f"({early_chunks} started during transcription, {self.generator.translation_workers} requests in parallel)...")
+        else:
+            print(f"Translating {len(source_subs)} subtitles in {len(windows)} chunks ({self.generator.translation_workers} requests in parallel)...")
+        results = [self.started[index][1].result() for index in range(len(windows))]
+        return self.generator._stitch_translation(windows, results)
+
+    def shutdown(self):
+        """Cancels every chunk that has not been sent yet. Requests already in flight cannot be recalled."""
+        in_flight = [future for _, future in self.started.values() if not future.cancel() and not future.done()]
+        if in_flight:
+            print(f"Discarding {len(in_flight)} Hebrew translation chunk requests that were already sent.")
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
 class SubtitleGenerator:
     """
@@ -14,10 +94,11 @@ class SubtitleGenerator:
     Optionally uses provided lyrics content to improve transcription.
     Allows forcing regeneration of subtitles.
     Adds song name to SRT filenames for user convenience.
+    Reuses generated subtitles through a content-hashed cache (see SubtitleCache).
     Supports multiple source languages (English, Yiddish) using the original API structure.
-    Uses a generic translation prompt.
+    Uses a generic translation prompt, translating long subtitle sets in parallel chunks.
     """
-    def __init__(self, api_key, srt_output_dir, instructions_filepath):
+    def __init__(self, api_key, srt_output_dir, instructions_filepath, translation_workers=DEFAULT_TRANSLATION_WORKERS):
         """
         Initializes the SubtitleGenerator using the original API structure.
 
@@ -25,6 +106,7 @@ class SubtitleGenerator:
             api_key (str): The Gemini API key.
             srt_output_dir (str): Directory to save/load SRT subtitle files.
             instructions_filepath (str): Path to the YAML file with API instructions.
+            translation_workers (int, optional): Maximum number of translation chunks sent to the API at once.
         """
         if not api_key:
             raise ValueError("Gemini API key is required.")
@@ -32,8 +114,10 @@ class SubtitleGenerator:
         self.srt_output_dir = srt_output_dir
         # *** Using the EXACT original model name ***
         self.model_name = "gemini-2.5-pro-exp-03-25"
+        self.translation_workers = max(1, translation_workers)
         self.client = self._initialize_client() # Uses the original client initialization
         self._ensure_dir_exists(self.srt_output_dir)
+        self.cache = SubtitleCache(self.srt_output_dir)
 
         self.instructions_filepath = instructions_filepath
         self.instructions = self._load_instructions(self.instructions_filepath)
@@ -280,6 +364,41 @@ class SubtitleGenerator:
         else:
             return raw_text.strip()
 
+    def _process_subtitle_item(self, item, item_index, language_name):
+        """
+        Validates one subtitle object FROM API and converts its "MM:SS.ms" time strings to float seconds.
+        Raises ValueError if the item is not a dictionary with the required keys.
+        """
+        if not isinstance(item, dict):
+            raise ValueError(f"Item at index {item_index} in {language_name} JSON list is not a dictionary.")
+
+        required_keys = {"id", "start_time", "end_time", "text"}
+        missing_keys = required_keys - item.keys()
+        if missing_keys:
+             raise ValueError(f"Dictionary at index {item_index} in {language_name} JSON is missing required keys: {missing_keys}. Found: {item.keys()}")
+
+        processed_item = {}
+        processed_item['id'] = item['id']
+        processed_item['text'] = item['text']
+
+        for time_key in ["start_time", "end_time"]:
+            time_value = item.get(time_key)
+            if isinstance(time_value, str) and re.match(r"\d{2}:\d{2}\.\d{3}", time_value):
+                try:
+                    minutes, seconds_milliseconds = time_value.split(":")
+                    seconds, milliseconds = seconds_milliseconds.split(".")
+                    total_seconds = int(minutes) * 60 + int(seconds) + int(milliseconds) / 1000.0
+                    processed_item[time_key] = float(total_seconds)
+                except ValueError as e:
+                    print(f"Error converting time string '{time_value}' to float in {language_name} for key '{time_key}' at index {item_index}. Setting to 0. Error: {e}")
+                    processed_item[time_key] = 0.0
+            elif isinstance(time_value, (int, float)):
+                 processed_item[time_key] = float(time_value)
+            else:
+                 print(f"Warning: Unexpected time format '{time_value}' (type: {type(time_value)}) in {language_name} for key '{time_key}' at index {item_index}. Setting to 0.")
+                 processed_item[time_key] = 0.0
+        return processed_item
+
     def _parse_json_response(self, json_text, language_name):
         """
         Parses JSON response FROM API, validates structure, and returns the list.
@@ -296,38 +415,8 @@ class SubtitleGenerator:
                 if isinstance(data, dict): data = [data] # Handle case where API returns single object instead of array
                 else: raise ValueError("JSON response is not a list.")
 
-            processed_data = []
-            if data:
-                for item_index, item in enumerate(data):
-                    if not isinstance(item, dict):
-                        raise ValueError(f"Item at index {item_index} in {language_name} JSON list is not a dictionary.")
-
-                    required_keys = {"id", "start_time", "end_time", "text"}
-                    missing_keys = required_keys - item.keys()
-                    if missing_keys:
-                         raise ValueError(f"Dictionary at index {item_index} in {language_name} JSON is missing required keys: {missing_keys}. Found: {item.keys()}")
-
-                    processed_item = {}
-                    processed_item['id'] = item['id']
-                    processed_item['text'] = item['text']
-
-                    for time_key in ["start_time", "end_time"]:
-                        time_value = item.get(time_key)
-                        if isinstance(time_value, str) and re.match(r"\d{2}:\d{2}\.\d{3}", time_value):
-                            try:
-                                minutes, seconds_milliseconds = time_value.split(":")
-                                seconds, milliseconds = seconds_milliseconds.split(".")
-                                total_seconds = int(minutes) * 60 + int(seconds) + int(milliseconds) / 1000.0
-                                processed_item[time_key] = float(total_seconds)
-                            except ValueError as e:
-                                print(f"Error converting time string '{time_value}' to float in {language_name} for key '{time_key}' at index {item_index}. Setting to 0. Error: {e}")
-                                processed_item[time_key] = 0.0
-                        elif isinstance(time_value, (int, float)):
-                             processed_item[time_key] = float(time_value)
-                        else:
-                             print(f"Warning: Unexpected time format '{time_value}' (type: {type(time_value)}) in {language_name} for key '{time_key}' at index {item_index}. Setting to 0.")
-                             processed_item[time_key] = 0.0
-                    processed_data.append(processed_item)
+            processed_data = [self._process_subtitle_item(item, item_index, language_name)
+                              for item_index, item in enumerate(data)]
             return processed_data
         except json.JSONDecodeError as e:
             print(f"Error: Failed to decode JSON response for {language_name}. Error: {e}")
@@ -383,64 +472,145 @@ class SubtitleGenerator:
         hebrew_srt_filename = os.path.join(self.srt_output_dir, f"{base_filename}_he.srt")
         return source_srt_filename, hebrew_srt_filename
 
-    def _load_existing_subtitles(self, source_srt_path, target_srt_path, source_language_name):
+    def _transcription_prompt_key(self, source_language):
+        if source_language == 'yi':
+            return 'yiddish_transcription_system_prompt'
+        return 'english_transcription_system_prompt' # Default to English
+
+    def _transcription_cache_inputs(self, source_language, youtube_url, mp3_audio_path, lyrics_content, system_prompt_text):
+        """Everything that determines the transcription output (Gemini reads the YouTube URL; the MP3 is what gets subtitled)."""
+        return {
+            'stage': 'transcription',
+            'language': source_language,
+            'model': self.model_name,
+            'audio_sha256': self.cache.file_hash(mp3_audio_path),
+            'youtube_url': youtube_url,
+            'lyrics_sha256': sha256_text(lyrics_content) if lyrics_content else None,
+            'system_prompt_sha256': sha256_text(system_prompt_text),
+        }
+
+    def _subtitles_fingerprint(self, subtitle_data):
+        """Hash of the subtitles as they are stored in SRT (ms times, stripped text), so API and loaded data agree."""
+        canonical = [
+            [sub.get('id', i + 1), self._format_time_srt(sub.get('start_time', 0.0)),
+             self._format_time_srt(sub.get('end_time', 0.0)), sub.get('text', '').strip()]
+            for i, sub in enumerate(subtitle_data)
+        ]
+        return sha256_text(json.dumps(canonical, ensure_ascii=False))
+
+    def _translation_prompt_inputs(self, system_prompt_text, user_input_template):
+        """The translation cache inputs that do not depend on the source subtitles."""
+        return {
+            'stage': 'translation',
+            'language': 'he',
+            'model': self.model_name,
+            'system_prompt_sha256': sha256_text(system_prompt_text),
+            'user_template_sha256': sha256_text(user_input_template),
+            'chunk_size': TRANSLATION_CHUNK_SIZE,
+            'context_overlap': TRANSLATION_CONTEXT_OVERLAP,
+        }
+
+    def _translation_cache_inputs(self, source_subs, system_prompt_text, user_input_template):
+        inputs = self._translation_prompt_inputs(system_prompt_text, user_input_template)
+        inputs['source_subtitles_sha256'] = self._subtitles_fingerprint(source_subs)
+        return inputs
+
+    def _may_load_cached_translation(self, hebrew_srt_path, system_prompt_text, user_input_template):
         """
-        Attempts to load subtitles from existing SRT files.
-        Returns a tuple (source_data, target_data), where either can be None if not found/loaded.
+        True if a Hebrew SRT for this song and translation prompt is cached (or waiting to be adopted),
+        so a new transcription may still end in a Hebrew cache hit. The translation is then not
+        started during the stream, since those requests would be thrown away on a hit.
         """
-        source_subs_data = None
-        target_subs_data = None # Target is always Hebrew
-        found_source = False
-        found_target = False
-
-        if os.path.exists(source_srt_path):
-            print(f"Found existing Source ({source_language_name}) SRT: {source_srt_path}")
-            source_subs_data = self._load_srt_file(source_srt_path)
-            found_source = True
-            if source_subs_data is None:
-                print(f"Warning: Failed to parse existing Source ({source_language_name}) SRT: {source_srt_path}")
-            elif not source_subs_data:
-                 print(f"Warning: Existing Source ({source_language_name}) SRT file is empty or contains no valid entries: {source_srt_path}")
-
-        if os.path.exists(target_srt_path):
-            print(f"Found existing Target (Hebrew) SRT: {target_srt_path}")
-            target_subs_data = self._load_srt_file(target_srt_path)
-            found_target = True
-            if target_subs_data is None:
-                print(f"Warning: Failed to parse existing Target (Hebrew) SRT: {target_srt_path}")
-            elif not target_subs_data:
-                 print(f"Warning: Existing Target (Hebrew) SRT file is empty or contains no valid entries: {target_srt_path}")
-
-        if not found_source and not found_target:
-            print("No existing SRT files found.")
-        elif found_source and found_target and source_subs_data is not None and target_subs_data is not None:
-             print(f"Both Source ({source_language_name}) and Target (Hebrew) SRTs loaded successfully.")
-        elif found_source and source_subs_data is not None:
-             print(f"Only Source ({source_language_name}) SRT loaded successfully.")
-        elif found_target and target_subs_data is not None:
-             print("Only Target (Hebrew) SRT loaded successfully.")
-        else:
-             print("Found SRT file(s), but failed to load/parse at least one correctly.")
+        if os.path.exists(hebrew_srt_path) and not self.cache.is_recorded_export(hebrew_srt_path):
+            return True
+        return self.cache.has_export(hebrew_srt_path, self._translation_prompt_inputs(system_prompt_text, user_input_template))
+
+    def _load_cached_subtitles(self, cache_inputs, export_path, song_name, label):
+        """
+        Loads subtitles for cache_inputs from the cache. An SRT at export_path that the manifest
+        does not know (written before the cache existed) is adopted once under the current inputs;
+        one the manifest does know belongs to other inputs and is stale.
+        Returns the subtitle list, or None if they need to be generated.
+        """
+        key = SubtitleCache.make_key(cache_inputs)
+        cached_path = self.cache.lookup(key)
+        if cached_path:
+            print(f"Found cached {label} SRT for these inputs: {cached_path}")
+            subtitle_data = self._load_srt_file(cached_path)
+            if subtitle_data:
+                if not os.path.exists(export_path):
+                    self._save_srt_file(export_path, subtitle_data, song_name)
+                return subtitle_data
+            print(f"Warning: Cached {label} SRT is empty or invalid, regenerating: {cached_path}")
+            return None
+
+        if os.path.exists(export_path):
+            if self.cache.is_recorded_export(export_path):
+                print(f"Existing {label} SRT was generated from different inputs (audio, lyrics, prompt or model changed), regenerating: {export_path}")
+                return None
+            subtitle_data = self._load_srt_file(export_path)
+            if subtitle_data:
+                print(f"Adopting existing {label} SRT into the subtitle cache: {export_path}")
+                self._store_cached_subtitles(cache_inputs, subtitle_data, export_path, song_name)
+                return subtitle_data
 
-        return source_subs_data, target_subs_data
+        print(f"No cached {label} subtitles for these inputs.")
+        return None
+
+    def _store_cached_subtitles(self, cache_inputs, subtitle_data, export_path, song_name):
+        key = SubtitleCache.make_key(cache_inputs)
+        self._save_srt_file(self.cache.path(key), subtitle_data, song_name)
+        if os.path.abspath(export_path) != os.path.abspath(self.cache.path(key)):
+            self._save_srt_file(export_path, subtitle_data, song_name)
+        self.cache.record(key, cache_inputs, song_name, export_path)
+
+    def cached_subtitle_paths(self, source_language, song_name, youtube_url, mp3_audio_path, lyrics_content=None):
+        """
+        Returns the cached (source, Hebrew) SRT paths if both are valid for the current inputs, otherwise None.
+        Used by batch mode to decide whether a song needs any Gemini calls.
+        """
+        transcription_prompt = self.instructions.get(self._transcription_prompt_key(source_language))
+        translation_prompt = self.instructions.get('generic_translation_system_prompt')
+        translation_template = self.instructions.get('generic_translation_user_input_template')
+        if not transcription_prompt or not translation_prompt or not translation_template:
+            return None
+
+        source_inputs = self._transcription_cache_inputs(source_language, youtube_url, mp3_audio_path, lyrics_content, transcription_prompt)
+        source_path = self.cache.lookup(SubtitleCache.make_key(source_inputs))
+        source_subs = self._load_srt_file(source_path) if source_path else None
+        if not source_subs:
+            return None
+        hebrew_inputs = self._translation_cache_inputs(source_subs, translation_prompt, translation_template)
+        hebrew_path = self.cache.lookup(SubtitleCache.make_key(hebrew_inputs))
+        return (source_path, hebrew_path) if hebrew_path else None
 
     # --- API Call Logic (Using original Client/Stream structure - CORRECTED) ---
-    def _call_gemini_api(self, contents, config, language_context):
+    def _call_gemini_api(self, contents, config, language_context, on_item=None):
         """
         Handles the streaming call to the Gemini API using the original structure - CORRECTED.
         Uses self.client.models.generate_content_stream and passes the config object.
         Handles potential NoneType for prompt_feedback and removes outdated specific exceptions.
+        The JSON array is parsed incrementally (SubtitleStreamParser), so every subtitle is
+        validated as soon as it is complete in the stream, and the subtitles received before
+        a stream is cut off are recovered instead of being lost.
 
         Args:
             contents (list): The user contents for the API call.
             config (types.GenerateContentConfig): The configuration object including system prompt.
             language_context (str): String describing the language being generated (e.g., "English", "Yiddish").
+            on_item (callable, optional): Called with each parsed subtitle dictionary while the stream is running.
 
         Returns:
-            list | None: Parsed subtitle data as a list of dictionaries, or None on failure.
+            tuple: (list | None, bool): Parsed subtitle data as a list of dictionaries (None on failure),
+                   and whether the response was complete. Partial data recovered from an interrupted
+                   stream is returned with False and should not be cached.
         """
         print(f"Generating {language_context} Subtitles (via API, expecting JSON)...")
-        raw_json_output = ""
+        raw_chunks = []
+        parser = SubtitleStreamParser()
+        streamed_subs = []
+        invalid_item_error = None
+        stream_error = None
         try:
             # *** Using the EXACT original stream call structure ***
             stream_response = self.client.models.generate_content_stream(
@@ -449,9 +619,19 @@ class SubtitleGenerator:
                 config=config,         # Passing the config object (which includes system_instruction)
             )
             for chunk in stream_response:
-                # Append text directly as in original code
                 if chunk.text:
-                     raw_json_output += chunk.text
+                     raw_chunks.append(chunk.text)
+                     for item in parser.feed(chunk.text):
+                         if invalid_item_error:
+                             continue
+                         try:
+                             processed_item = self._process_subtitle_item(item, len(streamed_subs), language_context)
+                         except ValueError as e:
+                             invalid_item_error = e # The full-text parse below reports it
+                             continue
+                         streamed_subs.append(processed_item)
+                         if on_item:
+                             on_item(processed_item)
 
                 # *** CORRECTED Check for blocking using prompt_feedback ***
                 # Check if prompt_feedback exists AND is not None before accessing block_reason
@@ -462,6 +642,7 @@ class SubtitleGenerator:
         except Exception as e:
             # Catching general exceptions which might include API errors or other issues
             print(f"Error during Gemini API stream call for {language_context}: {e}")
+            stream_error = e
             # Attempt to print response details if available (might not exist on all exceptions)
             try:
                  # Check if the exception object itself might contain useful info, like response details
@@ -473,17 +654,147 @@ class SubtitleGenerator:
 
             except Exception as report_err:
                  print(f"(Could not report detailed error info: {report_err})")
-            return None # Return None on any exception during the API call
+
+        for parse_error in parser.errors:
+            print(f"Warning: Skipped an unparseable subtitle object in the {language_context} stream: {parse_error}")
+
+        if stream_error is not None or parser.truncated:
+            if not parser.truncated:
+                return None, False # The stream failed before any JSON array started
+            if not streamed_subs or invalid_item_error:
+                print(f"Error: {language_context} stream ended in the middle of the JSON array and no valid subtitles could be recovered.")
+                return None, False
+            print(f"Warning: {language_context} stream ended in the middle of the JSON array. "
+                  f"Recovered {len(streamed_subs)} complete subtitles (last id: {streamed_subs[-1]['id']}).")
+            return streamed_subs, False
 
         print(f"\n{language_context} JSON stream finished. Parsing response...")
-        # Ensure parsing happens only if the API call didn't return None implicitly before
+        if parser.finished and not parser.errors and not invalid_item_error:
+            return streamed_subs, True
+
+        # Unexpected response shape: fall back to parsing the whole text at once
+        raw_json_output = "".join(raw_chunks)
         if raw_json_output:
-            return self._parse_json_response(raw_json_output, language_context)
+            parsed_subs = self._parse_json_response(raw_json_output, language_context)
+            return parsed_subs, parsed_subs is not None
         else:
             # Handle cases where the stream completed but produced no text output
             print(f"Warning: API stream for {language_context} finished but produced no text output.")
-            return None
+            return None, False
             
+    # --- Translation (chunked, parallel) ---
+    def _format_subs_for_prompt(self, subs):
+        """Formats subtitles back into the API's JSON structure ("MM:SS.mmm" time strings), as compact JSON."""
+        source_json_for_prompt = []
+        for item in subs:
+             start_s = item.get('start_time', 0.0)
+             end_s = item.get('end_time', 0.0)
+             start_min, start_sec_rem = divmod(start_s, 60)
+             start_sec, start_ms = divmod(start_sec_rem, 1)
+             end_min, end_sec_rem = divmod(end_s, 60)
+             end_sec, end_ms = divmod(end_sec_rem, 1)
+             start_ms_int = min(999, int(round(start_ms * 1000)))
+             end_ms_int = min(999, int(round(end_ms * 1000)))
+             start_time_str_api = f"{int(start_min):02}:{int(start_sec):02}.{start_ms_int:03}"
+             end_time_str_api = f"{int(end_min):02}:{int(end_sec):02}.{end_ms_int:03}"
+             source_json_for_prompt.append({
+                 "id": item.get('id', 0),
+                 "start_time": start_time_str_api,
+                 "end_time": end_time_str_api,
+                 "text": item.get('text', '')
+             })
+        return json.dumps(source_json_for_prompt, ensure_ascii=False, separators=(',', ':'))
+
+    def _translation_windows(self, source_subs):
+        """
+        Splits the source subtitles into chunks of TRANSLATION_CHUNK_SIZE.
+        Each window also holds TRANSLATION_CONTEXT_OVERLAP subtitles before and after its chunk,
+        so the model sees the surrounding lines. Only the chunk's own ids are kept from its result.
+        Returns a list of (chunk_ids, window_subs).
+        """
+        sub_ids = [str(item.get('id', 0)) for item in source_subs]
+        if len(set(sub_ids)) != len(sub_ids):
+            print("Warning: Source subtitle ids are not unique. Translating them in a single request.")
+            return [(sub_ids, source_subs)]
+        windows = []
+        for start in range(0, len(source_subs), TRANSLATION_CHUNK_SIZE):
+            window_start, window_end = translation_window_bounds(start // TRANSLATION_CHUNK_SIZE)
+            windows.append((sub_ids[start:start + TRANSLATION_CHUNK_SIZE], source_subs[window_start:window_end]))
+        return windows
+
+    def _translate_window(self, window_subs, translation_config, user_input_template, language_context):
+        """One translation request. Returns (data, complete) as _call_gemini_api does."""
+        try:
+            source_json_prompt_string = self._format_subs_for_prompt(window_subs)
+        except Exception as e:
+            print(f"Error formatting source JSON for {language_context} translation prompt: {e}")
+            return None, False
+
+        # Format the user input text including the JSON data
+        user_translation_prompt_text = user_input_template.format(
+            source_json_prompt_string=source_json_prompt_string
+        )
+        # Prepare user content (the formatted JSON string) using original types.Content
+        contents_hebrew = [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=user_translation_prompt_text)],
+            ),
+        ]
+        return self._call_gemini_api(
+            contents=contents_hebrew,
+            config=translation_config, # Pass the config object
+            language_context=language_context
+        )
+
+    def _start_translation(self, system_prompt_text, user_input_template, source_language_name):
+        """A ChunkedTranslation for the Hebrew pass, to be fed while the source is still streaming."""
+        # *** Get the API config using the original structure, including the generic system prompt ***
+        return ChunkedTranslation(
+            self, self._get_api_config(system_prompt_text), user_input_template,
+            "Hebrew (from "+source_language_name+")"
+        )
+
+    def _translate_subtitles(self, source_subs, system_prompt_text, user_input_template, source_language_name, translation=None):
+        """
+        Translates the source subtitles into Hebrew. Long songs are split into overlapping windows
+        (_translation_windows) that are translated concurrently, up to self.translation_workers
+        requests at a time, and the results are stitched back together by subtitle id.
+        translation is a ChunkedTranslation that already received the source while it was
+        streaming; the windows it started early are reused when their subtitles did not change.
+
+        Returns:
+            tuple: (list | None, bool): The Hebrew subtitles, and whether every chunk was translated completely.
+        """
+        if translation is None:
+            translation = self._start_translation(system_prompt_text, user_input_template, source_language_name)
+        try:
+            return translation.finish(source_subs)
+        finally:
+            translation.shutdown()
+
+    def _stitch_translation(self, windows, results):
+        """Joins the chunk results by subtitle id, keeping only each chunk's own ids. Returns (data, complete)."""
+        translated_by_id = {}
+        complete = True
+        missing_ids = []
+        for (chunk_ids, _), (chunk_subs, chunk_complete) in zip(windows, results):
+            complete = complete and chunk_complete
+            chunk_by_id = {str(item['id']): item for item in chunk_subs or []}
+            for sub_id in chunk_ids:
+                if sub_id in chunk_by_id:
+                    translated_by_id[sub_id] = chunk_by_id[sub_id]
+                else:
+                    missing_ids.append(sub_id)
+
+        if missing_ids:
+            complete = False
+            print(f"Warning: {len(missing_ids)} subtitles are missing from the Hebrew translation (ids: {', '.join(missing_ids)}).")
+        hebrew_subs = [translated_by_id[sub_id] for chunk_ids, _ in windows for sub_id in chunk_ids if sub_id in translated_by_id]
+        if not hebrew_subs:
+            return None, False
+        return hebrew_subs, complete
+
     # --- API Config (Using original structure with system_instruction inside) ---
     def _get_api_config(self, system_instruction_text):
         """
@@ -538,7 +849,8 @@ class SubtitleGenerator:
     # --- MAIN FUNCTION (Updated logic for language handling, API calls with original structure) ---
     def generate_or_load_subtitles(self, source_language, song_name, youtube_url, mp3_audio_path, lyrics_content=None, force_regenerate=False):
         """
-        Generates subtitles using Gemini API or loads them if SRT files exist.
+        Generates subtitles using Gemini API or loads them from the subtitle cache when
+        the audio, lyrics, prompts and model match a previous run.
         Uses system_instruction for prompts and user role for dynamic data.
         Saves generated subtitles as SRT files with song name in the filename.
         Optionally uses lyrics_content for transcription.
@@ -552,7 +864,7 @@ class SubtitleGenerator:
             youtube_url (str): The YouTube URL of the video.
             mp3_audio_path (str): Path to the MP3 audio file.
             lyrics_content (str, optional): String containing song lyrics. Defaults to None.
-            force_regenerate (bool, optional): If True, ignore existing SRTs and regenerate. Defaults to False.
+            force_regenerate (bool, optional): If True, ignore cached SRTs and regenerate. Defaults to False.
 
         Returns:
             tuple: (list | None, list | None): A tuple containing the Source
@@ -560,39 +872,39 @@ class SubtitleGenerator:
                    Returns (None, None) or (data, None) / (None, data) on errors or partial success.
         """
         source_language_name = "English" if source_language == 'en' else "Yiddish"
+        # Human-readable copies of the cached SRTs (song name + video ID), exported next to the cache
         source_srt_path, hebrew_srt_path = self._calculate_filenames(song_name, youtube_url, mp3_audio_path, source_language)
 
+        transcription_prompt_key = self._transcription_prompt_key(source_language)
+        transcription_system_prompt_text = self.instructions.get(transcription_prompt_key)
+        if not transcription_system_prompt_text:
+             print(f"CRITICAL ERROR: '{transcription_prompt_key}' not found in instructions YAML.")
+             return None, None
+
+        source_cache_inputs = self._transcription_cache_inputs(
+            source_language, youtube_url, mp3_audio_path, lyrics_content, transcription_system_prompt_text
+        )
+
+        # *** Use the GENERIC translation prompt and user input template keys ***
+        translation_prompt_key = 'generic_translation_system_prompt'
+        translation_system_prompt_text = self.instructions.get(translation_prompt_key)
+        user_input_template_key = 'generic_translation_user_input_template'
+        translation_user_input_template = self.instructions.get(user_input_template_key)
+
         source_subs = None
         hebrew_subs = None
+        early_translation = None # Hebrew chunks started while the source is streaming
 
         if not force_regenerate:
-            print("Checking for existing SRT files...")
-            source_subs, hebrew_subs = self._load_existing_subtitles(source_srt_path, hebrew_srt_path, source_language_name)
-            if source_subs is not None and hebrew_subs is not None:
-                print(f"Both Source ({source_language_name}) and Target (Hebrew) subtitles loaded from existing files.")
-                return source_subs, hebrew_subs
-            if source_subs is None:
-                 print(f"Will attempt to generate Source ({source_language_name}) subtitles.")
-            if hebrew_subs is None:
-                 print("Will attempt to generate Target (Hebrew) subtitles.")
+            print("Checking the subtitle cache...")
+            source_subs = self._load_cached_subtitles(source_cache_inputs, source_srt_path, song_name, f"Source ({source_language_name})")
         else:
-            print("Force regeneration requested. Skipping check for existing SRT files.")
+            print("Force regeneration requested. Ignoring cached subtitles.")
 
         # --- Source Language Generation (Transcription) ---
         if source_subs is None:
             print(f"\n--- Generating Source ({source_language_name}) Subtitles ---")
 
-            # Get the correct system prompt text for transcription based on language
-            if source_language == 'yi':
-                transcription_prompt_key = 'yiddish_transcription_system_prompt'
-            else: # Default to English
-                transcription_prompt_key = 'english_transcription_system_prompt'
-
-            transcription_system_prompt_text = self.instructions.get(transcription_prompt_key)
-            if not transcription_system_prompt_text:
-                 print(f"CRITICAL ERROR: '{transcription_prompt_key}' not found in instructions YAML.")
-                 return None, hebrew_subs # Return potentially loaded Hebrew subs
-
             # *** Get the API config using the original structure, including the system prompt ***
             transcription_config = self._get_api_config(transcription_system_prompt_text)
 
@@ -612,101 +924,81 @@ class SubtitleGenerator:
             # Construct the 'contents' list with role="user" using original types.Content
             contents_source = [types.Content(role="user", parts=parts_source_user)]
 
+            # Start the Hebrew chunks as the subtitles arrive, unless the finished transcription
+            # may still match a cached Hebrew SRT for this song
+            if translation_system_prompt_text and translation_user_input_template:
+                if force_regenerate or not self._may_load_cached_translation(
+                        hebrew_srt_path, translation_system_prompt_text, translation_user_input_template):
+                    early_translation = self._start_translation(
+                        translation_system_prompt_text, translation_user_input_template, source_language_name
+                    )
+                else:
+                    print("A cached Hebrew SRT exists for this song and prompt. Translating after the transcription finishes.")
+
             # Make the API call using the original structure
-            source_subs_data_from_api = self._call_gemini_api(
+            source_subs_data_from_api, source_complete = self._call_gemini_api(
                 contents=contents_source,
                 config=transcription_config, # Pass the config object
-                language_context=source_language_name
+                language_context=source_language_name,
+                on_item=early_translation.add_source_item if early_translation else None
             )
 
             if source_subs_data_from_api is None:
                 print(f"Failed to generate valid Source ({source_language_name}) subtitle data from API. Cannot proceed with translation if Hebrew is also missing.")
+                if early_translation:
+                    early_translation.shutdown()
                 return None, hebrew_subs
+            elif not source_complete:
+                # Usable for this run, but not cached - the next run should request the full song again
+                source_subs = source_subs_data_from_api
+                print(f"Source ({source_language_name}) subtitles are partial (interrupted stream). Not caching them.")
             else:
                 source_subs = source_subs_data_from_api
                 print(f"Source ({source_language_name}) subtitles generated successfully.")
-                self._save_srt_file(source_srt_path, source_subs, song_name) # Save to the correct source file path
+                self._store_cached_subtitles(source_cache_inputs, source_subs, source_srt_path, song_name)
         else:
              print(f"\nSkipping Source ({source_language_name}) subtitle generation (already loaded).")
 
         # --- Hebrew Generation (Translation using Generic Prompt and Original API Structure) ---
-        if hebrew_subs is None:
-            if source_subs is None or not source_subs:
-                 print(f"\nCannot generate Hebrew subtitles because Source ({source_language_name}) subtitles are missing or empty.")
-                 return source_subs, None
+        if source_subs is None or not source_subs:
+             print(f"\nCannot generate Hebrew subtitles because Source ({source_language_name}) subtitles are missing or empty.")
+             if early_translation:
+                 early_translation.shutdown()
+             return source_subs, None
+
+        if not translation_system_prompt_text:
+             print(f"CRITICAL ERROR: '{translation_prompt_key}' not found in instructions YAML.")
+             return source_subs, None
+        if not translation_user_input_template:
+             print(f"CRITICAL ERROR: '{user_input_template_key}' not found in instructions YAML.")
+             return source_subs, None
+
+        # Keyed on the source subtitles, so a new transcription always gets a new translation
+        hebrew_cache_inputs = self._translation_cache_inputs(source_subs, translation_system_prompt_text, translation_user_input_template)
+        if not force_regenerate:
+            hebrew_subs = self._load_cached_subtitles(hebrew_cache_inputs, hebrew_srt_path, song_name, "Target (Hebrew)")
 
+        if hebrew_subs is None:
             print("\n--- Generating Hebrew Subtitles (Using Generic Translation Prompt) ---")
 
-            # *** Use the GENERIC translation prompt key ***
-            translation_prompt_key = 'generic_translation_system_prompt'
-            translation_system_prompt_text = self.instructions.get(translation_prompt_key)
-            if not translation_system_prompt_text:
-                 print(f"CRITICAL ERROR: '{translation_prompt_key}' not found in instructions YAML.")
-                 return source_subs, None
-
-            # *** Get the API config using the original structure, including the generic system prompt ***
-            translation_config = self._get_api_config(translation_system_prompt_text)
-
-            try:
-                # Format the SOURCE subs (English or Yiddish) back into the specific JSON string format for the prompt
-                source_json_for_prompt = []
-                for item in source_subs:
-                     start_s = item.get('start_time', 0.0)
-                     end_s = item.get('end_time', 0.0)
-                     start_min, start_sec_rem = divmod(start_s, 60)
-                     start_sec, start_ms = divmod(start_sec_rem, 1)
-                     end_min, end_sec_rem = divmod(end_s, 60)
-                     end_sec, end_ms = divmod(end_sec_rem, 1)
-                     start_ms_int = min(999, int(round(start_ms * 1000)))
-                     end_ms_int = min(999, int(round(end_ms * 1000)))
-                     start_time_str_api = f"{int(start_min):02}:{int(start_sec):02}.{start_ms_int:03}"
-                     end_time_str_api = f"{int(end_min):02}:{int(end_sec):02}.{end_ms_int:03}"
-                     source_json_for_prompt.append({
-                         "id": item.get('id', 0),
-                         "start_time": start_time_str_api,
-                         "end_time": end_time_str_api,
-                         "text": item.get('text', '')
-                     })
-                source_json_prompt_string = json.dumps(source_json_for_prompt, ensure_ascii=False, indent=2)
-            except Exception as e:
-                print(f"Error formatting Source ({source_language_name}) JSON for translation prompt: {e}")
-                return source_subs, None
-
-            # *** Use the GENERIC user input template key ***
-            user_input_template_key = 'generic_translation_user_input_template'
-            translation_user_input_template = self.instructions.get(user_input_template_key)
-            if not translation_user_input_template:
-                 print(f"CRITICAL ERROR: '{user_input_template_key}' not found in instructions YAML.")
-                 return source_subs, None
-
-            # Format the user input text including the JSON data
-            user_translation_prompt_text = translation_user_input_template.format(
-                source_json_prompt_string=source_json_prompt_string
-            )
-
-            # Prepare user content (the formatted JSON string) using original types.Content
-            contents_hebrew = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text=user_translation_prompt_text)],
-                ),
-            ]
-
-            # Make the API call using the original structure
-            hebrew_subs_data_from_api = self._call_gemini_api(
-                contents=contents_hebrew,
-                config=translation_config, # Pass the config object
-                language_context="Hebrew (from "+source_language_name+")"
+            hebrew_subs_data_from_api, hebrew_complete = self._translate_subtitles(
+                source_subs, translation_system_prompt_text, translation_user_input_template, source_language_name,
+                translation=early_translation
             )
 
             if hebrew_subs_data_from_api is None:
                 print("Failed to generate valid Hebrew subtitle data from API.")
                 hebrew_subs = None
+            elif not hebrew_complete:
+                hebrew_subs = hebrew_subs_data_from_api
+                print("Hebrew subtitles are incomplete (interrupted stream or missing chunks). Not caching them.")
             else:
                 hebrew_subs = hebrew_subs_data_from_api
                 print("Hebrew subtitles generated successfully.")
-                self._save_srt_file(hebrew_srt_path, hebrew_subs, song_name) # Save to the Hebrew file path
+                self._store_cached_subtitles(hebrew_cache_inputs, hebrew_subs, hebrew_srt_path, song_name)
         else:
              print("\nSkipping Hebrew subtitle generation (already loaded).")
+             if early_translation:
+                 early_translation.shutdown()
 
         return source_subs, hebrew_subs
\ No newline at end of file
@@ -0,0 +1,86 @@
+import numpy as np
+
+from .interval_index import IntervalIndex
+
+
+def blend_sprite(frame, rgba, position):
+    """
+    Blends an RGBA sprite onto an RGB uint8 frame in place at position (x, y),
+    with the same arithmetic as MoviePy's blit. The sprite is clipped to the frame.
+    """
+    x, y = position
+    height, width = rgba.shape[:2]
+    region = frame[y:y + height, x:x + width]
+    rgba = rgba[:region.shape[0], :region.shape[1]]
+    mask = np.dstack(3 * [rgba[..., 3] / 255.0])
+    region[...] = 1.0 * mask * rgba[..., :3] + (1.0 - mask) * region
+
+
+class SpriteSheet:
+    """
+    All subtitle overlays packed into one contiguous RGBA buffer.
+    Each sprite is a tight crop stored with its shape, its offset in the buffer and
+    its (x, y) position in the frame. Empty entries (None) are kept as zero-size sprites
+    so indices stay aligned with the subtitle list.
+    """
+
+    def __init__(self, sprites):
+        self.shapes = []
+        self.positions = []
+        self.offsets = []
+        total = 0
+        for sprite in sprites:
+            if sprite is None:
+                shape, position = (0, 0, 4), (0, 0)
+            else:
+                shape, position = sprite[0].shape, sprite[1]
+            self.offsets.append(total)
+            self.shapes.append(shape)
+            self.positions.append(position)
+            total += int(np.prod(shape))
+
+        self.pixels = np.empty(total, dtype=np.uint8)
+        for sprite, offset, shape in zip(sprites, self.offsets, self.shapes):
+            if sprite is not None:
+                self.pixels[offset:offset + sprite[0].size] = sprite[0].ravel()
+
+    def __len__(self):
+        return len(self.shapes)
+
+    @property
+    def nbytes(self):
+        return self.pixels.nbytes
+
+    def sprite(self, index):
+        """Returns (rgba_view, (x, y)) for sprite index, or None for an empty sprite."""
+        shape = self.shapes[index]
+        if not shape[0] or not shape[1]:
+            return None
+        offset = self.offsets[index]
+        return self.pixels[offset:offset + int(np.prod(shape))].reshape(shape), self.positions[index]
+
+
+class SubtitleOverlay:
+    """
+    Frame filter (for clip.fl) that blends the sprites active at time t onto the frame.
+    A sprite is shown for start <= t < end, like an ImageClip with set_start/set_end,
+    and blended with the same arithmetic as MoviePy's blit, so the output matches a
+    composite of per-subtitle ImageClips while touching only the sprite's region.
+    """
+
+    def __init__(self, sheet, intervals):
+        self.sheet = sheet
+        self.index = IntervalIndex(intervals)
+
+    def __call__(self, get_frame, t):
+        frame = get_frame(t)
+        active = self.index.lookup_all(t)
+        if not active:
+            return frame
+        frame = np.array(frame, dtype=np.uint8)
+        for sprite_index in active:
+            sprite = self.sheet.sprite(sprite_index)
+            if sprite is None:
+                continue
+            blend_sprite(frame, *sprite)
+        return frame
@@ -1,19 +1,70 @@
 import os
 import re
 import moviepy.editor as mp
-from moviepy.video.tools.subtitles import SubtitlesClip
 import imageio
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import arabic_reshaper
 from bidi.algorithm import get_display
 import time
 import traceback
 import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from . import font_registry
+from .subtitle_sprites import SpriteSheet, SubtitleOverlay, blend_sprite
+from .ass_renderer import ass_line_offset, ass_style, build_ass_script
+
+# Pre-scaled backgrounds written by video_generator/build-assets.py (profile "songs").
+# Keep the version and file naming in sync with video_generator/asset_cache.py.
+ASSET_CACHE_VERSION = 1
+
+# Subtitle sprites are rasterized in worker processes only when each worker gets at least this many.
+MIN_SPRITES_PER_WORKER = 8
+
+# The title card is shown until the first subtitle, if that leaves at least this many seconds.
+MIN_TITLE_DURATION = 0.5
+
+# video_settings.renderer: "moviepy" composites every frame in Python,
+# "ass" burns the subtitles in with ffmpeg/libass over still images (no per-frame Python work),
+# "stills" composites one still per subtitle interval and encodes them as a timed slideshow.
+RENDERERS = ('moviepy', 'ass', 'stills')
+
+_sprite_worker = None
+
+
+def output_video_path(output_dir, output_video_filename_base):
+    return os.path.join(output_dir, f"{output_video_filename_base}_subtitled.mp4")
+
+
+def render_video_job(resolved_config, create_video_kwargs, cpu_budget=None):
+    """
+    Process-pool entry point: builds a VideoCreator in the worker and renders one song,
+    using at most cpu_budget cores (see VideoCreator).
+    Returns (output video path or None, render seconds).
+    """
+    start = time.time()
+    output_video_file = VideoCreator(resolved_config, cpu_budget).create_video(**create_video_kwargs)
+    return output_video_file, time.time() - start
+
+
+def _init_sprite_worker(resolved_config):
+    global _sprite_worker
+    _sprite_worker = VideoCreator(resolved_config)
+
+
+def _render_sprite(text):
+    return _sprite_worker._render_subtitle_sprite(text)
+
 
 class VideoCreator:
-    def __init__(self, resolved_config):
+    def __init__(self, resolved_config, cpu_budget=None):
         self.cfg = resolved_config
+        # Cores this render may use for sprite processes and encoder threads. Batch mode runs
+        # several renders at once and gives each its share; None means the whole machine.
+        self.cpu_budget = cpu_budget
 
         self.paths = self.cfg['paths']
         self.video_settings = self.cfg['video_settings']
@@ -43,11 +94,20 @@ class VideoCreator:
         self.output_frames_dir = self.paths['output_frames_dir']
         self.output_video_dir = self.paths['output_dir']
 
+        self.renderer = self.video_settings.get('renderer', 'moviepy')
+        if self.renderer not in RENDERERS:
+            raise ValueError(f"Configuration error: 'video_settings.renderer' must be one of {RENDERERS}, got '{self.renderer}'.")
+
         self._validate_paths()
         self._ensure_dirs_exist()
+        self._preload_fonts()
 
         self.combined_subs_list_for_frames = []
-        self.saved_subtitle_ids = set()
+
+        # Subtitle-independent assets, filled by prepare() (or on first use) and reused by create_video
+        self._fitted_clips = {}
+        self._title_overlays = {}
+        self._preloaded_audio = None
 
     def _validate_paths(self):
         if not os.path.exists(self.title_font_path):
@@ -63,10 +123,26 @@ class VideoCreator:
         if self.artist_font_path and not os.path.exists(self.artist_font_path):
              raise FileNotFoundError(f"Error: Artist font file specified in config but not found at '{self.artist_font_path}'")
 
+    def _preload_fonts(self):
+        font_specs = [
+            (self.title_font_path, self.title_style.get('font_size')),
+            (self.source_subtitle_font_path, self.source_sub_style.get('font_size')),
+            (self.target_subtitle_font_path, self.target_sub_style.get('font_size')),
+        ]
+        if self.artist_font_path:
+            font_specs.append((self.artist_font_path, self.artist_style.get('font_size')))
+        font_registry.preload_fonts(font_specs)
+
     def _ensure_dirs_exist(self):
         os.makedirs(self.output_video_dir, exist_ok=True)
 
     def _load_audio(self, mp3_path):
+        if self._preloaded_audio and self._preloaded_audio[0] == mp3_path:
+            _, audio_clip, duration = self._preloaded_audio
+            self._preloaded_audio = None
+            print(f"Using preloaded audio ({duration:.2f} seconds).")
+            return audio_clip, duration
+
         print("Loading audio...")
         try:
             audio_clip = mp.AudioFileClip(mp3_path)
@@ -79,15 +155,46 @@ class VideoCreator:
             print(f"Error loading audio file '{mp3_path}': {e}")
             raise
 
+    def _prescaled_image_path(self, image_path):
+        """Returns the pre-scaled variant of image_path for the target resolution, or None if missing or stale."""
+        assets_dir = self.paths.get('assets_dir')
+        if not assets_dir:
+            return None
+        target_w, target_h = self.video_settings['resolution']
+        stem = os.path.splitext(os.path.relpath(os.path.abspath(image_path), os.path.abspath(assets_dir)))[0]
+        variant_path = os.path.join(
+            assets_dir, '..', 'output', 'cache', 'assets', f'v{ASSET_CACHE_VERSION}',
+            f"{stem}.{target_w}x{target_h}.RGB.cover.png"
+        )
+        if os.path.exists(variant_path) and os.path.getmtime(variant_path) >= os.path.getmtime(image_path):
+            return variant_path
+        return None
+
+    def _fitted_image_clip(self, image_path, duration):
+        """
+        ImageClip filling the target resolution (scale to height, center-crop, resize).
+        The scaled image is kept per path, so later calls only set the duration.
+        """
+        clip = self._fitted_clips.get(image_path)
+        if clip is None:
+            variant_path = self._prescaled_image_path(image_path)
+            if variant_path:
+                print(f"Using pre-scaled image: {variant_path}")
+                clip = mp.ImageClip(variant_path)
+            else:
+                clip = mp.ImageClip(image_path)
+                target_w, target_h = self.video_settings['resolution']
+                clip = clip.resize(height=target_h)
+                if clip.w > target_w:
+                    clip = clip.crop(x_center=clip.w / 2, width=target_w)
+                clip = clip.resize((target_w, target_h))
+            self._fitted_clips[image_path] = clip
+        return clip.set_duration(duration)
+
     def _create_background_clip(self, duration):
         print("Loading background image...")
         try:
-            bg_clip = mp.ImageClip(self.background_image_path, duration=duration)
-            target_w, target_h = self.video_settings['resolution']
-            bg_clip = bg_clip.resize(height=target_h)
-            if bg_clip.w > target_w:
-                bg_clip = bg_clip.crop(x_center=bg_clip.w / 2, width=target_w)
-            bg_clip = bg_clip.resize((target_w, target_h))
+            bg_clip = self._fitted_image_clip(self.background_image_path, duration)
             bg_clip = bg_clip.set_fps(self.video_settings['fps'])
             return bg_clip
         except Exception as e:
@@ -119,10 +226,43 @@ class VideoCreator:
 
         return first_start_time
 
+    def _get_title_duration(self, subs_data_source, subs_data_target, audio_duration):
+        first_sub_time = self._get_first_subtitle_time(subs_data_source, subs_data_target, audio_duration)
+        return first_sub_time if first_sub_time >= MIN_TITLE_DURATION else 0
+
     def _create_title_clip(self, song_title_text, artist_name_text, title_duration):
         if title_duration <= 0:
             print("Title duration is zero or negative, skipping title clip creation.")
             return None
+
+        print(f"Creating title clip (Title & Artist) using PIL for duration: {title_duration:.2f}s")
+        try:
+            overlay = self._render_title_overlay(song_title_text, artist_name_text)
+            if overlay is None:
+                return None
+            overlay_array, overlay_pos = overlay
+            title_clip = mp.ImageClip(overlay_array, ismask=False, transparent=True)
+            title_clip = title_clip.set_duration(title_duration).set_start(0).set_position(overlay_pos)
+
+            print(f"Title clip (with optional artist) created using PIL. Overlay size: {title_clip.w}x{title_clip.h} at {overlay_pos}")
+            return title_clip
+
+        except Exception as e:
+            print(f"Error creating title clip using PIL: {e}")
+            traceback.print_exc()
+            return None
+
+    def _render_title_overlay(self, song_title_text, artist_name_text):
+        """
+        Renders the song title (and artist name, if styled) centered on a transparent frame.
+        Returns (rgba_array, (x, y)) cropped to the text, or None if there is nothing to show.
+        """
+        key = (song_title_text, artist_name_text)
+        if key not in self._title_overlays:
+            self._title_overlays[key] = self._draw_title_overlay(song_title_text, artist_name_text)
+        return self._title_overlays[key]
+
+    def _draw_title_overlay(self, song_title_text, artist_name_text):
         original_title_text = (song_title_text or "").strip()
         original_artist_text = (artist_name_text or "").strip()
 
@@ -130,161 +270,152 @@ class VideoCreator:
              print("Title text is empty after stripping, skipping title clip creation.")
              return None
 
-        print(f"Creating title clip (Title & Artist) using PIL for duration: {title_duration:.2f}s")
+        title_font_size = self.title_style['font_size']
+        video_w, video_h = self.video_settings['resolution']
+        horizontal_margin = 100
+        max_text_width = video_w - (2 * horizontal_margin)
+        if max_text_width <= 0:
+            max_text_width = video_w * 0.8
+            print(f"Warning: Calculated max title width is too small. Using {max_text_width}px.")
+
         try:
-            title_font_size = self.title_style['font_size']
-            video_w, video_h = self.video_settings['resolution']
-            horizontal_margin = 100
-            max_text_width = video_w - (2 * horizontal_margin)
-            if max_text_width <= 0:
-                max_text_width = video_w * 0.8
-                print(f"Warning: Calculated max title width is too small. Using {max_text_width}px.")
+            title_font = font_registry.get_font(self.title_font_path, title_font_size)
+        except IOError:
+            print(f"CRITICAL Error: Could not load title font file '{self.title_font_path}' with PIL.")
+            raise
 
+        artist_font = None
+        render_artist = False
+        if original_artist_text and self.artist_style and self.artist_font_path:
             try:
-                title_font = ImageFont.truetype(self.title_font_path, title_font_size)
+                artist_font_size = self.artist_style['font_size']
+                artist_font = font_registry.get_font(self.artist_font_path, artist_font_size)
+                render_artist = True
+                print(f"Artist font loaded: {self.artist_style['font_name']} ({artist_font_size}pt)")
             except IOError:
-                print(f"CRITICAL Error: Could not load title font file '{self.title_font_path}' with PIL.")
-                raise
+                print(f"Warning: Could not load artist font file '{self.artist_font_path}'. Artist name will not be rendered.")
+            except KeyError as e:
+                 print(f"Warning: Missing key {e} in 'artist_style' config. Artist name might not render correctly.")
+                 render_artist = False
+        elif original_artist_text:
+            print("Warning: Artist name provided, but 'artist_style' or font is missing/invalid in config. Artist name will not be rendered.")
 
-            artist_font = None
-            render_artist = False
-            if original_artist_text and self.artist_style and self.artist_font_path:
-                try:
-                    artist_font_size = self.artist_style['font_size']
-                    artist_font = ImageFont.truetype(self.artist_font_path, artist_font_size)
-                    render_artist = True
-                    print(f"Artist font loaded: {self.artist_style['font_name']} ({artist_font_size}pt)")
-                except IOError:
-                    print(f"Warning: Could not load artist font file '{self.artist_font_path}'. Artist name will not be rendered.")
-                except KeyError as e:
-                     print(f"Warning: Missing key {e} in 'artist_style' config. Artist name might not render correctly.")
-                     render_artist = False
-            elif original_artist_text:
-                print("Warning: Artist name provided, but 'artist_style' or font is missing/invalid in config. Artist name will not be rendered.")
-
-            img = Image.new('RGBA', (video_w, video_h), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            wrapped_title_lines = self._wrap_text(draw, original_title_text, title_font, max_text_width)
-
-            if not wrapped_title_lines:
-                print("Warning: Title text resulted in no lines after wrapping.")
-                return None
+        img = Image.new('RGBA', (video_w, video_h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
 
-            if len(wrapped_title_lines) == 2:
-                line1_text = wrapped_title_lines[0]
-                line2_text = wrapped_title_lines[1]
-                line1_words = line1_text.split()
-                should_adjust = False
-                try:
-                    bbox1 = draw.textbbox((0, 0), line1_text, font=title_font)
-                    width1 = bbox1[2] - bbox1[0] if bbox1 else 0
-                    bbox2 = draw.textbbox((0, 0), line2_text, font=title_font)
-                    width2 = bbox2[2] - bbox2[0] if bbox2 else 0
-                    if width1 > 0 and width2 > 0 and (width2 / width1 < 0.4) and len(line1_words) > 1:
-                         should_adjust = True
-                except AttributeError:
-                    line2_words = line2_text.split()
-                    if len(line2_words) == 1 and len(line1_words) > 1:
-                        should_adjust = True
-
-                if should_adjust:
-                    print(f"Adjusting title lines (based on original text split)...")
-                    last_word_line1 = line1_words.pop()
-                    new_line1_text = " ".join(line1_words)
-                    if new_line1_text.strip():
-                        new_line2_text = f"{last_word_line1} {line2_text}"
-                        wrapped_title_lines = [new_line1_text, new_line2_text]
-                        print(f"Adjusted title lines (logical):\n1: {new_line1_text}\n2: {new_line2_text}")
-                    else:
-                         print("Title line adjustment aborted: Line 1 would become empty.")
-
-            title_line_height = 0
-            max_title_line_width = 0
-            title_line_details = []
-            for line in wrapped_title_lines:
+        wrapped_title_lines = self._wrap_text(draw, original_title_text, title_font, max_text_width)
+
+        if not wrapped_title_lines:
+            print("Warning: Title text resulted in no lines after wrapping.")
+            return None
+
+        if len(wrapped_title_lines) == 2:
+            line1_text = wrapped_title_lines[0]
+            line2_text = wrapped_title_lines[1]
+            line1_words = line1_text.split()
+            should_adjust = False
+            try:
+                bbox1 = draw.textbbox((0, 0), line1_text, font=title_font)
+                width1 = bbox1[2] - bbox1[0] if bbox1 else 0
+                bbox2 = draw.textbbox((0, 0), line2_text, font=title_font)
+                width2 = bbox2[2] - bbox2[0] if bbox2 else 0
+                if width1 > 0 and width2 > 0 and (width2 / width1 < 0.4) and len(line1_words) > 1:
+                     should_adjust = True
+            except AttributeError:
+                line2_words = line2_text.split()
+                if len(line2_words) == 1 and len(line1_words) > 1:
+                    should_adjust = True
+
+            if should_adjust:
+                print(f"Adjusting title lines (based on original text split)...")
+                last_word_line1 = line1_words.pop()
+                new_line1_text = " ".join(line1_words)
+                if new_line1_text.strip():
+                    new_line2_text = f"{last_word_line1} {line2_text}"
+                    wrapped_title_lines = [new_line1_text, new_line2_text]
+                    print(f"Adjusted title lines (logical):\n1: {new_line1_text}\n2: {new_line2_text}")
+                else:
+                     print("Title line adjustment aborted: Line 1 would become empty.")
+
+        title_line_height = 0
+        max_title_line_width = 0
+        title_line_details = []
+        for line in wrapped_title_lines:
+            try:
+                line_bbox = draw.textbbox((0, 0), line, font=title_font)
+                current_line_width = line_bbox[2] - line_bbox[0]
+                current_line_height = line_bbox[3] - line_bbox[1]
+                title_line_details.append({'text': line, 'width': current_line_width, 'height': current_line_height, 'bbox': line_bbox})
+                if title_line_height == 0 and current_line_height > 0:
+                     title_line_height = current_line_height
+                max_title_line_width = max(max_title_line_width, current_line_width)
+            except AttributeError:
+                 current_line_width = draw.textlength(line, font=title_font) if hasattr(draw, 'textlength') else len(line) * title_font_size * 0.6
+                 current_line_height = title_font_size * 1.2
+                 title_line_details.append({'text': line, 'width': current_line_width, 'height': current_line_height, 'bbox': None})
+                 if title_line_height == 0: title_line_height = current_line_height
+                 max_title_line_width = max(max_title_line_width, current_line_width)
+
+        if title_line_height == 0: title_line_height = title_font_size * 1.2
+        total_title_block_height = len(wrapped_title_lines) * title_line_height
+
+        artist_line_height = 0
+        total_artist_block_height = 0
+        artist_line_details = []
+        vertical_offset = 0
+        if render_artist:
+            artist_vertical_offset_from_title = self.artist_style.get('vertical_offset_from_title', 10)
+            vertical_offset += artist_vertical_offset_from_title
+
+            artist_line = original_artist_text
+            if artist_line:
                 try:
-                    line_bbox = draw.textbbox((0, 0), line, font=title_font)
-                    current_line_width = line_bbox[2] - line_bbox[0]
-                    current_line_height = line_bbox[3] - line_bbox[1]
-                    title_line_details.append({'text': line, 'width': current_line_width, 'height': current_line_height, 'bbox': line_bbox})
-                    if title_line_height == 0 and current_line_height > 0:
-                         title_line_height = current_line_height
-                    max_title_line_width = max(max_title_line_width, current_line_width)
+                    bbox = draw.textbbox((0,0), artist_line, font=artist_font)
+                    a_width = bbox[2] - bbox[0]
+                    a_height = bbox[3] - bbox[1]
+                    artist_line_details.append({'text': artist_line, 'width': a_width, 'height': a_height, 'bbox': bbox})
+                    artist_line_height = a_height if a_height > 0 else artist_font.size * 1.2
                 except AttributeError:
-                     current_line_width = draw.textlength(line, font=title_font) if hasattr(draw, 'textlength') else len(line) * title_font_size * 0.6
-                     current_line_height = title_font_size * 1.2
-                     title_line_details.append({'text': line, 'width': current_line_width, 'height': current_line_height, 'bbox': None})
-                     if title_line_height == 0: title_line_height = current_line_height
-                     max_title_line_width = max(max_title_line_width, current_line_width)
-
-            if title_line_height == 0: title_line_height = title_font_size * 1.2
-            total_title_block_height = len(wrapped_title_lines) * title_line_height
-
-            artist_line_height = 0
-            total_artist_block_height = 0
-            artist_line_details = []
-            vertical_offset = 0
-            if render_artist:
-                artist_vertical_offset_from_title = self.artist_style.get('vertical_offset_from_title', 10)
-                vertical_offset += artist_vertical_offset_from_title
-
-                artist_line = original_artist_text
-                if artist_line:
-                    try:
-                        bbox = draw.textbbox((0,0), artist_line, font=artist_font)
-                        a_width = bbox[2] - bbox[0]
-                        a_height = bbox[3] - bbox[1]
-                        artist_line_details.append({'text': artist_line, 'width': a_width, 'height': a_height, 'bbox': bbox})
-                        artist_line_height = a_height if a_height > 0 else artist_font.size * 1.2
-                    except AttributeError:
-                         a_width = draw.textlength(artist_line, font=artist_font) if hasattr(draw, 'textlength') else len(artist_line) * artist_font.size * 0.6
-                         artist_line_height = artist_font.size * 1.2
-                         artist_line_details.append({'text': artist_line, 'width': a_width, 'height': artist_line_height, 'bbox': None})
-
-                    total_artist_block_height = artist_line_height
-
-            total_combined_height = total_title_block_height + vertical_offset + total_artist_block_height
-            start_y = (video_h - total_combined_height) / 2
-
-            current_y = start_y
-            for detail in title_line_details:
-                line_text = detail['text']
-                line_width = detail['width']
-                line_x = (video_w - line_width) / 2
-                self._draw_text_with_stroke(
-                    draw=draw, pos=(line_x, current_y), text=line_text, font=title_font,
-                    fill_color=self.title_style['color'],
-                    stroke_color=self.title_style.get('stroke_color'),
-                    stroke_width=self.title_style.get('stroke_width', 0)
-                )
-                current_y += title_line_height
-
-            if render_artist and artist_line_details:
-                current_y += vertical_offset
-                artist_detail = artist_line_details[0]
-                artist_text = artist_detail['text']
-                artist_width = artist_detail['width']
-                artist_x = (video_w - artist_width) / 2
-
-                self._draw_text_with_stroke(
-                    draw=draw, pos=(artist_x, current_y), text=artist_text, font=artist_font,
-                    fill_color=self.artist_style['color'],
-                    stroke_color=self.artist_style.get('stroke_color'),
-                    stroke_width=self.artist_style.get('stroke_width', 0)
-                )
-
-            frame_array = np.array(img)
-            title_clip = mp.ImageClip(frame_array, ismask=False, transparent=True)
-            title_clip = title_clip.set_duration(title_duration).set_start(0)
-
-            print("Title clip (with optional artist) created using PIL.")
-            return title_clip
+                     a_width = draw.textlength(artist_line, font=artist_font) if hasattr(draw, 'textlength') else len(artist_line) * artist_font.size * 0.6
+                     artist_line_height = artist_font.size * 1.2
+                     artist_line_details.append({'text': artist_line, 'width': a_width, 'height': artist_line_height, 'bbox': None})
+
+                total_artist_block_height = artist_line_height
+
+        total_combined_height = total_title_block_height + vertical_offset + total_artist_block_height
+        start_y = (video_h - total_combined_height) / 2
+
+        current_y = start_y
+        for detail in title_line_details:
+            line_text = detail['text']
+            line_width = detail['width']
+            line_x = (video_w - line_width) / 2
+            self._draw_text_with_stroke(
+                draw=draw, pos=(line_x, current_y), text=line_text, font=title_font,
+                fill_color=self.title_style['color'],
+                stroke_color=self.title_style.get('stroke_color'),
+                stroke_width=self.title_style.get('stroke_width', 0)
+            )
+            current_y += title_line_height
+
+        if render_artist and artist_line_details:
+            current_y += vertical_offset
+            artist_detail = artist_line_details[0]
+            artist_text = artist_detail['text']
+            artist_width = artist_detail['width']
+            artist_x = (video_w - artist_width) / 2
+
+            self._draw_text_with_stroke(
+                draw=draw, pos=(artist_x, current_y), text=artist_text, font=artist_font,
+                fill_color=self.artist_style['color'],
+                stroke_color=self.artist_style.get('stroke_color'),
+                stroke_width=self.artist_style.get('stroke_width', 0)
+            )
 
-        except Exception as e:
-            print(f"Error creating title clip using PIL: {e}")
-            traceback.print_exc()
-            return None
+        overlay = self._crop_to_content(img)
+        if overlay is None:
+            print("Warning: Title rendering produced no visible pixels.")
+        return overlay
 
     def _draw_text_with_stroke(self, draw, pos, text, font, fill_color, stroke_color, stroke_width):
         x, y = pos
@@ -306,6 +437,18 @@ class VideoCreator:
 
         draw.text((x, y), processed_text, font=font, fill=fill_color)
 
+    def _crop_to_content(self, img):
+        """
+        Crops a full-frame RGBA render down to the bounding box of its visible pixels.
+        Returns (rgba_array, (x, y)) where (x, y) is the crop's position in the frame,
+        or None if nothing was drawn. Compositing cost then scales with the text area
+        instead of the whole frame.
+        """
+        bbox = img.getbbox()
+        if not bbox:
+            return None
+        return np.array(img.crop(bbox)), (bbox[0], bbox[1])
+
     def _is_hebrew(self, text_line):
         return any('\u0590' <= char <= '\u05FF' for char in text_line)
 
@@ -350,8 +493,12 @@ class VideoCreator:
 
             return wrapped_lines if wrapped_lines else ([line_text.strip()] if line_text.strip() else [])
 
-    def _create_styled_subtitle_clip_pil(self, subs_data_source, subs_data_target, total_duration):
-        print("Processing combined subtitles (Source/Target) using PIL with BiDi...")
+    def _combine_subtitles(self, subs_data_source, subs_data_target, total_duration):
+        """
+        Merges source and target subtitles by id into [((start, end), text, sub_id)], sorted by start.
+        Source and target text are joined with the "<--SEP-->" separator. Returns [] if nothing is valid.
+        """
+        print("Processing combined subtitles (Source/Target)...")
         subs_source = subs_data_source if isinstance(subs_data_source, list) else []
         subs_target = subs_data_target if isinstance(subs_data_target, list) else []
         combined_subs_format = []
@@ -360,8 +507,7 @@ class VideoCreator:
 
         if not subs_source and not subs_target:
             print("Warning: No subtitle data provided (source or target).")
-            empty_clip = mp.ColorClip(size=self.video_settings['resolution'], color=(0,0,0,0), ismask=True, duration=total_duration).set_opacity(0)
-            return empty_clip, []
+            return []
 
         subs_source_map = {str(sub.get('id', f'src_{i}')): sub for i, sub in enumerate(subs_source)}
         subs_target_map = {str(sub.get('id', f'tgt_{i}')): sub for i, sub in enumerate(subs_target)}
@@ -440,141 +586,168 @@ class VideoCreator:
 
         if not combined_subs_format:
             print("Warning: No valid combined subtitles were created.")
-            empty_clip = mp.ColorClip(size=self.video_settings['resolution'], color=(0,0,0,0), ismask=True, duration=total_duration).set_opacity(0)
-            return empty_clip, []
+            return []
 
         combined_subs_format.sort(key=lambda item: item[0][0])
         print(f"DEBUG: Finished merge. Combined {len(combined_subs_format)} subtitle entries.")
         self.combined_subs_list_for_frames = combined_subs_format
+        return combined_subs_format
 
-        # PIL Text Rendering Generator Function
-        def generator(txt):
-            try:
-                font_source = ImageFont.truetype(self.source_subtitle_font_path, self.source_sub_style['font_size'])
-                font_target = ImageFont.truetype(self.target_subtitle_font_path, self.target_sub_style['font_size'])
-            except Exception as e:
-                print(f"CRITICAL Error loading PIL subtitle fonts ('{self.source_subtitle_font_path}', '{self.target_subtitle_font_path}'): {e}")
-                return mp.ImageClip(np.zeros((10, 10, 4), dtype=np.uint8), ismask=False, transparent=True).set_duration(0.1)
-
-            video_w, video_h = self.video_settings['resolution']
-            max_text_width = video_w * 0.85
-
-            if not txt or not txt.strip():
-                empty_frame = np.zeros((video_h, video_w, 4), dtype=np.uint8)
-                return mp.ImageClip(empty_frame, ismask=False, transparent=True).set_duration(1.0 / self.video_settings['fps'])
-
-            img = Image.new('RGBA', (video_w, video_h), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            # Split into source/target based on the separator
-            role_blocks = txt.split("\n<--SEP-->\n")
-            processed_lines_details = []
-            total_text_height = 0
-            line_counter = 0
-
-            layout_cfg = self.subtitle_style['layout']
-            spacing_within = layout_cfg.get('spacing_within_block', 10)
-            spacing_between = layout_cfg.get('spacing_between_blocks', 35)
-
-            for block_index, block in enumerate(role_blocks):
-                original_lines_in_block = [line for line in block.splitlines() if line.strip()]
-                if not original_lines_in_block: continue
-
-                # Determine if source (first block) or target (second block)
-                is_source_block = (block_index == 0)
-                block_style = self.source_sub_style if is_source_block else self.target_sub_style
-                font_for_block = font_source if is_source_block else font_target
-
-                sub_color = block_style['color']
-                sub_stroke_color = block_style.get('stroke_color')
-                sub_stroke_width = block_style.get('stroke_width', 0)
-
-                for i, line in enumerate(original_lines_in_block):
-                    wrapped_lines = self._wrap_text(draw, line, font_for_block, max_text_width)
-
-                    for k, wrapped_line in enumerate(wrapped_lines):
-                        try:
-                            bbox = draw.textbbox((0, 0), wrapped_line, font=font_for_block)
-                            line_width = bbox[2] - bbox[0]
-                            line_height = bbox[3] - bbox[1]
-                        except AttributeError:
-                            line_width = draw.textlength(wrapped_line, font=font_for_block) if hasattr(draw, 'textlength') else 100
-                            line_height = font_for_block.size * 1.2
-
-                        is_last_wrapped_in_line = (k == len(wrapped_lines) - 1)
-                        is_last_line_in_block = (i == len(original_lines_in_block) - 1)
-                        is_last_block = (block_index == len(role_blocks) - 1)
-                        is_transitioning_block = is_last_line_in_block and is_last_wrapped_in_line and not is_last_block
-
-                        spacing_after_this_line = 0
-                        if is_transitioning_block:
-                             spacing_after_this_line = spacing_between
-                        elif not is_last_wrapped_in_line or not is_last_line_in_block:
-                            spacing_after_this_line = spacing_within
-
-
-                        line_detail = {
-                            'text': wrapped_line,
-                            'font': font_for_block,
-                            'is_source': is_source_block,
-                            'width': line_width,
-                            'height': line_height,
-                            'spacing_after': spacing_after_this_line,
-                            'line_index': line_counter,
-                            'color': sub_color,
-                            'stroke_color': sub_stroke_color,
-                            'stroke_width': sub_stroke_width
-                        }
-                        processed_lines_details.append(line_detail)
-                        total_text_height += line_height + spacing_after_this_line
-                        line_counter += 1
-
-            if processed_lines_details:
-                 # Adjust total height if the last line had spacing (it shouldn't have trailing space)
-                 if processed_lines_details[-1]['spacing_after'] > 0:
-                    total_text_height -= processed_lines_details[-1]['spacing_after']
-
-
-            vertical_alignment = layout_cfg.get('vertical_alignment', 'center').lower()
-            if vertical_alignment == 'bottom':
-                 bottom_margin = layout_cfg.get('bottom_margin', 50)
-                 current_y = video_h - total_text_height - bottom_margin
-            elif vertical_alignment == 'top':
-                 top_margin = layout_cfg.get('top_margin', 50)
-                 current_y = top_margin
-            else: # Default center
-                 current_y = (video_h - total_text_height) / 2
-
-            for detail in processed_lines_details:
-                x_pos = (video_w - detail['width']) / 2
-                text_to_draw = detail['text']
-
-                self._draw_text_with_stroke(
-                    draw, (x_pos, current_y), text_to_draw, detail['font'],
-                    detail['color'], detail['stroke_color'], detail['stroke_width']
-                )
-                current_y += detail['height'] + detail['spacing_after']
-
-            frame_array = np.array(img)
-            return mp.ImageClip(frame_array, ismask=False, transparent=True).set_duration(1.0 / self.video_settings['fps'])
-
-        subs_for_moviepy = [(item[0], item[1]) for item in combined_subs_format]
-
-        if not subs_for_moviepy:
-             print("Warning: No subtitle data to feed into MoviePy SubtitlesClip.")
-             empty_clip = mp.ColorClip(size=self.video_settings['resolution'], color=(0,0,0,0), ismask=True, duration=total_duration).set_opacity(0)
-             return empty_clip, self.combined_subs_list_for_frames
+    def _create_subtitle_overlay_pil(self, subs_data_source, subs_data_target, total_duration):
+        combined_subs_format = self._combine_subtitles(subs_data_source, subs_data_target, total_duration)
+        if not combined_subs_format:
+            return None
 
+        print("Rasterizing combined subtitles using PIL with BiDi...")
         try:
-            subtitle_moviepy_clip = SubtitlesClip(subs_for_moviepy, generator)
-            subtitle_moviepy_clip = subtitle_moviepy_clip.set_duration(total_duration).set_position(('center', 'center'))
-            print(f"SubtitlesClip created successfully. Duration: {subtitle_moviepy_clip.duration:.2f}s")
-            return subtitle_moviepy_clip, self.combined_subs_list_for_frames
+            sheet = SpriteSheet(self._render_subtitle_sprites([text for _, text, _ in combined_subs_format]))
         except Exception as e:
-            print(f"CRITICAL Error creating MoviePy SubtitlesClip: {e}")
+            print(f"CRITICAL Error rasterizing subtitle sprites: {e}")
             traceback.print_exc()
-            empty_clip = mp.ColorClip(size=self.video_settings['resolution'], color=(0,0,0,0), ismask=True, duration=total_duration).set_opacity(0)
-            return empty_clip, []
+            return None
+
+        rendered_count = sum(1 for index in range(len(sheet)) if sheet.sprite(index) is not None)
+        if not rendered_count:
+            print("Warning: No subtitle overlays were rendered.")
+            return None
+
+        print(f"Rasterized {rendered_count} tight-cropped subtitle sprites ({sheet.nbytes / 1e6:.1f} MB).")
+        return SubtitleOverlay(sheet, [interval for interval, _, _ in combined_subs_format])
+
+    def _render_subtitle_sprite(self, text):
+        font_source = font_registry.get_font(self.source_subtitle_font_path, self.source_sub_style['font_size'])
+        font_target = font_registry.get_font(self.target_subtitle_font_path, self.target_sub_style['font_size'])
+        return self._render_subtitle_overlay(text, font_source, font_target)
+
+    def _cpu_count(self):
+        return self.cpu_budget or os.cpu_count() or 1
+
+    def _render_subtitle_sprites(self, texts):
+        """
+        Rasterizes every subtitle up front. With several cores the texts are split across
+        worker processes (PIL text drawing holds the GIL); otherwise they render in-process.
+        """
+        workers = min(self._cpu_count(), len(texts) // MIN_SPRITES_PER_WORKER)
+        if workers <= 1:
+            return [self._render_subtitle_sprite(text) for text in texts]
+
+        print(f"Rasterizing {len(texts)} subtitles in {workers} processes...")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sprite_worker, initargs=(self.cfg,)) as executor:
+            return list(executor.map(_render_sprite, texts, chunksize=max(1, len(texts) // (workers * 4))))
+
+    def _render_subtitle_overlay(self, txt, font_source, font_target):
+        """
+        Renders one combined (source/target) subtitle with PIL and crops it to its
+        text bounding box. Returns (rgba_array, (x, y)) or None for empty text.
+        """
+        if not txt or not txt.strip():
+            return None
+
+        video_w, video_h = self.video_settings['resolution']
+        img = Image.new('RGBA', (video_w, video_h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        for detail in self._layout_subtitle(txt, font_source, font_target, draw):
+            self._draw_text_with_stroke(
+                draw, (detail['x'], detail['y']), detail['text'], detail['font'],
+                detail['color'], detail['stroke_color'], detail['stroke_width']
+            )
+
+        return self._crop_to_content(img)
+
+    def _layout_subtitle(self, txt, font_source, font_target, draw):
+        """
+        Wraps and positions the lines of one combined (source/target) subtitle.
+        Returns a list of line details (text, font, style and the x/y of the line in the frame).
+        """
+        video_w, video_h = self.video_settings['resolution']
+        max_text_width = video_w * 0.85
+
+        # Split into source/target based on the separator
+        role_blocks = txt.split("\n<--SEP-->\n")
+        processed_lines_details = []
+        total_text_height = 0
+        line_counter = 0
+
+        layout_cfg = self.subtitle_style['layout']
+        spacing_within = layout_cfg.get('spacing_within_block', 10)
+        spacing_between = layout_cfg.get('spacing_between_blocks', 35)
+
+        for block_index, block in enumerate(role_blocks):
+            original_lines_in_block = [line for line in block.splitlines() if line.strip()]
+            if not original_lines_in_block: continue
+
+            # Determine if source (first block) or target (second block)
+            is_source_block = (block_index == 0)
+            block_style = self.source_sub_style if is_source_block else self.target_sub_style
+            font_for_block = font_source if is_source_block else font_target
+
+            sub_color = block_style['color']
+            sub_stroke_color = block_style.get('stroke_color')
+            sub_stroke_width = block_style.get('stroke_width', 0)
+
+            for i, line in enumerate(original_lines_in_block):
+                wrapped_lines = self._wrap_text(draw, line, font_for_block, max_text_width)
+
+                for k, wrapped_line in enumerate(wrapped_lines):
+                    try:
+                        bbox = draw.textbbox((0, 0), wrapped_line, font=font_for_block)
+                        line_width = bbox[2] - bbox[0]
+                        line_height = bbox[3] - bbox[1]
+                    except AttributeError:
+                        line_width = draw.textlength(wrapped_line, font=font_for_block) if hasattr(draw, 'textlength') else 100
+                        line_height = font_for_block.size * 1.2
+
+                    is_last_wrapped_in_line = (k == len(wrapped_lines) - 1)
+                    is_last_line_in_block = (i == len(original_lines_in_block) - 1)
+                    is_last_block = (block_index == len(role_blocks) - 1)
+                    is_transitioning_block = is_last_line_in_block and is_last_wrapped_in_line and not is_last_block
+
+                    spacing_after_this_line = 0
+                    if is_transitioning_block:
+                         spacing_after_this_line = spacing_between
+                    elif not is_last_wrapped_in_line or not is_last_line_in_block:
+                        spacing_after_this_line = spacing_within
+
+
+                    line_detail = {
+                        'text': wrapped_line,
+                        'font': font_for_block,
+                        'is_source': is_source_block,
+                        'width': line_width,
+                        'height': line_height,
+                        'spacing_after': spacing_after_this_line,
+                        'line_index': line_counter,
+                        'color': sub_color,
+                        'stroke_color': sub_stroke_color,
+                        'stroke_width': sub_stroke_width
+                    }
+                    processed_lines_details.append(line_detail)
+                    total_text_height += line_height + spacing_after_this_line
+                    line_counter += 1
+
+        if processed_lines_details:
+             # Adjust total height if the last line had spacing (it shouldn't have trailing space)
+             if processed_lines_details[-1]['spacing_after'] > 0:
+                total_text_height -= processed_lines_details[-1]['spacing_after']
+
+
+        vertical_alignment = layout_cfg.get('vertical_alignment', 'center').lower()
+        if vertical_alignment == 'bottom':
+             bottom_margin = layout_cfg.get('bottom_margin', 50)
+             current_y = video_h - total_text_height - bottom_margin
+        elif vertical_alignment == 'top':
+             top_margin = layout_cfg.get('top_margin', 50)
+             current_y = top_margin
+        else: # Default center
+             current_y = (video_h - total_text_height) / 2
+
+        for detail in processed_lines_details:
+            detail['x'] = (video_w - detail['width']) / 2
+            detail['y'] = current_y
+            current_y += detail['height'] + detail['spacing_after']
+
+        return processed_lines_details
 
     def _sanitize_filename(self, text, max_len=50):
         text = text.replace('\n', ' ').replace('\r', '')
@@ -592,84 +765,301 @@ class VideoCreator:
                  text = text[:max_len] + "_etc"
         return text
 
-    def _save_subtitle_frame_processor(self, get_frame, t):
+    def _save_subtitle_frame(self, clip, frames_dir, start_time, end_time, text):
+        """Renders the frame at the subtitle's midpoint and writes it as a PNG preview."""
+        time_sec = int(start_time)
+        time_ms = int((start_time - time_sec) * 1000)
+        time_str = f"{time_sec:04d}_{time_ms:03d}"
+        safe_text = self._sanitize_filename(text)
+        filename_base = f"frame_{time_str}_{safe_text}"
+        max_fname_len = 150
+        filename = os.path.join(frames_dir, f"{filename_base[:max_fname_len]}.png")
+
+        frame = clip.get_frame((start_time + end_time) / 2)
+        imageio.imwrite(filename, frame[..., :3])
+        return filename
+
+    def _start_subtitle_frame_previews(self, clip, frames_dir, executor):
+        """
+        Queues one preview frame per subtitle with text. Each is a separate get_frame call
+        on the composite, so the encode loop carries no callback and no PNG writes.
+        Returns a list of (future, start_time).
+        """
+        return [
+            (executor.submit(self._save_subtitle_frame, clip, frames_dir, start_time, end_time, text), start_time)
+            for (start_time, end_time), text, _ in self.combined_subs_list_for_frames
+            if text and text.strip()
+        ]
+
+    def _collect_subtitle_frame_previews(self, preview_futures):
+        saved_count = 0
+        for future, start_time in preview_futures:
+            try:
+                future.result()
+                saved_count += 1
+            except Exception as e:
+                print(f"Error saving subtitle frame for t={start_time:.3f}s: {e}")
+        return saved_count
+
+    def prepare(self, mp3_path, song_title_text, artist_name_text):
+        """
+        Does the work that does not depend on the subtitles: opens the audio, scales the
+        background and intro images and renders the title card (fonts are loaded in __init__).
+        Meant to run in a background thread while the subtitles are generated; create_video
+        then reuses the results for the same song.
+        """
+        print("Preparing audio, backgrounds and title card...")
+        audio_clip, duration = self._load_audio(mp3_path)
+        self._preloaded_audio = (mp3_path, audio_clip, duration)
+        self._fitted_image_clip(self.background_image_path, duration)
+        if self.intro_background_image_path:
+            try:
+                self._fitted_image_clip(self.intro_background_image_path, duration)
+            except Exception as e:
+                print(f"Warning: Could not prepare intro background '{self.intro_background_image_path}': {e}")
         try:
-            frame = get_frame(t)
-            if frame is None:
-                 return np.zeros((self.video_settings['resolution'][1], self.video_settings['resolution'][0], 3), dtype=np.uint8)
+            self._render_title_overlay(song_title_text, artist_name_text)
         except Exception as e:
-            return np.zeros((self.video_settings['resolution'][1], self.video_settings['resolution'][0], 3), dtype=np.uint8)
-
-        active_sub_info = None
-        epsilon = 1 / (self.video_settings['fps'] * 2)
+            print(f"Warning: Could not prepare title card: {e}")
+        print("Video assets prepared.")
+
+    def _write_still(self, frame, path):
+        imageio.imwrite(path, np.asarray(frame)[..., :3].astype(np.uint8))
+        return path
+
+    def _background_frame(self):
+        return np.asarray(self._fitted_image_clip(self.background_image_path, 1).get_frame(0))[..., :3].astype(np.uint8)
+
+    def _intro_frame(self, background_frame, song_title_text, artist_name_text):
+        """The intro background (or the main background) with the title card blended on it."""
+        intro_frame = background_frame
+        if self.intro_background_image_path:
+            intro_frame = self._fitted_image_clip(self.intro_background_image_path, 1).get_frame(0)
+        intro_frame = np.array(intro_frame[..., :3], dtype=np.uint8)
+        overlay = self._render_title_overlay(song_title_text, artist_name_text)
+        if overlay is not None:
+            blend_sprite(intro_frame, *overlay)
+        return intro_frame
+
+    def _ffmpeg_command(self):
+        from moviepy.config import get_setting
+        command = [get_setting("FFMPEG_BINARY"), '-y', '-hide_banner', '-loglevel', 'error', '-stats']
+        if self.cpu_budget:
+            command += ['-filter_complex_threads', str(self.cpu_budget)]
+        return command
+
+    def _encoder_threads(self):
+        """ffmpeg output options that keep the encoder within cpu_budget (ffmpeg picks by itself otherwise)."""
+        return ['-threads', str(self.cpu_budget)] if self.cpu_budget else []
+
+    def _write_ass_file(self, source_subtitle_data, target_subtitle_data, audio_duration, path):
+        """
+        Writes the combined subtitles as an ASS script: one positioned Dialogue line per
+        wrapped line, laid out exactly like the PIL renderer. Returns the number of events.
+        """
+        combined_subs = self._combine_subtitles(source_subtitle_data, target_subtitle_data, audio_duration)
+        font_source = font_registry.get_font(self.source_subtitle_font_path, self.source_sub_style['font_size'])
+        font_target = font_registry.get_font(self.target_subtitle_font_path, self.target_sub_style['font_size'])
+        draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+        line_offsets = {
+            True: ass_line_offset(font_source, self.source_subtitle_font_path),
+            False: ass_line_offset(font_target, self.target_subtitle_font_path),
+        }
+
+        events = []
+        for (start_time, end_time), text, _ in combined_subs:
+            if not text or not text.strip():
+                continue
+            for detail in self._layout_subtitle(text, font_source, font_target, draw):
+                style_name = 'Source' if detail['is_source'] else 'Target'
+                y = detail['y'] - line_offsets[detail['is_source']]
+                events.append((start_time, end_time, style_name, detail['x'], y, detail['text']))
+
+        styles = [
+            ass_style('Source', font_source, self.source_subtitle_font_path, self.source_sub_style),
+            ass_style('Target', font_target, self.target_subtitle_font_path, self.target_sub_style),
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(build_ass_script(self.video_settings['resolution'], styles, events))
+        return len(events)
+
+    def _create_video_ass(self, mp3_path, song_title_text, artist_name_text, source_subtitle_data, target_subtitle_data, output_video_file):
+        """
+        Renders the video with ffmpeg alone: the background (and the intro still with the title card)
+        are written once as PNGs and the subtitles are burned in by libass from an ASS script.
+        Paths inside the filter graph are relative to a work directory, which avoids escaping
+        drive letters and colons in ffmpeg filter arguments.
+        """
+        work_dir = tempfile.mkdtemp(prefix='ass-render-', dir=self.output_video_dir)
+        try:
+            audio_clip, audio_duration = self._load_audio(mp3_path)
+            audio_clip.close()
+            fps = self.video_settings['fps']
+
+            print("Writing background stills...")
+            background_frame = self._background_frame()
+            self._write_still(background_frame, os.path.join(work_dir, 'background.png'))
+            # Each still is decoded once and repeated by the loop filter (cheaper than "-loop 1" re-decoding every frame).
+            inputs = ['-i', 'background.png']
+            filters = [f"[0:v]loop=loop=-1:size=1,fps={fps},format=yuv420p[background]"]
+            last_label = 'background'
+
+            title_duration = self._get_title_duration(source_subtitle_data, target_subtitle_data, audio_duration)
+            if title_duration > 0:
+                intro_frame = self._intro_frame(background_frame, song_title_text, artist_name_text)
+                self._write_still(intro_frame, os.path.join(work_dir, 'intro.png'))
+                inputs += ['-i', 'intro.png']
+                filters.append(f"[1:v]loop=loop=-1:size=1,fps={fps},format=yuv420p,trim=duration={title_duration:.3f}[intro]")
+                filters.append("[intro][background]concat=n=2:v=1:a=0[base]")
+                last_label = 'base'
+
+            fonts_dir = os.path.join(work_dir, 'fonts')
+            os.makedirs(fonts_dir)
+            for font_path in {self.source_subtitle_font_path, self.target_subtitle_font_path}:
+                shutil.copy(font_path, fonts_dir)
+
+            event_count = self._write_ass_file(source_subtitle_data, target_subtitle_data, audio_duration, os.path.join(work_dir, 'subtitles.ass'))
+            print(f"Wrote {event_count} positioned subtitle lines to the ASS script.")
+            filters.append(f"[{last_label}]ass=subtitles.ass:fontsdir=fonts[video]")
+
+            audio_input_index = inputs.count('-i')
+            command = [
+                *self._ffmpeg_command(), *inputs, '-i', os.path.abspath(mp3_path),
+                '-filter_complex', ";".join(filters),
+                '-map', '[video]', '-map', f'{audio_input_index}:a',
+                '-c:v', 'libx264', '-preset', 'medium', '-tune', 'stillimage', '-pix_fmt', 'yuv420p',
+                *self._encoder_threads(),
+                '-c:a', 'aac', '-t', f'{audio_duration:.3f}',
+                os.path.abspath(output_video_file),
+            ]
+            print(f"Burning in subtitles with ffmpeg/libass to '{output_video_file}'...")
+            subprocess.run(command, cwd=work_dir, check=True)
 
-        for interval, text, sub_id in self.combined_subs_list_for_frames:
-            start_time, end_time = interval
-            if (start_time - epsilon) <= t < (end_time - epsilon):
-                if text and text.strip():
-                     active_sub_info = (text, sub_id, start_time)
-                break
+            print(f"\nVideo creation successful: '{output_video_file}'")
+            return output_video_file
 
-        if active_sub_info:
-            text, sub_id, start_time = active_sub_info
-            if sub_id not in self.saved_subtitle_ids:
-                try:
-                    if not os.path.exists(self.output_frames_dir):
-                         os.makedirs(self.output_frames_dir, exist_ok=True)
-                         print(f"Created subtitle frames directory: {self.output_frames_dir}")
-
-                    time_sec = int(start_time)
-                    time_ms = int((start_time - time_sec) * 1000)
-                    time_str = f"{time_sec:04d}_{time_ms:03d}"
-                    safe_text = self._sanitize_filename(text)
-                    filename_base = f"frame_{time_str}_{safe_text}"
-                    max_fname_len = 150
-                    filename = os.path.join(self.output_frames_dir, f"{filename_base[:max_fname_len]}.png")
-
-                    if frame.shape[2] == 4:
-                        frame_rgb = frame[..., :3]
-                    else:
-                         frame_rgb = frame
-
-                    imageio.imwrite(filename, frame_rgb)
-                    self.saved_subtitle_ids.add(sub_id)
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"\nError: ffmpeg subtitle burn-in failed: {e}")
+            return None
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _still_segments(self, title_duration, subtitle_intervals, audio_duration):
+        """
+        Splits [0, audio_duration) at every point where the picture can change: the end of the
+        title card and each subtitle start/end. Returns a list of (start, end).
+        """
+        edges = {0.0, audio_duration}
+        if 0 < title_duration < audio_duration:
+            edges.add(title_duration)
+        for start_time, end_time in subtitle_intervals:
+            edges.update(edge for edge in (start_time, end_time) if 0 < edge < audio_duration)
+        edges = sorted(edges)
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _create_video_stills(self, mp3_path, song_title_text, artist_name_text, source_subtitle_data, target_subtitle_data, output_video_file):
+        """
+        Renders the video as a slideshow: the picture only changes at subtitle boundaries, so one
+        frame is composited per interval (identical states share a PNG) and ffmpeg's concat demuxer
+        shows each still for its duration. The original MP3 is muxed in without re-encoding.
+        """
+        work_dir = tempfile.mkdtemp(prefix='stills-render-', dir=self.output_video_dir)
+        try:
+            audio_clip, audio_duration = self._load_audio(mp3_path)
+            audio_clip.close()
+
+            background_frame = self._background_frame()
+            title_duration = self._get_title_duration(source_subtitle_data, target_subtitle_data, audio_duration)
+            intro_frame = self._intro_frame(background_frame, song_title_text, artist_name_text) if title_duration > 0 else None
+
+            subtitle_overlay = self._create_subtitle_overlay_pil(source_subtitle_data, target_subtitle_data, audio_duration)
+            subtitle_intervals = [interval for interval, _, _ in self.combined_subs_list_for_frames] if subtitle_overlay else []
+
+            # Consecutive intervals with the same picture (intro or not, same active subtitles) are merged.
+            segments = []
+            for start_time, end_time in self._still_segments(title_duration, subtitle_intervals, audio_duration):
+                is_intro = start_time < title_duration
+                active = subtitle_overlay.index.lookup_all(start_time) if subtitle_overlay else ()
+                state = (is_intro, active)
+                if segments and segments[-1][0] == state:
+                    segments[-1][2] = end_time
+                else:
+                    segments.append([state, start_time, end_time])
+
+            still_files = {}
+            concat_lines = ["ffconcat version 1.0"]
+            for state, start_time, end_time in segments:
+                if state not in still_files:
+                    base_frame = intro_frame if state[0] else background_frame
+                    frame = subtitle_overlay(lambda t: base_frame, start_time) if subtitle_overlay else base_frame
+                    still_files[state] = self._write_still(frame, os.path.join(work_dir, f"still_{len(still_files):04d}.png"))
+                concat_lines.append(f"file '{os.path.basename(still_files[state])}'")
+                concat_lines.append(f"duration {end_time - start_time:.6f}")
+            # The concat demuxer ignores the duration of the last entry unless the file is repeated.
+            concat_lines.append(concat_lines[-2])
+            with open(os.path.join(work_dir, 'stills.ffconcat'), 'w', encoding='utf-8') as f:
+                f.write("\n".join(concat_lines) + "\n")
+            print(f"Composited {len(still_files)} stills for {len(segments)} segments.")
+
+            command = [
+                *self._ffmpeg_command(),
+                '-f', 'concat', '-i', 'stills.ffconcat', '-i', os.path.abspath(mp3_path),
+                '-map', '0:v', '-map', '1:a',
+                '-vf', f"fps={self.video_settings['fps']},format=yuv420p",
+                '-c:v', 'libx264', '-preset', 'medium', '-tune', 'stillimage',
+                *self._encoder_threads(),
+                '-c:a', 'copy', '-t', f'{audio_duration:.3f}',
+                os.path.abspath(output_video_file),
+            ]
+            print(f"Encoding still segments with ffmpeg to '{output_video_file}'...")
+            subprocess.run(command, cwd=work_dir, check=True)
 
-                except Exception as e:
-                    print(f"Error saving frame at t={t:.3f}s (sub_id: {sub_id}): {e}")
-                    self.saved_subtitle_ids.add(sub_id)
+            print(f"\nVideo creation successful: '{output_video_file}'")
+            return output_video_file
 
-        return frame
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"\nError: ffmpeg still-segment encoding failed: {e}")
+            return None
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
     def create_video(self, mp3_path, song_title_text, artist_name_text, source_subtitle_data, target_subtitle_data, output_video_filename_base):
         print(f"\n--- Starting Video Creation for: {output_video_filename_base} ---")
-        output_video_file = os.path.join(self.output_video_dir, f"{output_video_filename_base}_subtitled.mp4")
+        output_video_file = output_video_path(self.output_video_dir, output_video_filename_base)
+
+        if self.renderer in ('ass', 'stills'):
+            render_with_ffmpeg = self._create_video_ass if self.renderer == 'ass' else self._create_video_stills
+            created = render_with_ffmpeg(
+                mp3_path, song_title_text, artist_name_text, source_subtitle_data, target_subtitle_data, output_video_file
+            )
+            if created:
+                print("--- Video Creation Process Finished ---")
+                return created
+            print("Falling back to the MoviePy renderer...")
+
         temp_audio_file = os.path.join(self.output_video_dir, f'temp-audio-{os.path.basename(output_video_filename_base)}-{int(time.time())}.m4a')
 
         audio_clip = None
         background_clip = None
         intro_background_clip = None
         title_clip = None
-        subtitles_clip = None
+        subtitle_overlay = None
         final_clip_for_render = None
+        preview_executor = None
+        preview_futures = []
+        frames_dir = None
         video_created_successfully = False
 
         try:
             audio_clip, audio_duration = self._load_audio(mp3_path)
             background_clip = self._create_background_clip(audio_duration)
 
-            first_sub_time = self._get_first_subtitle_time(source_subtitle_data, target_subtitle_data, audio_duration)
-            min_title_threshold = 0.5
-            title_duration = first_sub_time if first_sub_time >= min_title_threshold else 0
+            title_duration = self._get_title_duration(source_subtitle_data, target_subtitle_data, audio_duration)
 
             if title_duration > 0 and self.intro_background_image_path:
                 print("Creating intro background clip...")
                 try:
-                    intro_background_clip = mp.ImageClip(self.intro_background_image_path, duration=title_duration)
-                    target_w, target_h = self.video_settings['resolution']
-                    intro_background_clip = intro_background_clip.resize(height=target_h)
-                    if intro_background_clip.w > target_w:
-                        intro_background_clip = intro_background_clip.crop(x_center=intro_background_clip.w / 2, width=target_w)
-                    intro_background_clip = intro_background_clip.resize((target_w, target_h))
+                    intro_background_clip = self._fitted_image_clip(self.intro_background_image_path, title_duration)
                     intro_background_clip = intro_background_clip.set_fps(self.video_settings['fps'])
                     intro_background_clip = intro_background_clip.set_start(0).set_duration(title_duration)
                     print("Intro background clip created.")
@@ -679,15 +1069,11 @@ class VideoCreator:
 
             title_clip = self._create_title_clip(song_title_text, artist_name_text, title_duration)
 
-            subtitles_clip, _ = self._create_styled_subtitle_clip_pil(
+            subtitle_overlay = self._create_subtitle_overlay_pil(
                 source_subtitle_data, target_subtitle_data, audio_duration
             )
-            if not subtitles_clip or subtitles_clip.duration <= 0:
-                 print("Warning: Subtitle clip generation failed or resulted in an empty clip.")
-                 subtitles_clip = None
-            elif subtitles_clip.duration > audio_duration + 1:
-                print(f"Warning: Subtitles clip duration ({subtitles_clip.duration:.2f}s) significantly exceeds audio duration ({audio_duration:.2f}s). Trimming.")
-                subtitles_clip = subtitles_clip.set_duration(audio_duration)
+            if not subtitle_overlay:
+                 print("Warning: Subtitle sprite generation failed or resulted in no overlays.")
 
             print("Compositing video layers...")
             clips_to_composite = [background_clip]
@@ -698,39 +1084,40 @@ class VideoCreator:
                  print("Using main background for intro section.")
             if title_clip:
                 clips_to_composite.append(title_clip)
-            if subtitles_clip:
-                clips_to_composite.append(subtitles_clip)
-            else:
-                 print("Info: No valid subtitle clip to composite.")
 
             composite_video = mp.CompositeVideoClip(clips_to_composite, size=self.video_settings['resolution'])
             composite_video = composite_video.set_duration(audio_duration)
+            if subtitle_overlay:
+                # Subtitles are blended from the sprite sheet by time, on top of the other layers.
+                composite_video = composite_video.fl(subtitle_overlay).set_duration(audio_duration)
+            else:
+                 print("Info: No valid subtitle overlay to composite.")
 
-            print("Attaching frame saving processor...")
             if self.combined_subs_list_for_frames:
-                 final_video_layers = composite_video.fl(self._save_subtitle_frame_processor, apply_to=['color'])
-                 final_video_layers = final_video_layers.set_duration(audio_duration)
-                 print("Frame saving enabled.")
+                print("Rendering subtitle preview frames in the background...")
+                # A directory per render: batch mode runs several renders next to each other
+                os.makedirs(self.output_frames_dir, exist_ok=True)
+                frames_dir = tempfile.mkdtemp(prefix=f"{self._sanitize_filename(output_video_filename_base)}-", dir=self.output_frames_dir)
+                preview_executor = ThreadPoolExecutor(max_workers=min(4, self._cpu_count()))
+                preview_futures = self._start_subtitle_frame_previews(composite_video, frames_dir, preview_executor)
             else:
-                print("No subtitle data for frame saving, skipping processor attachment.")
-                final_video_layers = composite_video
+                print("No subtitle data for frame saving, skipping preview frames.")
 
             print("Adding audio...")
-            final_clip_for_render = final_video_layers.set_audio(audio_clip)
+            final_clip_for_render = composite_video.set_audio(audio_clip)
             final_clip_for_render = final_clip_for_render.set_duration(audio_duration)
 
             print(f"Writing final video to '{output_video_file}'...")
             if not final_clip_for_render or final_clip_for_render.duration <= 0:
                  raise ValueError("Final video clip for rendering is invalid or has zero duration.")
 
-            self.saved_subtitle_ids = set()
             render_params = {
                 "fps": self.video_settings['fps'],
                 "codec": 'libx264',
                 "audio_codec": 'aac',
                 "temp_audiofile": temp_audio_file,
                 "remove_temp": True,
-                "threads": max(1, (os.cpu_count() or 2) // 2),
+                "threads": max(1, self._cpu_count() // 2),
                 "preset": 'medium',
                 "logger": 'bar',
             }
@@ -740,8 +1127,8 @@ class VideoCreator:
             print(f"\nVideo creation successful: '{output_video_file}'")
 
             if self.combined_subs_list_for_frames:
-                 if self.saved_subtitle_ids:
-                    print(f"Subtitle frames were saved in: '{self.output_frames_dir}' (This directory will now be deleted).")
+                 if self._collect_subtitle_frame_previews(preview_futures):
+                    print(f"Subtitle frames were saved in: '{frames_dir}' (This directory will now be deleted).")
                  else:
                     print("No subtitle frames were saved (perhaps no text content in subs?).")
 
@@ -761,8 +1148,10 @@ class VideoCreator:
             return None
 
         finally:
+            if preview_executor:
+                preview_executor.shutdown(wait=True)
             print("Releasing resources...")
-            for clip in [audio_clip, background_clip, intro_background_clip, title_clip, subtitles_clip, final_clip_for_render]:
+            for clip in [audio_clip, background_clip, intro_background_clip, title_clip, final_clip_for_render]:
                  if clip and hasattr(clip, 'close') and callable(getattr(clip, 'close', None)):
                     try:
                         clip.close()
@@ -775,13 +1164,17 @@ class VideoCreator:
                 except Exception as e:
                     print(f"Warning: Could not remove temporary audio file '{temp_audio_file}': {e}")
 
-            if video_created_successfully and os.path.exists(self.output_frames_dir):
+            if video_created_successfully and frames_dir and os.path.exists(frames_dir):
                 try:
-                    shutil.rmtree(self.output_frames_dir)
-                    print(f"Successfully deleted subtitle frames directory: '{self.output_frames_dir}'")
+                    shutil.rmtree(frames_dir)
+                    print(f"Successfully deleted subtitle frames directory: '{frames_dir}'")
                 except Exception as e:
-                    print(f"Warning: Could not delete subtitle frames directory '{self.output_frames_dir}': {e}")
-            elif not video_created_successfully and os.path.exists(self.output_frames_dir):
-                 print(f"Video creation failed. Subtitle frames directory '{self.output_frames_dir}' was not deleted.")
+                    print(f"Warning: Could not delete subtitle frames directory '{frames_dir}': {e}")
+                try:
+                    os.rmdir(self.output_frames_dir) # Only succeeds once no other render is using it
+                except OSError:
+                    pass
+            elif not video_created_successfully and frames_dir and os.path.exists(frames_dir):
+                 print(f"Video creation failed. Subtitle frames directory '{frames_dir}' was not deleted.")
 
             print("--- Video Creation Process Finished ---")
@@ -0,0 +1,115 @@
+import os
+import logging
+import threading
+
+from PIL import Image, ImageDraw
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(BASE_DIR, '..', 'assets')
+
+# יש להעלות את הגרסה בכל שינוי באופן העיבוד, כך שגרסאות ישנות לא ייטענו
+ASSET_CACHE_VERSION = 1
+ASSET_CACHE_DIR = os.path.join(BASE_DIR, '..', 'output', 'cache', 'assets', f'v{ASSET_CACHE_VERSION}')
+
+RESAMPLING = Image.LANCZOS
+
+# פרופילי היעד: רוחב x גובה של הסרטון
+PROFILES = {
+    'landscape': (1920, 1080),  # רמות וסיפורים
+    'shorts': (1080, 1920),     # סרטונים קצרים
+    'songs': (1280, 720),       # שירים עם כתוביות
+}
+
+# מאגר תמונות ברמת התהליך, לפי שם הקובץ השמור
+_images = {}
+_lock = threading.Lock()
+
+
+def variant_path(source_path, size, mode, fit):
+    """
+    נתיב הגרסה המוקטנת בתיקיית המטמון, לפי הנתיב היחסי לתיקיית assets.
+    למשל flags/עברית.png בגודל 150x100 -> flags/עברית.150x100.RGBA.stretch.png
+    """
+    relative = os.path.relpath(os.path.abspath(source_path), os.path.abspath(ASSETS_DIR))
+    stem = os.path.splitext(relative)[0]
+    width, height = size
+    return os.path.join(ASSET_CACHE_DIR, f"{stem}.{width}x{height}.{mode}.{fit}.png")
+
+
+def _scale(img, size, fit):
+    if fit == 'cover':
+        # התאמה לגובה, חיתוך מרכזי לרוחב ואז התאמה מדויקת (כמו resize/crop של MoviePy)
+        width, height = size
+        scaled_width = int(img.width * height / img.height)
+        img = img.resize((scaled_width, height), RESAMPLING)
+        if scaled_width > width:
+            left = (scaled_width - width) // 2
+            img = img.crop((left, 0, left + width, height))
+    return img.resize(size, RESAMPLING)
+
+
+def _load_variant(cache_path, source_path, mode, build):
+    """
+    טוען גרסה מעובדת מהזיכרון או מהדיסק, ובונה אותה אם חסרה או ישנה מהמקור.
+    מחזיר עותק שניתן לצייר עליו.
+    """
+    img = _images.get(cache_path)
+    if img is None:
+        with _lock:
+            img = _images.get(cache_path)
+            if img is None:
+                if (os.path.exists(cache_path)
+                        and os.path.getmtime(cache_path) >= os.path.getmtime(source_path)):
+                    with Image.open(cache_path) as cached:
+                        img = cached.convert(mode)
+                else:
+                    img = build()
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                    img.save(temp_path, "PNG")
+                    os.replace(temp_path, cache_path)
+                    logging.info(f"נוצרה גרסה מוקטנת: {os.path.relpath(cache_path, ASSET_CACHE_DIR)}")
+                _images[cache_path] = img
+    return img.copy()
+
+
+def load_scaled(source_path, size, mode='RGB', fit='stretch'):
+    """
+    מחזיר את התמונה בגודל size ובמצב mode.
+    fit='stretch' מותח לגודל היעד (כמו img.resize), fit='cover' ממלא וחותך במרכז.
+    """
+    def build():
+        with Image.open(source_path) as img:
+            return _scale(img.convert(mode), tuple(size), fit)
+
+    return _load_variant(variant_path(source_path, size, mode, fit), source_path, mode, build)
+
+
+def load_round_logo(source_path, size, border_color, border_width):
+    """
+    מחזיר את הלוגו כעיגול עם מסגרת, מוקטן לריבוע של size פיקסלים (RGBA).
+    """
+    border_color = tuple(border_color)
+
+    def build():
+        with Image.open(source_path) as img:
+            logo_image = img.convert("RGBA")
+        logo_size = min(logo_image.size)
+        mask = Image.new('L', (logo_size, logo_size), 0)
+        draw = ImageDraw.Draw(mask)
+        draw.ellipse((0, 0, logo_size, logo_size), fill=255)
+
+        logo_image = logo_image.crop((0, 0, logo_size, logo_size))
+        logo_image.putalpha(mask)
+
+        bordered_size = (logo_size + 2 * border_width, logo_size + 2 * border_width)
+        bordered_logo = Image.new('RGBA', bordered_size, (0, 0, 0, 0))
+        bordered_logo_draw = ImageDraw.Draw(bordered_logo)
+        bordered_logo_draw.ellipse((0, 0, bordered_size[0], bordered_size[1]), fill=border_color)
+
+        bordered_logo.paste(logo_image, (border_width, border_width), logo_image)
+        return bordered_logo.resize((size, size), RESAMPLING)
+
+    color_key = '-'.join(str(channel) for channel in border_color)
+    cache_path = variant_path(source_path, (size, size), 'RGBA', f"round-{color_key}-{border_width}")
+    return _load_variant(cache_path, source_path, 'RGBA', build)
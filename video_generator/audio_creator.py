@@ -1,34 +1,148 @@
-from google.cloud import texttospeech
 import tempfile
 import os
+import json
 import logging
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # הגדרת נתיב למפתח ה-API (ודאו שהקובץ JSON נמצא במיקום המתאים)
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"C:\Users\me\OneDrive\וידאו\מפתחות גישה\youtube-channel-440320-fe17f0f0a940.json"
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TTS_DURATIONS_PATH = os.path.join(BASE_DIR, '..', 'output', 'cache', 'tts_durations.json')
+
+# קצב ההקראה ב-Google TTS: רגיל ואיטי (slow=True)
+SPEAKING_RATE = 0.95
+SLOW_SPEAKING_RATE = 0.70
+
+# מודל ברירת מחדל כשאין מדידות לקול: תווים לשנייה בקצב SPEAKING_RATE, ושקט בתחילת הקובץ ובסופו
+DEFAULT_CHARS_PER_SECOND = 14.0
+TTS_SILENCE_SECONDS = 0.3
+
+
+def speaking_rate(slow):
+    return SLOW_SPEAKING_RATE if slow else SPEAKING_RATE
+
+
+class TtsDurations:
+    """
+    אורכי קבצי ה-TTS שנוצרו בפועל, לפי קול, קצב וטקסט, לצורך הערכת אורך סרטונים לפני רינדור.
+    טקסט שכבר הוקרא מקבל את האורך שנמדד; טקסט חדש מוערך לפי תווים לשנייה שנמדדו לאותו קול וקצב.
+    """
+    def __init__(self, path=TTS_DURATIONS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.entries = {}
+        self.rates = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"לא ניתן לקרוא את קובץ אורכי ה-TTS {path}: {e}")
+
+    @staticmethod
+    def key(voice_name, rate, text):
+        return f"{voice_name}|{rate}|{text}"
+
+    def record(self, voice_name, rate, text, seconds):
+        with self.lock:
+            self.entries[self.key(voice_name, rate, text)] = round(seconds, 3)
+            self.rates.pop((voice_name, rate), None)
+            self.dirty = True
+
+    def chars_per_second(self, voice_name, rate):
+        if (voice_name, rate) not in self.rates:
+            prefix = f"{voice_name}|{rate}|"
+            chars = seconds = 0
+            for key, duration in self.entries.items():
+                if key.startswith(prefix) and duration > TTS_SILENCE_SECONDS:
+                    chars += len(key) - len(prefix)
+                    seconds += duration - TTS_SILENCE_SECONDS
+            if chars and seconds:
+                self.rates[(voice_name, rate)] = chars / seconds
+            else:
+                self.rates[(voice_name, rate)] = DEFAULT_CHARS_PER_SECOND * rate / SPEAKING_RATE
+        return self.rates[(voice_name, rate)]
+
+    def duration(self, voice_name, rate, text):
+        """
+        מחזיר (אורך בשניות, האם נמדד בפועל).
+        """
+        measured = self.entries.get(self.key(voice_name, rate, text))
+        if measured is not None:
+            return measured, True
+        return TTS_SILENCE_SECONDS + len(text) / self.chars_per_second(voice_name, rate), False
+
+    def save(self):
+        if not self.dirty:
+            return
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=0, sort_keys=True)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+
+
+def audio_file_duration(path):
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    return ffmpeg_parse_infos(path)['duration']
+
+
 class AudioCreator:
+    """
+    יצירת אודיו ב-Google Cloud Text-to-Speech במאגר תהליכונים, משותף לכל סקריפטי הבנייה.
+    הקול נבחר ב-voice_for לפי הגדרות השפה; פורמטים אחרים דורסים את voice_for ו-clean_text.
+    ספריית ה-TTS נטענת רק בבקשה הראשונה, כך שאפשר ליצור מופע גם להערכה בלבד (voice_for, clean_text).
+    אורך כל קובץ שנוצר נרשם ב-TtsDurations, וכל בקשה שנשלחה נרשמת ב-sent_tasks.
+    """
     def __init__(self, temp_dir, lang_settings, threads):
+        self.texttospeech = None
+        self.client = None
         self.temp_dir = temp_dir
         self.lang_settings = lang_settings
         self.executor = ThreadPoolExecutor(max_workers=threads)
-        self.client = texttospeech.TextToSpeechClient()
+        self.durations = TtsDurations()
+        self.sent_tasks = []  # כל משימות ה-TTS שנשלחו, לבדיקה מול ההערכה (check_tts_usage)
+
+    def connect(self):
+        if self.client is None:
+            from google.cloud import texttospeech
+
+            self.texttospeech = texttospeech
+            self.client = texttospeech.TextToSpeechClient()
+
+    def clean_text(self, text):
+        return text
+
+    def voice_for(self, lang):
+        """
+        מחזיר (language_code, voice_name) עבור קוד השפה.
+        """
+        voice_config = self.lang_settings.get(lang, self.lang_settings['en']).get('voice', None)
+        if voice_config is None:
+            logging.error(f"לא נמצאו הגדרות קול עבור שפה: {lang}")
+            raise ValueError(f"לא נמצאו הגדרות קול עבור שפה: {lang}")
+        return voice_config['language_code'], voice_config['name']
 
     def create_audio_task(self, text, lang, slow=False):
+        texttospeech = self.texttospeech
         try:
-            voice_config = self.lang_settings.get(lang, self.lang_settings['en']).get('voice', None)
-            if voice_config is None:
-                logging.error(f"לא נמצאו הגדרות קול עבור שפה: {lang}")
-                raise ValueError(f"לא נמצאו הגדרות קול עבור שפה: {lang}")
+            language_code, voice_name = self.voice_for(lang)
 
-            synthesis_input = texttospeech.SynthesisInput(text=text)
+            clean_text = self.clean_text(text)
+            synthesis_input = texttospeech.SynthesisInput(text=clean_text)
             voice_params = texttospeech.VoiceSelectionParams(
-                language_code=voice_config['language_code'],
-                name=voice_config['name']
+                language_code=language_code,
+                name=voice_name
             )
             audio_config = texttospeech.AudioConfig(
                 audio_encoding=texttospeech.AudioEncoding.MP3,
-                speaking_rate=0.70 if slow else 0.95
+                speaking_rate=speaking_rate(slow)
             )
 
             response = self.client.synthesize_speech(
@@ -39,15 +153,22 @@ class AudioCreator:
 
             with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3', dir=self.temp_dir.name) as tmp_file:
                 tmp_file.write(response.audio_content)
-                return tmp_file.name
+
+            try:
+                self.durations.record(voice_name, speaking_rate(slow), clean_text, audio_file_duration(tmp_file.name))
+            except Exception as e:
+                logging.warning(f"לא ניתן למדוד את אורך האודיו עבור: '{text}'. פרטים: {e}")
+            return tmp_file.name
 
         except ValueError as e:
             logging.error(f"שגיאה ביצירת אודיו עבור הטקסט: '{text}' בשפה: '{lang}'. פרטים: {e}")
             raise
 
     def create_audios(self, tasks):
+        self.connect()
         futures = {}
         for task in tasks:
+            self.sent_tasks.append(tuple(task))
             if len(task) == 3:
                 text, lang, slow = task
                 future = self.executor.submit(self.create_audio_task, text, lang, slow)
@@ -70,4 +191,5 @@ class AudioCreator:
         return results
 
     def shutdown(self):
-        self.executor.shutdown(wait=True)
\ No newline at end of file
+        self.executor.shutdown(wait=True)
+        self.durations.save()
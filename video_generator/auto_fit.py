@@ -0,0 +1,69 @@
+import logging
+
+# אחוז הגודל שנבחר לכל שקופית, לפי (טקסט, סגנונות, תיבה)
+_fitted_percents = {}
+
+
+def scale_styles(style_definitions, percent):
+    """
+    מחזיר את סט הסגנונות כשכל סגנון מוקטן/מוגדל ל-percent אחוזים (בגבולות המינימום והמקסימום שלו).
+    """
+    if percent == 100:
+        return style_definitions
+    return {name: style.scaled(percent) for name, style in style_definitions.items()}
+
+
+def percent_bounds(style_definitions, style_names):
+    """
+    טווח האחוזים שבו לפחות אחד מהסגנונות בשקופית עדיין יכול לשנות את גודלו.
+    """
+    styles = [style_definitions[name] for name in style_names if name in style_definitions]
+    if not styles:
+        return 100, 100
+    low = min(100 * style.min_font_size // style.font_size for style in styles)
+    high = max(100 * style.max_font_size // style.font_size for style in styles)
+    return min(low, 100), max(high, 100)
+
+
+def fits_box(line_widths, total_height, box):
+    max_width, max_height = box
+    return total_height <= max_height and all(width <= max_width for width in line_widths)
+
+
+def auto_fit(cache_key, style_definitions, style_names, layout, fits):
+    """
+    חיפוש בינארי של הגודל הגדול ביותר (באחוזים) שבו הטקסט המגולש נכנס לתיבה.
+    layout(styles) מחזיר תוצאת פריסה, ו-fits(result) קובע אם היא נכנסת.
+    מחזיר (סט הסגנונות שנבחר, תוצאת הפריסה). האחוז שנבחר נשמר לפי cache_key.
+    """
+    percent = _fitted_percents.get(cache_key)
+    if percent is not None:
+        styles = scale_styles(style_definitions, percent)
+        return styles, layout(styles)
+
+    low, high = percent_bounds(style_definitions, style_names)
+    styles = scale_styles(style_definitions, high)
+    result = layout(styles)
+    best = (high, styles, result)
+
+    if not fits(result) and low < high:
+        best = None
+        while low <= high - 1:
+            mid = (low + high - 1) // 2
+            styles = scale_styles(style_definitions, mid)
+            result = layout(styles)
+            if fits(result):
+                best = (mid, styles, result)
+                low = mid + 1
+            else:
+                high = mid
+        if best is None:
+            percent = percent_bounds(style_definitions, style_names)[0]
+            styles = scale_styles(style_definitions, percent)
+            best = (percent, styles, layout(styles))
+            logging.warning(f"הטקסט אינו נכנס לתיבה גם בגודל המינימלי ({percent}%): {cache_key[0]}")
+        else:
+            logging.info(f"התאמת גודל גופן אוטומטית: {best[0]}% עבור {cache_key[0]}")
+
+    _fitted_percents[cache_key] = best[0]
+    return best[1], best[2]
@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import time
+import logging
+
+from asset_cache import ASSETS_DIR, ASSET_CACHE_DIR, PROFILES, load_scaled, load_round_logo
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+BACKGROUNDS_DIR = os.path.join(ASSETS_DIR, 'backgrounds')
+FLAGS_DIR = os.path.join(ASSETS_DIR, 'flags')
+LOGOS_DIR = os.path.join(ASSETS_DIR, 'logos')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# מידות קבועות כפי שהן מוגדרות בסקריפטי הבנייה
+FLAG_SIZE = (150, 100)          # דגלים במסך הפתיחה של הרמות
+CORNER_LOGO_SIZE = (150, 150)   # הלוגו בפינת סרטוני הרמות
+STORY_LOGO_RATIO = 0.3          # לוגו הסיום בסיפורים - 30% מגובה המסך
+SHORTS_LOGO_RATIO = 0.7         # לוגו הסיום בסרטונים הקצרים - 70% מרוחב המסך
+
+
+def list_images(directory, recursive=False):
+    if not os.path.isdir(directory):
+        return []
+    if not recursive:
+        return sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    return sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(directory)
+        for name in files if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def logo_border(styles_file):
+    with open(os.path.join(ASSETS_DIR, styles_file), 'r', encoding='utf-8') as f:
+        logo_style = json.load(f).get('logo', {})
+    return logo_style.get('border_color') or (255, 255, 255), logo_style.get('border_width') or 10
+
+
+def profile_variants(profile):
+    """
+    מחזיר את רשימת הגרסאות שסקריפטי הבנייה טוענים עבור הפרופיל, כ-(פונקציה, ארגומנטים).
+    """
+    width, height = PROFILES[profile]
+    variants = []
+    logo_colored = os.path.join(LOGOS_DIR, 'logo_colored.png')
+
+    if profile == 'landscape':
+        # רקעי הרמות (RGBA) ורקעי הסיפורים (RGB)
+        variants += [(load_scaled, (path, (width, height), 'RGBA'))
+                     for path in list_images(os.path.join(BACKGROUNDS_DIR, 'levels'), recursive=True)]
+        variants += [(load_scaled, (path, (width, height), 'RGB')) for path in list_images(BACKGROUNDS_DIR)]
+        variants += [(load_scaled, (path, FLAG_SIZE, 'RGBA')) for path in list_images(FLAGS_DIR)]
+        variants.append((load_scaled, (os.path.join(LOGOS_DIR, 'logo.png'), CORNER_LOGO_SIZE, 'RGBA')))
+        variants.append((load_round_logo, (logo_colored, int(height * STORY_LOGO_RATIO),
+                                           *logo_border('styles_stories.json'))))
+    elif profile == 'shorts':
+        variants += [(load_scaled, (path, (width, height), 'RGB')) for path in list_images(BACKGROUNDS_DIR)]
+        variants.append((load_round_logo, (logo_colored, int(width * SHORTS_LOGO_RATIO),
+                                           *logo_border('styles_shorts.json'))))
+    elif profile == 'songs':
+        variants += [(load_scaled, (path, (width, height), 'RGB', 'cover'))
+                     for path in list_images(os.path.join(BACKGROUNDS_DIR, 'songs'))]
+    return variants
+
+
+def main(profiles):
+    unknown = [profile for profile in profiles if profile not in PROFILES]
+    if unknown:
+        logging.error(f"פרופיל לא מוכר: {', '.join(unknown)}. פרופילים זמינים: {', '.join(PROFILES)}")
+        sys.exit(1)
+
+    for profile in profiles or list(PROFILES):
+        start_time = time.perf_counter()
+        variants = profile_variants(profile)
+        for load, args in variants:
+            load(*args)
+        logging.info(
+            f"פרופיל {profile} {PROFILES[profile][0]}x{PROFILES[profile][1]}: "
+            f"{len(variants)} גרסאות מוכנות תוך {time.perf_counter() - start_time:.2f} שניות"
+        )
+    logging.info(f"תיקיית הנכסים המוקטנים: {os.path.abspath(ASSET_CACHE_DIR)}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
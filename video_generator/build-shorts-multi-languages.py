@@ -1,24 +1,26 @@
 import json
 import sys
 import os
-import random
-import re
+import time
+from functools import lru_cache
 import numpy as np
 # הסרנו את gTTS
 # from gtts import gTTS
-from moviepy.editor import *
-from moviepy.audio.fx.audio_loop import audio_loop
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
-import arabic_reshaper
-from bidi.algorithm import get_display
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import tempfile
 import logging
-from functools import lru_cache
 from datetime import datetime
-
-# ייבוא ספריית Google Cloud Text-to-Speech
-from google.cloud import texttospeech
+import font_registry
+import audio_creator
+from render_core import (
+    FileManager, BaseImageCreator, BaseVideoCreator,
+    sanitize_filename, is_hebrew, process_hebrew_text, remove_asterisks
+)
+from style_compiler import compile_styles
+from gradients import linear_gradient
+from layout_check import split_layout_check_flag, run_layout_check
+from asset_cache import load_scaled, load_round_logo
+from timeline import Segment, Timeline, ClipRenderer
+from estimator import RenderStats, split_estimate_flag, estimate_timelines, check_tts_usage
 
 # הגדרת נתיב למפתח ה-API (ודאו שהקובץ JSON נמצא במיקום מתאים)
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"C:\Users\me\OneDrive\וידאו\מפתחות גישה\youtube-channel-440320-fe17f0f0a940.json"
@@ -61,10 +63,15 @@ OUTPUT_DIR = os.path.join(BASE_DIR, '..', 'output', 'shorts')  # תיקיית "s
 THUMBNAILS_DIR = os.path.join(OUTPUT_DIR, 'thumbnails')
 LANG_SETTINGS_FILE = os.path.join(DATA_DIR, 'lang_settings.json')
 
-# נתיבים לקבצים
-json_name = str(sys.argv[1])
-lang_code = str(sys.argv[2]) # קוד שפה
-JSON_FILE = os.path.join(DATA_DIR, lang_code, f'shorts_{json_name}.json') # תיקיית שפה בתוך data/shorts
+# כתובית פתיח בשפה הרצויה
+INTRO_SUBTITLE_TEXT = "למד מילים חדשות בשישים שניות"
+
+# נתיבים לקבצים (JSON_FILE וקוד השפה נקבעים ב-parse_args)
+LAYOUT_CHECK = False  # --layout-check: מדידת פריסה בלבד
+ESTIMATE = False  # --estimate: הערכת אורך, תווי TTS וזמן רינדור בלבד
+json_name = None
+lang_code = None # קוד שפה
+JSON_FILE = None # תיקיית שפה בתוך data/shorts
 STYLES_JSON_FILE = os.path.join(ASSETS_DIR, 'styles_shorts.json')
 LOGO_PATH = os.path.join(LOGOS_DIR, 'logo_colored.png')
 
@@ -79,104 +86,107 @@ BACKGROUND_MUSIC_PATH = os.path.join(ASSETS_DIR, 'background_music.mp3')
 # הגדרות MoviePy
 VIDEO_SIZE = (1080, 1920)
 WIDTH, HEIGHT = VIDEO_SIZE
+MAX_TEXT_WIDTH = WIDTH - 100
+MAX_TEXT_HEIGHT = HEIGHT - 100
 FPS = 24
 THREADS = 8
 
-def sanitize_filename(filename):
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
-
-def is_hebrew(text):
-    for char in text:
-        if '\u0590' <= char <= '\u05FF':
-            return True
-    return False
-
-def process_hebrew_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    bidi_text = get_display(reshaped_text)
-    return bidi_text
-
 def remove_nikud(text):
     nikud_chars = set(chr(i) for i in range(0x0591, 0x05C7 + 1))
     return ''.join(c for c in text if c not in nikud_chars)
 
 
-class FileManager:
-    def __init__(self, output_dir, thumbnails_dir, lang_code):
-        self.output_dir = os.path.join(output_dir, lang_code) # תיקיית פלט לפי שפה
-        self.thumbnails_dir = os.path.join(thumbnails_dir, lang_code) # תיקיית תמונות ממוזערות לפי שפה
-        os.makedirs(self.output_dir, exist_ok=True)
-        os.makedirs(self.thumbnails_dir, exist_ok=True)
-        self.temp_dir = tempfile.TemporaryDirectory()
+@lru_cache(maxsize=None)
+def _gradient_background(size, start_color, end_color, direction):
+    width, height = size
+    base = Image.new('RGB', (width, height), start_color)
+    top = Image.new('RGB', (width, height), end_color)
+
+    # המסכה ממולאת רק בעמודה (או בשורה) הראשונה, כמו בלולאת ה-putpixel המקורית,
+    # כך שהמראה נשמר: צבע start_color אחיד עם קו מעבר אחד בקצה.
+    mask = np.zeros((height, width), dtype=np.uint8)
+    if direction == 'vertical':
+        mask[:, 0] = (255 * np.arange(height) / height).astype(np.uint8)
+    elif direction == 'horizontal':
+        mask[0, :] = (255 * np.arange(width) / width).astype(np.uint8)
+
+    base.paste(top, (0, 0), Image.fromarray(mask, 'L'))
+    return base
 
-    def get_temp_path(self, filename):
-        sanitized_filename = sanitize_filename(filename)
-        return os.path.join(self.temp_dir.name, sanitized_filename)
 
-    def cleanup(self):
-        self.temp_dir.cleanup()
+class ImageCreator(BaseImageCreator):
+    max_text_width = MAX_TEXT_WIDTH
+    max_text_height = MAX_TEXT_HEIGHT
+    fit_styles = frozenset({'normal', 'sentence_bold', 'word'})
 
-class ImageCreator:
     def __init__(self, styles):
-        self.styles = styles
-        self.cache = {}
+        super().__init__(styles)
         self.styles_require_bright_blur = {'word', 'sentence', 'sentence_bold', 'translation'}
         self.overlay_color = (173, 216, 230, 150)
 
-    @lru_cache(maxsize=None)
     def get_font(self, font_path, font_size):
-        try:
-            font_full_path = os.path.join(FONTS_DIR, font_path)
-            return ImageFont.truetype(font_full_path, font_size)
-        except IOError:
-            logging.error(f"לא ניתן למצוא את הגופן בנתיב: {font_path}")
-            raise
+        return font_registry.get_font(font_path, font_size)
 
     def create_gradient_background(self, width, height, start_color, end_color, direction='vertical'):
-        base = Image.new('RGB', (width, height), start_color)
-        top = Image.new('RGB', (width, height), end_color)
-        mask = Image.new('L', (width, height))
-
-        if direction == 'vertical':
-            for y in range(height):
-                mask.putpixel((0, y), int(255 * (y / height)))
-        elif direction == 'horizontal':
-            for x in range(width):
-                mask.putpixel((x, 0), int(255 * (x / width)))
-
-        base.paste(top, (0, 0), mask)
-        return base
-
-    def split_text_into_lines(self, text, font, max_width, draw):
-        words = text.split()
-        lines = []
-        current_line = ""
-
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            width = bbox[2] - bbox[0]
-            if width <= max_width:
-                current_line = test_line
+        """
+        רקע מעבר הצבע של השקופית, שמור במטמון לפי (גודל, צבעים, כיוון); מוחזר עותק שניתן לצייר עליו.
+        """
+        return _gradient_background((width, height), tuple(start_color), tuple(end_color), direction).copy()
+
+    def layout_lines(self, text_lines, style_definitions, line_styles, draw):
+        """
+        שלב המדידה והגלישה של create_image: מחזיר את השורות המעובדות (לפי קטעים) והגובה הכולל.
+        """
+        total_height = 0
+        processed_lines = []
+        for i, line in enumerate(text_lines):
+            style_name = line_styles[i] if line_styles and i < len(line_styles) else 'normal'
+            try:
+                current_style = style_definitions[style_name]
+            except KeyError:
+                logging.error(f"סגנון '{style_name}' לא נמצא בקובץ העיצובים.")
+                raise
+
+            # סגנון הקטעים המודגשים (**...**) בשורה
+            if style_name == 'sentence':
+                bold_style_name = 'sentence_bold'
+            elif is_hebrew(line) and style_name in ('call_to_action', 'intro_subtitle'):
+                bold_style_name = style_name
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
+                bold_style_name = 'word'
+            try:
+                bold_style = style_definitions[bold_style_name]
+            except KeyError:
+                logging.error(f"סגנון חסר ('{bold_style_name}').")
+                raise
 
-        if current_line:
-            lines.append(current_line)
+            font = current_style.font
+            line_without_nikud = remove_nikud(line) if is_hebrew(line) else line
 
-        return lines
+            split_lines = self.split_text_into_lines(line_without_nikud, font, MAX_TEXT_WIDTH, draw)
+            for split_line in split_lines:
+                processed_line = process_hebrew_text(split_line) if is_hebrew(line) else split_line
+                segments = self.parse_bold(processed_line)
+
+                line_info = []
+                line_height = 0
+                for segment_text, is_bold in segments:
+                    segment_style = bold_style if is_bold else current_style
+                    bbox = draw.textbbox((0, 0), segment_text, font=segment_style.font)
+                    width = bbox[2] - bbox[0]
+                    height = bbox[3] - bbox[1]
+                    line_info.append((segment_text, width, height, segment_style))
+                    if height > line_height:
+                        line_height = height
+
+                processed_lines.append((line_info, line_height, current_style))
+                spacing = current_style.line_spacing
+                total_height += line_height + spacing
 
-    def parse_bold(self, text):
-        parts = re.split(r'(\*\*[^*]+\*\*)', text)
-        segments = []
-        for part in parts:
-            if part.startswith('**') and part.endswith('**'):
-                segments.append((part[2:-2], True))
-            else:
-                segments.append((part, False))
-        return segments
+        if processed_lines:
+            total_height -= spacing
+
+        return processed_lines, total_height
 
     def create_image(self, text_lines, style_definitions, line_styles=None, background_image_path=None):
         # הסר ניקוד מהטקסט לתצוגה
@@ -189,8 +199,7 @@ class ImageCreator:
 
         if background_image_path and os.path.exists(background_image_path):
             try:
-                img = Image.open(background_image_path).convert("RGB")
-                img = img.resize((WIDTH, HEIGHT), RESAMPLING)
+                img = load_scaled(background_image_path, (WIDTH, HEIGHT))
                 logging.info(f"שימש רקע מהתמונה: {background_image_path}")
             except Exception as e:
                 logging.error(f"שגיאה בטעינת תמונת הרקע: {e}")
@@ -205,17 +214,17 @@ class ImageCreator:
                     logging.error(f"סגנון '{line_styles[0]}' לא נמצא בקובץ העיצובים.")
                     raise
 
-                if first_style.get('background_image'):
-                    img = Image.new('RGB', (WIDTH, HEIGHT), color=tuple(first_style['bg_color']))
-                elif first_style.get('gradient'):
+                if first_style.background_image:
+                    img = Image.new('RGB', (WIDTH, HEIGHT), color=first_style.bg_color)
+                elif first_style.gradient:
                     img = self.create_gradient_background(
                         WIDTH, HEIGHT,
-                        first_style['gradient'][0],
-                        first_style['gradient'][1],
-                        first_style['gradient_direction']
+                        first_style.gradient[0],
+                        first_style.gradient[1],
+                        first_style.gradient_direction
                     )
                 else:
-                    img = Image.new('RGB', (WIDTH, HEIGHT), color=tuple(first_style['bg_color']))
+                    img = Image.new('RGB', (WIDTH, HEIGHT), color=first_style.bg_color)
             else:
                 try:
                     first_style = style_definitions['normal']
@@ -223,7 +232,7 @@ class ImageCreator:
                     logging.error("סגנון 'normal' לא נמצא בקובץ העיצובים.")
                     raise
 
-                img = Image.new('RGB', (WIDTH, HEIGHT), color=tuple(first_style['bg_color']))
+                img = Image.new('RGB', (WIDTH, HEIGHT), color=first_style.bg_color)
 
         if line_styles:
             for style_name in line_styles:
@@ -242,123 +251,16 @@ class ImageCreator:
                     break
 
         draw = ImageDraw.Draw(img)
-
-        MAX_TEXT_WIDTH = WIDTH - 100
-
-        total_height = 0
-        processed_lines = []
-        for i, line in enumerate(display_text_lines):
-            if line_styles and i < len(line_styles):
-                style_name = line_styles[i]
-                try:
-                    current_style = style_definitions[style_name]
-                except KeyError:
-                    logging.error(f"סגנון '{style_name}' לא נמצא בקובץ העיצובים.")
-                    raise
-            else:
-                try:
-                    current_style = style_definitions['normal']
-                except KeyError:
-                    logging.error("סגנון 'normal' לא נמצא בקובץ העיצובים.")
-                    raise
-
-            font = self.get_font(current_style['font_path'], current_style['font_size'])
-            line_without_nikud = remove_nikud(line) if is_hebrew(line) else line
-
-            if is_hebrew(line):
-                split_lines = self.split_text_into_lines(line_without_nikud, font, MAX_TEXT_WIDTH, draw)
-                for split_line in split_lines:
-                    processed_line = process_hebrew_text(split_line)
-                    segments = self.parse_bold(processed_line)
-                    processed_style = current_style.copy()
-                    processed_style['style_name'] = style_name if line_styles and i < len(line_styles) else 'normal'
-
-                    line_info = []
-                    line_height = 0
-                    for segment_text, is_bold in segments:
-                        if is_bold:
-                            try:
-                                if processed_style['style_name'] == 'sentence':
-                                    segment_style = style_definitions['sentence_bold']
-                                elif processed_style['style_name'] == 'call_to_action':
-                                    segment_style = style_definitions['call_to_action']
-                                elif processed_style['style_name'] == 'intro_subtitle':
-                                    segment_style = style_definitions['intro_subtitle']
-                                else:
-                                    segment_style = style_definitions['word']
-                            except KeyError:
-                                logging.error("סגנון חסר ('sentence_bold', 'word', 'call_to_action' או 'intro_subtitle').")
-                                raise
-                            segment_font = self.get_font(segment_style['font_path'], segment_style['font_size'])
-                            segment_color = tuple(segment_style['text_color'])
-                        else:
-                            segment_style = current_style
-                            segment_font = font
-                            segment_color = tuple(segment_style['text_color'])
-
-                        bbox = draw.textbbox((0, 0), segment_text, font=segment_font)
-                        width = bbox[2] - bbox[0]
-                        height = bbox[3] - bbox[1]
-                        line_info.append((segment_text, width, height, segment_font, segment_color, segment_style))
-                        if height > line_height:
-                            line_height = height
-
-                    processed_lines.append((line_info, line_height, processed_style))
-                    if processed_style['style_name'] in ['sentence', 'translation', 'intro_subtitle']:
-                        spacing = LINE_SPACING_NORMAL
-                    else:
-                        spacing = LINE_SPACING_NORMAL
-                    total_height += line_height + spacing
-            else:
-                split_lines = self.split_text_into_lines(line_without_nikud, font, MAX_TEXT_WIDTH, draw)
-                for split_line in split_lines:
-                    processed_line = split_line
-                    processed_style = current_style.copy()
-                    processed_style['style_name'] = style_name if line_styles and i < len(line_styles) else 'normal'
-                    segments = self.parse_bold(processed_line)
-
-                    line_info = []
-                    line_height = 0
-                    for segment_text, is_bold in segments:
-                        if is_bold:
-                            try:
-                                if processed_style['style_name'] == 'sentence':
-                                    segment_style = style_definitions['sentence_bold']
-                                else:
-                                    segment_style = style_definitions['word']
-                            except KeyError:
-                                logging.error("סגנון חסר ('sentence_bold' או 'word').")
-                                raise
-                            segment_font = self.get_font(segment_style['font_path'], segment_style['font_size'])
-                            segment_color = tuple(segment_style['text_color'])
-                        else:
-                            segment_style = current_style
-                            segment_font = font
-                            segment_color = tuple(segment_style['text_color'])
-
-                        bbox = draw.textbbox((0, 0), segment_text, font=segment_font)
-                        width = bbox[2] - bbox[0]
-                        height = bbox[3] - bbox[1]
-                        line_info.append((segment_text, width, height, segment_font, segment_color, segment_style))
-                        if height > line_height:
-                            line_height = height
-                    processed_lines.append((line_info, line_height, processed_style))
-                    if processed_style['style_name'] in ['sentence', 'translation']:
-                        spacing = LINE_SPACING_NORMAL
-                    else:
-                        spacing = LINE_SPACING_NORMAL
-                    total_height += line_height + spacing
-
-        if processed_lines:
-            total_height -= spacing
+        processed_lines, total_height = self.fit_layout(display_text_lines, style_definitions, line_styles, draw)
 
         current_y = (HEIGHT - total_height) / 2
 
-        for line_info, line_height, processed_style in processed_lines:
+        for line_info, line_height, line_style in processed_lines:
             line_width = sum([segment[1] for segment in line_info])
             x_text = (WIDTH - line_width) / 2
-            for segment_text, width, height, segment_font, segment_color, segment_style in line_info:
-                if processed_style['style_name'] in ['topic', 'video_number', 'call_to_action']:
+            for segment_text, width, height, segment_style in line_info:
+                segment_font = segment_style.font
+                if line_style.name in ['topic', 'video_number', 'call_to_action']:
                     glow_color = (255, 255, 255)
                     offsets = [
                         (-3, -3), (-3, 0), (-3, 3),
@@ -373,191 +275,90 @@ class ImageCreator:
                             segment_text, font=segment_font, fill=glow_color
                         )
 
-                if 'outline_color' in segment_style and 'outline_width' in segment_style:
-                    outline_color = tuple(segment_style['outline_color'])
-                    outline_width = segment_style['outline_width']
+                if segment_style.has_outline:
+                    outline_color = segment_style.outline_color
+                    outline_width = segment_style.outline_width
                     for dx in range(-outline_width, outline_width + 1):
                         for dy in range(-outline_width, outline_width + 1):
                             if dx != 0 or dy != 0:
                                 draw.text((x_text + dx, current_y + dy + (line_height - height) / 2),
                                           segment_text, font=segment_font, fill=outline_color)
 
-                draw.text((x_text, current_y + (line_height - height) / 2), segment_text, font=segment_font, fill=segment_color)
+                draw.text((x_text, current_y + (line_height - height) / 2), segment_text, font=segment_font, fill=segment_style.text_color)
                 x_text += width
 
-            current_y += line_height + spacing
+            current_y += line_height + line_style.line_spacing
 
         img = img.convert("RGB")
         self.cache[cache_key] = img
         return img
 
-def remove_asterisks(text):
-    return text.replace("**", "")
-
-class AudioCreator:
+def overlay_language_strip(frame, strip_overlay):
+    """
+    ממזג את רצועת השפות (צבע ושקיפות מוכנים מראש) לתחתית הפריים.
+    """
+    strip_rgb, strip_alpha = strip_overlay
+    strip_height = strip_rgb.shape[0]
+    frame = np.array(frame)
+    bottom = frame[-strip_height:].astype(np.float32)
+    frame[-strip_height:] = (bottom * (1 - strip_alpha) + strip_rgb * strip_alpha).astype(frame.dtype)
+    return frame
+
+class AudioCreator(audio_creator.AudioCreator):
+    """
+    קולות לפי lang_settings של הסרטונים הקצרים, עם ספרדית כברירת מחדל.
+    """
     def __init__(self, temp_dir, lang_settings):
-        self.temp_dir = temp_dir
-        self.lang_settings = lang_settings
-        self.executor = ThreadPoolExecutor(max_workers=THREADS)
-        self.client = texttospeech.TextToSpeechClient()
+        super().__init__(temp_dir, lang_settings, THREADS)
 
-    def create_audio_task(self, text, lang, slow=False):
-        try:
-            clean_text = remove_asterisks(text)
-            voice_settings = self.lang_settings.get(lang, self.lang_settings['es']).get('voice') # ברירת מחדל לספרדית אם שפה לא נמצאה
+    def clean_text(self, text):
+        return remove_asterisks(text)
 
-            if not voice_settings:
-                logging.error(f"הגדרות קול לא נמצאו עבור שפה: {lang}. שימוש בהגדרות ברירת מחדל.")
-                voice_settings = self.lang_settings['es']['voice'] # גיבוי להגדרות ספרדית
+    def voice_for(self, lang):
+        voice_settings = self.lang_settings.get(lang, self.lang_settings['es']).get('voice') # ברירת מחדל לספרדית אם שפה לא נמצאה
 
-            language_code = voice_settings['language_code']
-            voice_name = voice_settings['name']
+        if not voice_settings:
+            logging.error(f"הגדרות קול לא נמצאו עבור שפה: {lang}. שימוש בהגדרות ברירת מחדל.")
+            voice_settings = self.lang_settings['es']['voice'] # גיבוי להגדרות ספרדית
 
-            synthesis_input = texttospeech.SynthesisInput(text=clean_text)
-            voice_params = texttospeech.VoiceSelectionParams(
-                language_code=language_code,
-                name=voice_name
-            )
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
-                speaking_rate=0.70 if slow else 0.95
-            )
+        return voice_settings['language_code'], voice_settings['name']
 
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice_params,
-                audio_config=audio_config
-            )
+class VideoCreator(BaseVideoCreator):
+    video_size = VIDEO_SIZE
+    transition_directions = ('left', 'right')
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3', dir=self.temp_dir.name) as tmp_file:
-                tmp_file.write(response.audio_content)
-                return tmp_file.name
-
-        except ValueError as e:
-            logging.error(f"שגיאה ביצירת אודיו עבור הטקסט: '{text}' בשפה: '{lang}'. פרטים: {e}")
-            raise
-
-    def create_audios(self, tasks):
-        futures = {}
-        for task in tasks:
-            if len(task) == 3:
-                text, lang, slow = task
-                future = self.executor.submit(self.create_audio_task, text, lang, slow)
-            else:
-                text, lang = task
-                future = self.executor.submit(self.create_audio_task, text, lang, False)
-            futures[future] = task
-
-        results = {}
-        for future in as_completed(futures):
-            task = futures[future]
-            try:
-                audio_path = future.result()
-                results[tuple(task)] = audio_path
-                logging.info(f"אודיו נוצר עבור: '{task[0]}' בשפה: '{task[1]}' עם slow={'True' if len(task) == 3 and task[2] else 'False'}")
-            except Exception as e:
-                logging.error(f"שגיאה ביצירת אודיו עבור: '{task[0]}' בשפה: '{task[1]}'. פרטים: {e}")
-        return results
-
-    def shutdown(self):
-        self.executor.shutdown(wait=True)
-
-class VideoCreator:
     def __init__(self, file_manager, image_creator, audio_creator, style_definitions, lang_settings):
-        self.file_manager = file_manager
-        self.image_creator = image_creator
-        self.audio_creator = audio_creator
-        self.style_definitions = style_definitions
+        super().__init__(file_manager, image_creator, audio_creator, style_definitions)
         self.lang_settings = lang_settings
+        self.language_strips = {}  # רצועות שפה מוכנות לפי (קוד שפה, רוחב, גובה)
 
     def create_image_clip(self, text_lines, style, line_styles=None, background_image_path=None):
         img = self.image_creator.create_image(text_lines, self.style_definitions, line_styles, background_image_path)
-        filename = f"{'_'.join([sanitize_filename(line) for line in text_lines])}.png"
-        temp_image_path = self.file_manager.get_temp_path(filename)
-        img.save(temp_image_path)
-        image_clip = ImageClip(temp_image_path)
-        return image_clip
-
-    def create_audio_clips(self, audio_paths):
-        audio_clips = []
-        for path in audio_paths:
-            if os.path.exists(path):
-                audio_clip = AudioFileClip(path)
-                audio_clips.append(audio_clip)
-            else:
-                logging.warning(f"אודיו לא נמצא בנתיב: {path}")
-        if audio_clips:
-            return concatenate_audioclips(audio_clips)
-        else:
-            return None
-
-    def create_clip(self, image_clip, audio_paths, min_duration=0):
-        audio_total = self.create_audio_clips(audio_paths)
-        if audio_total:
-            duration = max(audio_total.duration, min_duration)
-            image_clip = image_clip.set_duration(duration)
-            image_clip = image_clip.set_audio(audio_total)
-        else:
-            image_clip = image_clip.set_duration(min_duration)
-        return image_clip
-
-    def slide_transition(self, clip1, clip2, duration=1):
-        direction = random.choice(['left', 'right'])
-
-        if direction == 'left':
-            move_out = lambda t: (-VIDEO_SIZE[0] * t / duration, 'center')
-            move_in = lambda t: (VIDEO_SIZE[0] - VIDEO_SIZE[0] * t / duration, 'center')
-        else:
-            move_out = lambda t: (VIDEO_SIZE[0] * t / duration, 'center')
-            move_in = lambda t: (-VIDEO_SIZE[0] + VIDEO_SIZE[0] * t / duration, 'center')
-
-        clip1_moving = clip1.set_position(move_out).set_duration(duration)
-        clip2_moving = clip2.set_position(move_in).set_duration(duration)
-
-        transition = CompositeVideoClip([clip1_moving, clip2_moving], size=VIDEO_SIZE).set_duration(duration)
-        transition = transition.set_audio(None)
-        return transition
+        return self.save_image_clip(img, text_lines)
 
     def add_logo_clip(self, duration=5, background_image_path=None):
         try:
             if (background_image_path and os.path.exists(background_image_path)):
                 try:
-                    background = Image.open(background_image_path).convert("RGB")
-                    background = background.resize((WIDTH, HEIGHT), RESAMPLING)
+                    background = load_scaled(background_image_path, (WIDTH, HEIGHT))
                     logging.info(f"שימש רקע מהתמונה: {background_image_path} עבור הלוגו")
                 except Exception as e:
                     logging.error(f"שגיאה בטעינת תמונת הרקע עבור הלוגו: {e}")
                     background = Image.new('RGB', (WIDTH, HEIGHT), color=(173, 216, 230))
             else:
                 logo_style = self.style_definitions.get('logo', None)
-                if logo_style and 'bg_color' in logo_style:
-                    bg_color = tuple(logo_style['bg_color'])
+                if logo_style and logo_style.bg_color is not None:
+                    bg_color = logo_style.bg_color
                 else:
                     bg_color = (173, 216, 230)
                 background = Image.new('RGB', (WIDTH, HEIGHT), color=bg_color)
 
-            logo_image = Image.open(LOGO_PATH).convert("RGBA")
-            size = min(logo_image.size)
-            mask = Image.new('L', (size, size), 0)
-            draw = ImageDraw.Draw(mask)
-            draw.ellipse((0, 0, size, size), fill=255)
-
-            logo_image = logo_image.crop((0, 0, size, size))
-            logo_image.putalpha(mask)
-
-            logo_style = self.style_definitions.get('logo', {})
-            border_color = tuple(logo_style.get('border_color', [255, 255, 255]))
-            border_width = logo_style.get('border_width', 10)
-
-            bordered_size = (size + 2 * border_width, size + 2 * border_width)
-            bordered_logo = Image.new('RGBA', bordered_size, (0, 0, 0, 0))
-            bordered_logo_draw = ImageDraw.Draw(bordered_logo)
-
-            bordered_logo_draw.ellipse((0, 0, bordered_size[0], bordered_size[1]), fill=border_color)
-            bordered_logo.paste(logo_image, (border_width, border_width), logo_image)
+            logo_style = self.style_definitions.get('logo', None)
+            border_color = logo_style.border_color if logo_style and logo_style.border_color is not None else (255, 255, 255)
+            border_width = logo_style.border_width if logo_style and logo_style.border_width is not None else 10
 
             new_size = int(WIDTH * 0.7)
-            bordered_logo = bordered_logo.resize((new_size, new_size), RESAMPLING)
+            bordered_logo = load_round_logo(LOGO_PATH, new_size, border_color, border_width)
 
             logo_position = ((WIDTH - new_size) // 2, (HEIGHT - new_size) // 2)
             background.paste(bordered_logo, logo_position, bordered_logo)
@@ -571,67 +372,28 @@ class VideoCreator:
             logging.error(f"שגיאה ביצירת קליפ הלוגו: {e}")
             return None
 
-    def create_intro_clip(self, intro_subtitle, title, video_number, background_image_path, lang_code):
-        try:
-            text_lines_intro = [intro_subtitle, title, f"#{video_number}"]
-            line_styles_intro = ['intro_subtitle', 'topic', 'video_number']
-
-            clip_intro = self.create_image_clip(text_lines_intro, 'intro_subtitle', line_styles_intro, background_image_path)
-
-            # יצירת אודיו לכותרת ומספר הסרטון - שניהם בעברית ('iw')
-            audio_tasks = [
-                (title, 'iw'), # כותרת תוקרא בעברית
-                (f"מספר {video_number}", 'iw')
-            ]
-            audio_results = self.audio_creator.create_audios(audio_tasks)
-            clip_intro = self.create_clip(
-                clip_intro,
-                [
-                    audio_results.get((title, 'iw'), ""), # שימוש באודיו כותרת עברית
-                    audio_results.get((f"מספר {video_number}", 'iw'), "")
-                ],
-                min_duration=3
-            )
-            return clip_intro
-        except Exception as e:
-            logging.error(f"שגיאה ביצירת קליפ הפתיחה: {e}")
-            return None
-
-    def create_outro(self, call_to_action, background_image_path): # הסרנו lang_code מכיוון שההקראה תמיד בעברית
-        try:
-            text_lines_outro = [call_to_action]
-            line_styles_outro = ['call_to_action']
-
-            clip_outro = self.create_image_clip(text_lines_outro, 'outro', line_styles_outro, background_image_path)
-            return clip_outro # החזר רק את קליפ התמונה, בלי אודיו בשלב זה
-        except Exception as e:
-            logging.error(f"שגיאה ביצירת קליפ הסיום: {e}")
-            return None
-
+    def intro_slide(self, intro_subtitle, title, video_number):
+        return [intro_subtitle, title, f"#{video_number}"], ['intro_subtitle', 'topic', 'video_number']
 
     def create_language_strip(self, width, height, lang_code, text_bottom_margin=None):
+        """
+        מחזיר את רצועת השפות כשכבה מוכנה (צבע, שקיפות) ואת גובהה.
+        הרצועה נבנית פעם אחת לכל (קוד שפה, רוחב, גובה) ונשמרת בזיכרון.
+        """
+        cache_key = (lang_code, width, height, text_bottom_margin)
+        if cache_key in self.language_strips:
+            return self.language_strips[cache_key]
+
         try:
             strip_height = int(height * 0.08)
 
             strip_image = Image.new('RGBA', (width, strip_height), (0, 0, 0, 0))
             draw = ImageDraw.Draw(strip_image)
 
-            def create_gradient(image, color1, color2):
-                gradient = Image.new('RGBA', image.size, color=color1)
-                for x in range(image.width):
-                    for y in range(image.height):
-                        ratio = y / image.height
-                        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-                        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-                        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-                        a = int(color1[3] * (1 - ratio) + color2[3] * ratio)
-                        gradient.putpixel((x, y), (r, g, b, a))
-                return gradient
-
             start_color = (100, 100, 128, 100)
             end_color = (0, 0, 128, 150)
 
-            gradient_background = create_gradient(strip_image, start_color, end_color)
+            gradient_background = linear_gradient(strip_image.size, start_color, end_color)
             strip_image.paste(gradient_background, (0, 0))
 
             font_size = int(strip_height * 0.5)
@@ -672,9 +434,8 @@ class VideoCreator:
             arrow_img = None
 
             if os.path.exists(israel_flag_path):
-                israel_flag = Image.open(israel_flag_path).convert("RGB")
                 flag_width = int(flag_max_height * flag_aspect_ratio)
-                israel_flag = israel_flag.resize((flag_width, flag_max_height), RESAMPLING)
+                israel_flag = load_scaled(israel_flag_path, (flag_width, flag_max_height))
                 flag_x_israel = width - flag_width - edge_spacing
                 strip_image.paste(israel_flag, (flag_x_israel, (strip_height - flag_max_height) // 2))
                 hebrew_x = flag_x_israel - hebrew_width - text_spacing
@@ -682,9 +443,8 @@ class VideoCreator:
                 logging.warning(f"קובץ דגל ישראל לא נמצא בנתיב: {israel_flag_path}")
 
             if os.path.exists(current_lang_flag_path):
-                current_lang_flag = Image.open(current_lang_flag_path).convert("RGB")
                 flag_width = int(flag_max_height * flag_aspect_ratio)
-                current_lang_flag = current_lang_flag.resize((flag_width, flag_max_height), RESAMPLING)
+                current_lang_flag = load_scaled(current_lang_flag_path, (flag_width, flag_max_height))
                 flag_x_current_lang = edge_spacing
                 strip_image.paste(current_lang_flag, (flag_x_current_lang, (strip_height - flag_max_height) // 2))
                 current_lang_x = flag_x_current_lang + flag_width + text_spacing
@@ -715,20 +475,41 @@ class VideoCreator:
             if arrow_img:
                 strip_image.paste(arrow_img, (arrow_x, arrow_y), mask=arrow_img)
 
-            temp_image_path = self.file_manager.get_temp_path("language_strip.png")
-            strip_image.save(temp_image_path, "PNG")
+            strip_array = np.array(strip_image, dtype=np.float32)
+            strip_overlay = (strip_array[:, :, :3], strip_array[:, :, 3:] / 255.0)
 
-            return temp_image_path, strip_height
+            self.language_strips[cache_key] = (strip_overlay, strip_height)
+            return strip_overlay, strip_height
         except Exception as e:
             logging.error(f"שגיאה ביצירת רצועת השפות: {e}")
             return None, 0
 
 
+class ShortsClipRenderer(ClipRenderer):
+    """
+    רנדרר הסרטונים הקצרים: כל השקופיות על רקע הסרטון, והמקטע האחרון הוא קליף הלוגו.
+    """
+    def __init__(self, video_creator, background_image_path):
+        super().__init__(video_creator)
+        self.background_image_path = background_image_path
+
+    def image_clip(self, segment):
+        if segment.kind == 'logo':
+            return self.video_creator.add_logo_clip(
+                duration=segment.min_duration,
+                background_image_path=self.background_image_path
+            )
+        return self.video_creator.create_image_clip(
+            list(segment.text_lines), segment.kind, list(segment.line_styles), self.background_image_path
+        )
+
+
 class VideoAssemblerShorts:
     def __init__(self, file_manager, image_creator, audio_creator, style_definitions, lang_settings):
         self.video_creator = VideoCreator(file_manager, image_creator, audio_creator, style_definitions, lang_settings)
         self.lang_settings = lang_settings
         self.lang_code = None
+        self.render_stats = RenderStats()
 
     def determine_background_image_path(self, title):
         background_image_filename = f"{sanitize_filename(title)}.png"
@@ -745,11 +526,6 @@ class VideoAssemblerShorts:
         for video_data in videos:
             video_number = video_data['video_number']
             title = video_data['title']
-            word = video_data['word']
-            translation = video_data['translation']
-            examples = video_data['examples']
-            call_to_action = video_data.get('call_to_action', '')
-            intro_subtitle_text = "למד מילים חדשות בשישים שניות" # כתובית פתיח בשפה הרצויה
 
             logging.info(f"מעבד סרטון מספר {video_number}: {title} בשפה: {lang_code}")
 
@@ -759,97 +535,18 @@ class VideoAssemblerShorts:
 
             background_image_path = self.determine_background_image_path(title)
             clips = []
+            start_time = time.perf_counter()
 
             try:
-                intro_clip = self.video_creator.create_intro_clip(intro_subtitle_text, title, video_number, background_image_path, lang_code)
-                if intro_clip:
-                    clips.append(intro_clip)
-
-                # שימוש בטקסט מנוקד להקראה ובטקסט ללא ניקוד לתצוגה
-                text_lines_word = [word, translation]
-                line_styles_word = ['word', 'translation']
-                clip_word = self.video_creator.create_image_clip(text_lines_word, 'word', line_styles_word, background_image_path)
-
-                # שימוש בטקסט המנוקד המקורי להקראה
-                audio_tasks = [
-                    (word, lang_code, True),
-                    (translation, 'iw'),
-                ]
-                audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-
-                audio_paths_word = []
-                english_audio = audio_results.get((word, lang_code, True), "") # שימוש בקוד שפה משתנה
-                if english_audio:
-                    audio_paths_word.append(english_audio)
-                hebrew_audio_translation = audio_results.get((translation, 'iw'), "")
-                if hebrew_audio_translation:
-                    audio_paths_word.append(hebrew_audio_translation)
-                if english_audio:
-                    audio_paths_word.append(english_audio)
-
-                clip_word = self.video_creator.create_clip(clip_word, audio_paths_word, min_duration=3)
-                clips.append(clip_word)
-
-                for example in examples:
-                    sentence = example['sentence']
-                    ex_translation = example['translation']
-
-                    # שימוש בטקסט מנוקד להקראה ובטקסט ללא ניקוד לתצוגה
-                    text_lines_example = [sentence, ex_translation]
-                    line_styles_example = ['sentence', 'translation']
-                    clip_example = self.video_creator.create_image_clip(text_lines_example, 'sentence', line_styles_example, background_image_path)
-
-                    # שימוש בטקסט המנוקד המקורי להקראה
-                    audio_tasks = [
-                        (sentence, lang_code, True),
-                        (ex_translation, 'iw'),
-                    ]
-                    audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-
-                    audio_paths_example = []
-                    english_audio_sentence = audio_results.get((sentence, lang_code, True), "") # שימוש בקוד שפה משתנה
-                    if english_audio_sentence:
-                        audio_paths_example.append(english_audio_sentence)
-                    hebrew_audio_ex_translation = audio_results.get((ex_translation, 'iw'), "")
-                    if hebrew_audio_ex_translation:
-                        audio_paths_example.append(hebrew_audio_ex_translation)
-                    if english_audio_sentence:
-                        audio_paths_example.append(english_audio_sentence)
-
-                    clip_example = self.video_creator.create_clip(clip_example, audio_paths_example, min_duration=4)
-
-                    if clips:
-                        previous_clip = clips[-1]
-                        transition = self.video_creator.slide_transition(previous_clip, clip_example)
-                        clips.append(transition)
-
-                    clips.append(clip_example)
-
-                # קריאה לפעולה
-                if call_to_action:
-                    clip_outro_image = self.video_creator.create_outro(call_to_action, background_image_path) # יצירת קליפ תמונה בלבד
-                    if clip_outro_image:
-                        # יצירת משימת אודיו לקריאה לפעולה בעברית
-                        audio_tasks_outro = [(call_to_action, 'iw')]
-                        audio_results_outro = self.video_creator.audio_creator.create_audios(audio_tasks_outro)
-                        audio_path_outro = audio_results_outro.get((call_to_action, 'iw'), "")
-
-                        # יצירת קליפ סיום סופי עם תמונה ואודיו
-                        clip_outro = self.video_creator.create_clip(
-                            clip_outro_image, # שימוש בקליפ התמונה שנוצר
-                            [audio_path_outro], # הוספת נתיב האודיו לקריאה לפעולה
-                            min_duration=4
-                        )
-                        transition = self.video_creator.slide_transition(clips[-1], clip_outro)
-                        clips.append(transition)
-                        clips.append(clip_outro)
-                        clip_outro_image.close() # סגירת קליפ התמונה לאחר שימוש
+                timeline = self.build_short_timeline(video_data, lang_code)
+                logging.info(f"ציר הזמן של {timeline.name}: {len(timeline.segments)} מקטעים, {len(timeline.audio_tasks())} משימות TTS")
 
-                logo_clip = self.video_creator.add_logo_clip(duration=5, background_image_path=background_image_path)
-                if logo_clip:
-                    transition = self.video_creator.slide_transition(clips[-1], logo_clip)
-                    clips.append(transition)
-                    clips.append(logo_clip)
+                audio_creator = self.video_creator.audio_creator
+                sent_before = len(audio_creator.sent_tasks)
+                renderer = ShortsClipRenderer(self.video_creator, background_image_path)
+                for clip in renderer.render(timeline):
+                    clips.append(clip)
+                check_tts_usage(timeline, audio_creator, audio_creator.sent_tasks[sent_before:])
 
                 logging.info(f"איחוד הקליפים לסרטון מספר {video_number}: {title}")
                 final_clip = concatenate_videoclips(clips, method="compose")
@@ -863,6 +560,8 @@ class VideoAssemblerShorts:
                     final_audio.close()
 
                 self.create_and_save_final_video(video_path, final_clip, video_number, lang_code, thumbnails_dir) # קוד שפה לשמירה
+                if os.path.exists(video_path):
+                    self.render_stats.record('shorts', final_clip.duration, time.perf_counter() - start_time)
 
             except Exception as e:
                 logging.error(f"שגיאה בתהליך הרכבת הווידאו לסרטון מספר {video_number}: {e}")
@@ -873,6 +572,52 @@ class VideoAssemblerShorts:
                     final_clip.close()
 
 
+    def build_short_timeline(self, video_data, lang_code):
+        """
+        ציר הזמן של סרטון קצר: הרצף והמעברים שמהם נבנים הרינדור, בדיקת הפריסה וההערכה.
+        """
+        video_number = video_data['video_number']
+        title = video_data['title']
+        word = video_data['word']
+        translation = video_data['translation']
+        label = f"Short {video_number}"
+
+        timeline = Timeline(f"{label}: {title}")
+        timeline = timeline.append(Segment(
+            'intro_subtitle', f"{label} / intro",
+            *map(tuple, self.video_creator.intro_slide(INTRO_SUBTITLE_TEXT, title, video_number)), lang_code,
+            ((title, 'iw'), (f"מספר {video_number}", 'iw')), min_duration=3
+        ))
+        timeline = timeline.append(Segment(
+            'word', f"{label} / {word}", (word, translation), ('word', 'translation'), lang_code,
+            ((word, lang_code, True), (translation, 'iw'), (word, lang_code, True)), min_duration=3
+        ))
+        for idx, example in enumerate(video_data['examples']):
+            sentence = example['sentence']
+            ex_translation = example['translation']
+            timeline = timeline.append(Segment(
+                'sentence', f"{label} #{idx + 1}", (sentence, ex_translation), ('sentence', 'translation'), lang_code,
+                ((sentence, lang_code, True), (ex_translation, 'iw'), (sentence, lang_code, True)),
+                min_duration=4, transition='slide'
+            ))
+
+        call_to_action = video_data.get('call_to_action', '')
+        if call_to_action:
+            timeline = timeline.append(Segment(
+                'outro', f"{label} / call_to_action", (call_to_action,), ('call_to_action',), lang_code,
+                ((call_to_action, 'iw'),), min_duration=4, transition='slide'
+            ))
+        return timeline.append(Segment('logo', f"{label} / logo", (), (), lang_code, min_duration=5, transition='slide'))
+
+    def iter_layout_slides(self, data):
+        """
+        מחזיר את כל השקופיות של קובץ הסרטונים כ-(תיאור, text_lines, line_styles), לפי ציר הזמן של assemble_shorts_videos.
+        """
+        for video_data in data:
+            for segment in self.build_short_timeline(video_data, self.lang_code).segments:
+                if segment.text_lines:
+                    yield segment.label, list(segment.text_lines), list(segment.line_styles)
+
     def add_language_strip_to_clip(self, clip, language_strip, strip_height):
         try:
             logging.info("Attempting to add language strip to clip")
@@ -897,12 +642,13 @@ class VideoAssemblerShorts:
 
     def create_and_save_final_video(self, video_path, final_clip, video_number, lang_code, thumbnails_dir):
         try:
-            language_strip_path, strip_height = self.video_creator.create_language_strip(WIDTH, HEIGHT, lang_code) # קוד שפה לרצועה
+            strip_overlay, strip_height = self.video_creator.create_language_strip(WIDTH, HEIGHT, lang_code) # קוד שפה לרצועה
 
-            if language_strip_path:
-                strip_clip = ImageClip(language_strip_path).set_duration(final_clip.duration)
-                strip_position = (0, VIDEO_SIZE[1] - strip_height)
-                final_video_clip = CompositeVideoClip([final_clip, strip_clip.set_position(strip_position)])
+            if strip_overlay:
+                # מיזוג הרצועה ישירות לשורות התחתונות של כל פריים, במקום שכבת Composite על כל הווידאו
+                final_video_clip = final_clip.fl_image(
+                    lambda frame: overlay_language_strip(frame, strip_overlay)
+                )
             else:
                 final_video_clip = final_clip
 
@@ -921,17 +667,64 @@ class VideoAssemblerShorts:
             if 'final_video_clip' in locals():
                 final_video_clip.close()
 
-def main():
+def layout_check(data, style_definitions, lang_settings):
+    """
+    מצב --layout-check: מודד את כל השקופיות בקובץ ומדווח על חריגות, ללא TTS וללא קידוד.
+    """
+    image_creator = ImageCreator(styles=style_definitions)
+    video_assembler = VideoAssemblerShorts(None, image_creator, None, style_definitions, lang_settings)
+    offenders = run_layout_check(
+        list(video_assembler.iter_layout_slides(data)),
+        lambda text_lines, line_styles: image_creator.measure_layout(text_lines, style_definitions, line_styles),
+        MAX_TEXT_WIDTH,
+        VIDEO_SIZE
+    )
+    sys.exit(1 if offenders else 0)
+
+def estimate(data, style_definitions, lang_settings):
+    """
+    מצב --estimate: אורך משוער, תווי TTS וזמן רינדור לכל סרטון בקובץ, ללא TTS וללא קידוד.
+    """
+    video_assembler = VideoAssemblerShorts(None, None, None, style_definitions, lang_settings)
+    timelines = [video_assembler.build_short_timeline(video_data, lang_code) for video_data in data]
+    estimate_timelines(timelines, AudioCreator(None, lang_settings), 'shorts')
+    sys.exit(0)
+
+def parse_args(argv):
+    """
+    קורא את ארגומנטי שורת הפקודה: <שם קובץ> <קוד שפה> [--layout-check] [--estimate].
+    """
+    global LAYOUT_CHECK, ESTIMATE, json_name, lang_code, JSON_FILE
+    LAYOUT_CHECK, cli_args = split_layout_check_flag(argv)
+    ESTIMATE, cli_args = split_estimate_flag(cli_args)
+    json_name = str(cli_args[0])
+    lang_code = str(cli_args[1])
+    JSON_FILE = os.path.join(DATA_DIR, lang_code, f'shorts_{json_name}.json')
+
+def load_render_modules():
+    """
+    ייבוא MoviePy נדחה עד שמגיעים לרינדור בפועל (ספריית ה-TTS נטענת ב-AudioCreator),
+    כך ש---layout-check ושגיאות ארגומנטים לא משלמים על טעינתם ועל בדיקת ffmpeg.
+    """
+    global AudioFileClip, CompositeAudioClip, CompositeVideoClip, ImageClip, afx
+    global concatenate_videoclips, audio_loop
+    from moviepy.editor import (
+        AudioFileClip, CompositeAudioClip, CompositeVideoClip, ImageClip, afx,
+        concatenate_videoclips
+    )
+    from moviepy.audio.fx.audio_loop import audio_loop
+
+def main(argv=None):
+    parse_args(sys.argv[1:] if argv is None else argv)
     file_manager = None
     video_assembler = None
-    lang_code = str(sys.argv[2]) # קוד שפה מגיע כארגומנט שני
 
     try:
         with open(JSON_FILE, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
         with open(STYLES_JSON_FILE, 'r', encoding='utf-8') as f:
-            style_definitions = json.load(f)
+            style_definitions = compile_styles(json.load(f), LINE_SPACING_NORMAL)
 
         with open(LANG_SETTINGS_FILE, 'r', encoding='utf-8') as f:
             lang_settings = json.load(f)
@@ -960,6 +753,13 @@ def main():
             logging.error(f"סגנונות חסרים בקובץ העיצובים: {', '.join(missing_styles)}. ודא שכל הסגנונות הדרושים מוגדרים.")
             sys.exit(1)
 
+        if LAYOUT_CHECK:
+            layout_check(data, style_definitions, lang_settings)
+
+        if ESTIMATE:
+            estimate(data, style_definitions, lang_settings)
+
+        load_render_modules()
         file_manager = FileManager(OUTPUT_DIR, THUMBNAILS_DIR, lang_code) # קוד שפה ל file manager
         image_creator = ImageCreator(styles=style_definitions)
         audio_creator = AudioCreator(file_manager.temp_dir, lang_settings) # lang_settings לאודיו
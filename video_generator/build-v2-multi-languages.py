@@ -1,18 +1,19 @@
 import json
 import sys
 import os
-import random
-import re
+import time
 import numpy as np
-from moviepy.editor import *
-from PIL import Image, ImageDraw, ImageFont
-import arabic_reshaper
-from bidi.algorithm import get_display
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import tempfile
+from PIL import Image, ImageDraw
 import logging
-from functools import lru_cache
 from audio_creator import AudioCreator
+from render_core import (
+    FileManager, BaseImageCreator, BaseVideoCreator, sanitize_filename, is_hebrew, process_hebrew_text
+)
+from style_compiler import compile_styles
+from layout_check import split_layout_check_flag, run_layout_check
+from asset_cache import load_scaled
+from timeline import Segment, Timeline, ClipRenderer
+from estimator import RenderStats, split_estimate_flag, estimate_timelines, check_tts_usage
 
 # הגדרת רמת הלוגינג
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -52,10 +53,12 @@ BACKGROUND_IMAGES = {
     'intro_title': None  # יוגדר דינמית לפי שפה
 }
 
-# נתיבים לקבצים
-json_name = str(sys.argv[1])
-lang_code = str(sys.argv[2])  # קוד שפה (en, es, fr)
-JSON_FILE = os.path.join(DATA_DIR, lang_code, f'words_level_{json_name}.json')
+# נתיבים לקבצים (JSON_FILE וקוד השפה נקבעים ב-parse_args)
+LAYOUT_CHECK = False  # --layout-check: מדידת פריסה בלבד
+ESTIMATE = False  # --estimate: הערכת אורך, תווי TTS וזמן רינדור בלבד
+json_name = None
+lang_code = None  # קוד שפה (en, es, fr)
+JSON_FILE = None
 STYLES_JSON_FILE = os.path.join(ASSETS_DIR, 'styles-v2.json')  # שימוש בקובץ styles-v2.json
 FONT_PATH = os.path.join(FONTS_DIR, 'Rubik-Regular.ttf')
 LOGO_PATH = os.path.join(LOGOS_DIR, 'logo.png')
@@ -71,29 +74,14 @@ BACKGROUND_MUSIC_PATH = os.path.join(ASSETS_DIR, 'background_music.mp3')
 
 # הגדרות MoviePy
 VIDEO_SIZE = (1920, 1080)
+MAX_TEXT_WIDTH = 1720
+MAX_TEXT_HEIGHT = VIDEO_SIZE[1] - 200
 FPS = 24
 THREADS = 8
 
 # זמן השהייה בין קטעי משפט ותרגום (בשניות)
 SENTENCE_TRANSITION_DURATION = 1.0
 
-def sanitize_filename(filename):
-    """
-    מסיר תווים בלתי חוקיים משם קובץ ומחליף אותם ב-underscore.
-    """
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
-
-def is_hebrew(text):
-    for char in text:
-        if '\u0590' <= char <= '\u05FF':
-            return True
-    return False
-
-def process_hebrew_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    bidi_text = get_display(reshaped_text)
-    return bidi_text
-
 def remove_nikud(text):
   """
   מסירה ניקוד מטקסט עברי.
@@ -107,56 +95,10 @@ def remove_nikud(text):
   nikud_chars = set(chr(i) for i in range(0x0591, 0x05C7 + 1))
   return ''.join(c for c in text if c not in nikud_chars)
 
-class FileManager:
-    def __init__(self, output_dir, thumbnails_dir, lang_code):
-        self.output_dir = os.path.join(CONCEPTS_DIR, lang_code)  # שימוש בתיקיית concepts
-        self.thumbnails_dir = os.path.join(thumbnails_dir, lang_code)  # תיקיית תמונות ממוזערות לפי שפה
-        os.makedirs(self.output_dir, exist_ok=True)
-        os.makedirs(self.thumbnails_dir, exist_ok=True)
-        self.temp_dir = tempfile.TemporaryDirectory()
-
-    def get_temp_path(self, filename):
-        sanitized_filename = sanitize_filename(filename)
-        return os.path.join(self.temp_dir.name, sanitized_filename)
-
-    def cleanup(self):
-        self.temp_dir.cleanup()
-
-class ImageCreator:
-    def __init__(self, styles):
-        self.styles = styles
-        self.cache = {}
-
-    @lru_cache(maxsize=None)
-    def get_font(self, font_path, font_size):
-        try:
-            font_full_path = os.path.join(FONTS_DIR, font_path)
-            return ImageFont.truetype(font_full_path, font_size)
-        except IOError:
-            logging.error(f"לא ניתן למצוא את הגופן בנתיב: {font_path}")
-            raise
-
-    def split_text_into_lines(self, text, font, max_width, draw):
-        words = text.split()
-        lines = []
-        current_line = ""
-
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            width = bbox[2] - bbox[0]
-            if width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
+class ImageCreator(BaseImageCreator):
+    max_text_width = MAX_TEXT_WIDTH
+    max_text_height = MAX_TEXT_HEIGHT
 
-        return lines
-    
     def draw_text_with_stroke(self, draw, x, y, text, font, fill, stroke_width, stroke_color):
             draw.text((x - stroke_width, y - stroke_width), text, font=font, fill=stroke_color)
             draw.text((x + stroke_width, y - stroke_width), text, font=font, fill=stroke_color)
@@ -176,6 +118,43 @@ class ImageCreator:
         else:
             return os.path.join(BACKGROUNDS_DIR, BACKGROUND_IMAGES.get(style_name, ''))
 
+    def layout_lines(self, text_lines, style_definitions, line_styles, draw):
+        """
+        שלב המדידה והגלישה של create_image: מחזיר את השורות המעובדות והגובה הכולל.
+        """
+        total_height = 0
+        processed_lines = []
+        for i, line in enumerate(text_lines):
+            line_without_nikud = remove_nikud(line) if is_hebrew(line) else line
+
+            # קביעת הסגנון הנוכחי
+            current_style = style_definitions['normal']  # ברירת מחדל
+            if line_styles and i < len(line_styles):
+                current_style = style_definitions[line_styles[i]]
+            font = current_style.font
+
+            # קביעת המרווח בין השורות
+            spacing = current_style.line_spacing
+            if i == 1 and current_style.name == 'outro_subtitle':
+                spacing = LINE_SPACING_OUTRO_SUBTITLE
+
+            split_lines = self.split_text_into_lines(line_without_nikud, font, MAX_TEXT_WIDTH, draw)
+            for split_line in split_lines:
+                processed_line = process_hebrew_text(split_line) if is_hebrew(line) else split_line
+                bbox = draw.textbbox((0, 0), processed_line, font=font)
+                width = bbox[2] - bbox[0]
+                height = bbox[3] - bbox[1]
+                processed_lines.append((processed_line, width, height, current_style))
+                total_height += height + spacing
+
+        if processed_lines:
+            total_height -= spacing
+
+        return processed_lines, total_height
+
+    def line_widths(self, processed_lines):
+        return [width for _, width, _, _ in processed_lines]
+
     def create_image(self, text_lines, style_definitions, line_styles=None, lang_code='iw'):
         cache_key = tuple(text_lines) + tuple(line_styles or []) + (lang_code,)
         if cache_key in self.cache:
@@ -190,78 +169,13 @@ class ImageCreator:
         background_image_path = self.get_background_image_path(first_style_name, lang_code)
         
         try:
-            img = Image.open(background_image_path).convert("RGBA")
-            img = img.resize(VIDEO_SIZE, Image.LANCZOS)
+            img = load_scaled(background_image_path, VIDEO_SIZE, "RGBA")
         except FileNotFoundError:
             logging.error(f"תמונת רקע לא נמצאה בנתיב: {background_image_path}")
             raise
         
         draw = ImageDraw.Draw(img)
-        MAX_TEXT_WIDTH = 1720
-
-        total_height = 0
-        processed_lines = []
-        for i, line in enumerate(text_lines):
-            line_without_nikud = remove_nikud(line) if is_hebrew(line) else line
-            
-            # קביעת הסגנון הנוכחי
-            current_style = style_definitions['normal']  # ברירת מחדל
-            style_name = 'normal'
-            if line_styles and i < len(line_styles):
-                current_style = style_definitions[line_styles[i]]
-                style_name = line_styles[i]
-
-            font = self.get_font(current_style['font_path'], current_style['font_size'])
-
-            if is_hebrew(line):
-                split_lines = self.split_text_into_lines(line_without_nikud, font, MAX_TEXT_WIDTH, draw)
-                for split_line in split_lines:
-                    processed_line = process_hebrew_text(split_line)
-                    processed_style = current_style.copy()
-                    processed_style['style_name'] = style_name
-                    bbox = draw.textbbox((0, 0), processed_line, font=font)
-                    width = bbox[2] - bbox[0]
-                    height = bbox[3] - bbox[1]
-                    processed_lines.append((processed_line, width, height, processed_style, font))
-                    
-                    # קביעת המרווח בין השורות
-                    if style_name == 'sentence':
-                        spacing = LINE_SPACING_WITHIN_SENTENCE
-                    elif style_name == 'translation':
-                        spacing = LINE_SPACING_BETWEEN_SENTENCE_AND_TRANSLATION
-                    else:
-                        spacing = LINE_SPACING_NORMAL
-                        
-                    if i == 1 and style_name == 'outro_subtitle':
-                        spacing = LINE_SPACING_OUTRO_SUBTITLE
-                        
-                    total_height += height + spacing
-            else:
-                split_lines = self.split_text_into_lines(line_without_nikud, font, MAX_TEXT_WIDTH, draw)
-                for split_line in split_lines:
-                    processed_line = split_line
-                    processed_style = current_style.copy()
-                    processed_style['style_name'] = style_name
-                    bbox = draw.textbbox((0, 0), processed_line, font=font)
-                    width = bbox[2] - bbox[0]
-                    height = bbox[3] - bbox[1]
-                    processed_lines.append((processed_line, width, height, processed_style, font))
-                    
-                    # קביעת המרווח בין השורות
-                    if style_name == 'sentence':
-                        spacing = LINE_SPACING_WITHIN_SENTENCE
-                    elif style_name == 'translation':
-                        spacing = LINE_SPACING_BETWEEN_SENTENCE_AND_TRANSLATION
-                    else:
-                        spacing = LINE_SPACING_NORMAL
-                        
-                    if i == 1 and style_name == 'outro_subtitle':
-                        spacing = LINE_SPACING_OUTRO_SUBTITLE
-                        
-                    total_height += height + spacing
-
-        if processed_lines:
-            total_height -= spacing
+        processed_lines, total_height = self.fit_layout(text_lines, style_definitions, line_styles, draw)
 
         current_y = (img.height - total_height) / 2
 
@@ -273,20 +187,20 @@ class ImageCreator:
             current_y -= visual_offset
 
 
-        for idx, (processed_line, width, height, current_style, font) in enumerate(processed_lines):
-            style_name = current_style.get('style_name', 'normal')
+        for idx, (processed_line, width, height, current_style) in enumerate(processed_lines):
+            style_name = current_style.name
             if style_name in ['sentence', 'translation']:
                 x_text = (img.width - width) / 2
             else:
                 x_text = (img.width - width) / 2
 
-            if 'stroke_width' in current_style and 'stroke_color' in current_style:
-                self.draw_text_with_stroke(draw, x_text, current_y, processed_line, font, tuple(current_style['text_color']), current_style['stroke_width'], tuple(current_style['stroke_color']))
+            if current_style.has_stroke:
+                self.draw_text_with_stroke(draw, x_text, current_y, processed_line, current_style.font, current_style.text_color, current_style.stroke_width, current_style.stroke_color)
             else:
-                  draw.text((x_text, current_y), processed_line, font=font, fill=tuple(current_style['text_color']))
+                  draw.text((x_text, current_y), processed_line, font=current_style.font, fill=current_style.text_color)
             
             if idx < len(processed_lines) - 1:
-                next_style = processed_lines[idx + 1][3].get('style_name', 'normal')
+                next_style = processed_lines[idx + 1][3].name
                 if style_name == 'sentence' and next_style == 'translation':
                     spacing = LINE_SPACING_BETWEEN_SENTENCE_AND_TRANSLATION
                 elif style_name in ['sentence', 'translation']:
@@ -311,17 +225,14 @@ class ImageCreator:
                 target_flag_path = os.path.join(FLAGS_DIR, 'עברית.png')
 
 
-                source_flag = Image.open(source_flag_path).convert("RGBA")
-                target_flag = Image.open(target_flag_path).convert("RGBA")
-
                 # קביעת גובה הדגל
                 flag_height = 100
                 # קביעת יחס קבוע של 2:3 (גובה:רוחב)
                 flag_width = int(flag_height * 1.5)  # 1.5 = 3/2
 
-                # שינוי גודל הדגלים לפי היחס הקבוע
-                source_flag = source_flag.resize((flag_width, flag_height), RESAMPLING)
-                target_flag = target_flag.resize((flag_width, flag_height), RESAMPLING)
+                # הדגלים נטענים בגודל הסופי מתיקיית הנכסים המוקטנים
+                source_flag = load_scaled(source_flag_path, (flag_width, flag_height), "RGBA")
+                target_flag = load_scaled(target_flag_path, (flag_width, flag_height), "RGBA")
 
                 flag_spacing = 20
                 total_flags_width = source_flag.width + target_flag.width + flag_spacing
@@ -340,71 +251,20 @@ class ImageCreator:
         self.cache[cache_key] = img
         return img
 
-class VideoCreator:
+class VideoCreator(BaseVideoCreator):
+    video_size = VIDEO_SIZE
+
     def __init__(self, file_manager, image_creator, audio_creator, style_definitions, lang_settings):
-        self.file_manager = file_manager
-        self.image_creator = image_creator
-        self.audio_creator = audio_creator
-        self.style_definitions = style_definitions
+        super().__init__(file_manager, image_creator, audio_creator, style_definitions)
         self.lang_settings = lang_settings
 
     def create_image_clip(self, text_lines, style, line_styles=None, lang_code='iw'):
         img = self.image_creator.create_image(text_lines, self.style_definitions, line_styles, lang_code)
-        filename = f"{'_'.join(text_lines)}.png"
-        temp_image_path = self.file_manager.get_temp_path(filename)
-        img.save(temp_image_path)
-        image_clip = ImageClip(temp_image_path)
-        return image_clip
-
-    def create_audio_clips(self, audio_paths):
-        audio_clips = []
-        for path in audio_paths:
-            if os.path.exists(path):
-                audio_clip = AudioFileClip(path)
-                audio_clips.append(audio_clip)
-            else:
-                logging.warning(f"אודיו לא נמצא בנתיב: {path}")
-        if audio_clips:
-            return concatenate_audioclips(audio_clips)
-        else:
-            return None
-
-    def create_clip(self, image_clip, audio_paths, min_duration=0):
-        audio_total = self.create_audio_clips(audio_paths)
-        if audio_total:
-            duration = max(audio_total.duration, min_duration)
-            image_clip = image_clip.set_duration(duration)
-            image_clip = image_clip.set_audio(audio_total)
-        else:
-            image_clip = image_clip.set_duration(min_duration)
-        return image_clip
-
-    def slide_transition(self, clip1, clip2, duration=1):
-        direction = random.choice(['left', 'right', 'up', 'down'])
-        if direction == 'left':
-            move_out = lambda t: (-VIDEO_SIZE[0] * t / duration, 'center')
-            move_in = lambda t: (VIDEO_SIZE[0] - VIDEO_SIZE[0] * t / duration, 'center')
-        elif direction == 'right':
-            move_out = lambda t: (VIDEO_SIZE[0] * t / duration, 'center')
-            move_in = lambda t: (-VIDEO_SIZE[0] + VIDEO_SIZE[0] * t / duration, 'center')
-        elif direction == 'up':
-            move_out = lambda t: ('center', -VIDEO_SIZE[1] * t / duration)
-            move_in = lambda t: ('center', VIDEO_SIZE[1] - VIDEO_SIZE[1] * t / duration)
-        else:  # direction == 'down'
-            move_out = lambda t: ('center', VIDEO_SIZE[1] * t / duration)
-            move_in = lambda t: ('center', -VIDEO_SIZE[1] + VIDEO_SIZE[1] * t / duration)
-
-        clip1_moving = clip1.set_position(move_out).set_duration(duration)
-        clip2_moving = clip2.set_position(move_in).set_duration(duration)
-
-        transition = CompositeVideoClip([clip1_moving, clip2_moving], size=VIDEO_SIZE).set_duration(duration)
-        transition = transition.set_audio(None)
-        return transition
+        return self.save_image_clip(img, text_lines)
 
     def add_logo_to_video(self, clip, logo_path, position='top-right', size=(180, 180), opacity=255, margin=(50, 50)):
         try:
-            logo_image = Image.open(logo_path).convert("RGBA")
-            logo_image = logo_image.resize(size, RESAMPLING)
+            logo_image = load_scaled(logo_path, size, "RGBA")
 
             if opacity < 255:
                 alpha = logo_image.split()[3]
@@ -436,80 +296,98 @@ class VideoCreator:
             logging.error(f"שגיאה בהוספת הלוגו: {e}")
             return clip
     
-    def create_intro(self, lang_code):
-        lang_name_en = self.lang_settings.get(lang_code, self.lang_settings['en']).get('language_name_en', 'english')
+    def intro_slide(self, lang_code):
         lang_name_iw = self.lang_settings.get(lang_code, self.lang_settings['en']).get('language_name_iw', 'אנגלית')
-
         text_lines_intro = [
             "מושגים בשלבים",
             f"לדבר {lang_name_iw}, צעד אחר צעד"
         ]
-        line_styles_intro = ['intro_title', 'intro_subtitle']
-        clip_intro = self.create_image_clip(text_lines_intro, 'intro', line_styles_intro, lang_code)
-
-        # הוספת משפט עידוד להרשמה (יושמע בלבד, לא יוצג)
-        subscribe_message = "אַל תִּשְׁכְּחוּ לְהֵרָשֵׁם לֶעָרוּץ שֶׁלָּנוּ כְּדֵי לְהִתְעַדְכֵּן בְּעוֹד סִרְטוֹנִים שֶׁיְּסַיְּעוּ לָכֶם בְּלִמּוּד שָׂפוֹת!"
+        return text_lines_intro, ['intro_title', 'intro_subtitle']
 
-        audio_tasks = [
-            ("מושגים בשלבים", "iw"),
-            (f"לדבר {lang_name_iw}, צעד אחר צעד", "iw"),
-            (subscribe_message, "iw")  # הוספת משפט העידוד להקראה
-        ]
-
-        audio_results = self.audio_creator.create_audios(audio_tasks)
-        clip_intro = self.create_clip(
-             clip_intro,
-            [
-              audio_results.get(("מושגים בשלבים", "iw"), ""),
-              audio_results.get((f"לדבר {lang_name_iw}, צעד אחר צעד", "iw"), ""),
-              audio_results.get((subscribe_message, "iw"), "")  # הוספת האודיו של משפט העידוד
-             ],
-             min_duration=6
-        )
-        return clip_intro
-
-    def create_level_intro(self, level_num, level_name, lang_code):
+    def level_intro_slide(self, level_num, level_name, lang_code):
         level_word = self.lang_settings.get(lang_code, self.lang_settings['en']).get('level_word', 'Level')
-        text_lines_intro = [f"{level_word} {level_num}", level_name]
-        line_styles_intro = ['level', 'level']
-        clip_intro = self.create_image_clip(text_lines_intro, 'level', line_styles_intro, lang_code)
-
-        audio_tasks = [
-            (f"{level_word} {level_num}", lang_code),
-            (level_name, 'iw')
-        ]
-        audio_results = self.audio_creator.create_audios(audio_tasks)
-        clip_intro = self.create_clip(
-            clip_intro,
-            [
-                audio_results.get((f"{level_word} {level_num}", lang_code), ""),
-                audio_results.get((level_name, 'iw'), "")
-            ],
-            min_duration=6
-        )
-        return clip_intro
+        return [f"{level_word} {level_num}", level_name], ['level', 'level']
 
-    def create_outro(self, lang_code):
+    def outro_slide(self, lang_code):
         outro_data = self.lang_settings.get(lang_code, self.lang_settings['en']).get('outro', None)
         if outro_data is None:
              logging.error(f"לא נמצאו הגדרות outro עבור שפה: {lang_code}")
              raise ValueError(f"לא נמצאו הגדרות outro עבור שפה: {lang_code}")
+        return outro_data['text_lines'], outro_data['line_styles']
+
+    def intro_segment(self, lang_code):
+        text_lines_intro, line_styles_intro = self.intro_slide(lang_code)
+
+        # הוספת משפט עידוד להרשמה (יושמע בלבד, לא יוצג)
+        subscribe_message = "אַל תִּשְׁכְּחוּ לְהֵרָשֵׁם לֶעָרוּץ שֶׁלָּנוּ כְּדֵי לְהִתְעַדְכֵּן בְּעוֹד סִרְטוֹנִים שֶׁיְּסַיְּעוּ לָכֶם בְּלִמּוּד שָׂפוֹת!"
 
-        text_lines_outro = outro_data['text_lines']
-        line_styles_outro = outro_data['line_styles']
-        outro_audio_tasks = outro_data['audio_tasks']
+        audio_tasks = (
+            (text_lines_intro[0], "iw"),
+            (text_lines_intro[1], "iw"),
+            (subscribe_message, "iw")  # הוספת משפט העידוד להקראה
+        )
+        return Segment('intro', "intro", tuple(text_lines_intro), tuple(line_styles_intro), lang_code,
+                       audio_tasks, min_duration=6)
+
+    def level_intro_segment(self, level_num, level_name, lang_code):
+        text_lines_intro, line_styles_intro = self.level_intro_slide(level_num, level_name, lang_code)
+        audio_tasks = (
+            (text_lines_intro[0], lang_code),
+            (level_name, 'iw')
+        )
+        return Segment('level', f"Level {level_num}", tuple(text_lines_intro), tuple(line_styles_intro), lang_code,
+                       audio_tasks, min_duration=6, thumbnail=f"Level_{level_num}_thumbnail.png")
 
-        clip_outro = self.create_image_clip(text_lines_outro, 'outro', line_styles_outro, lang_code)
-        audio_results = self.audio_creator.create_audios(outro_audio_tasks)
-        audio_paths = [audio_results.get(tuple(task), "") for task in outro_audio_tasks]
-        clip_outro = self.create_clip(clip_outro, audio_paths, min_duration=15)
-        return clip_outro
+    def outro_segment(self, lang_code):
+        text_lines_outro, line_styles_outro = self.outro_slide(lang_code)
+        outro_audio_tasks = self.lang_settings.get(lang_code, self.lang_settings['en'])['outro']['audio_tasks']
+        return Segment('outro', "outro", tuple(text_lines_outro), tuple(line_styles_outro), lang_code,
+                       tuple(tuple(task) for task in outro_audio_tasks), min_duration=15, transition='slide')
 
 class VideoAssembler:
     def __init__(self, file_manager, image_creator, audio_creator, style_definitions, lang_settings):
         self.video_creator = VideoCreator(file_manager, image_creator, audio_creator, style_definitions, lang_settings)
         self.lang_code = None
         self.lang_settings = lang_settings
+        self.render_stats = RenderStats()
+
+    def build_level_timeline(self, level, lang_code):
+        """
+        בונה את ציר הזמן של הרמה מתוך ה-JSON: פתיחה, פתיחת רמה, ולכל נושא משנה - מילים ומשפטי דוגמה, ולבסוף סיום.
+        """
+        level_num = level['level']
+        timeline = Timeline(f"Level {level_num}")
+        timeline = timeline.append(self.video_creator.intro_segment(lang_code))
+        timeline = timeline.append(self.video_creator.level_intro_segment(level_num, level['name'], lang_code))
+
+        for subtopic in level['subtopics']:
+            subtopic_name = subtopic['name']
+            timeline = timeline.append(Segment(
+                'subtopic', f"Level {level_num} / {subtopic_name}", (subtopic_name,), ('subtopic',), lang_code,
+                ((subtopic_name, lang_code), (subtopic_name, 'iw')),
+                min_duration=4.5, transition='slide'
+            ))
+
+            for word in subtopic['words']:
+                word_text = word['word']
+                word_translation = word['translation']
+                label = f"Level {level_num} / {subtopic_name} / {word_text}"
+                timeline = timeline.append(Segment(
+                    'word', label, (word_text, word_translation), ('word', 'normal'), lang_code,
+                    ((word_text, lang_code, True), (word_translation, 'iw'), (word_text, lang_code, True)),
+                    transition='slide'
+                ))
+
+                for idx, example in enumerate(word['examples']):
+                    sentence = example['sentence']
+                    translation = example['translation']
+                    # השהייה בין קטעי משפט ותרגום: המקטע הקודם מוארך ב-SENTENCE_TRANSITION_DURATION
+                    timeline = timeline.append(Segment(
+                        'normal', f"{label} #{idx + 1}", (sentence, translation), ('sentence', 'translation'), lang_code,
+                        ((sentence, lang_code, True), (translation, 'iw'), (sentence, lang_code, True))
+                    ), pause_before=SENTENCE_TRANSITION_DURATION)
+
+        return timeline.append(self.video_creator.outro_segment(lang_code))
 
     def assemble_level_video(self, level, output_dir, thumbnails_dir, lang_code):
         self.lang_code = lang_code
@@ -522,121 +400,18 @@ class VideoAssembler:
         video_path = os.path.join(output_dir, video_filename)
 
         clips = []
+        start_time = time.perf_counter()
 
         try:
-            clip_intro = self.video_creator.create_intro(self.lang_code)
-            clips.append(clip_intro)
-
-            clip_level_intro = self.video_creator.create_level_intro(level_num, level_name, self.lang_code)
-            clips.append(clip_level_intro)
-
-            thumbnail_path = os.path.join(thumbnails_dir, f"Level_{level_num}_thumbnail.png")
-            clip_level_intro.save_frame(thumbnail_path, t=0)
-            logging.info(f"שומר תמונת תצוגה מקדימה בנתיב: {thumbnail_path}")
-
-            for subtopic in level['subtopics']:
-                subtopic_name = subtopic['name']
-                logging.info(f"  מעבד Subtopic: {subtopic_name}")
-
-                text_lines_subtopic = [subtopic_name]
-                line_styles_subtopic = ['subtopic']
-                clip_subtopic = self.video_creator.create_image_clip(text_lines_subtopic, 'subtopic', line_styles_subtopic, self.lang_code)
-
-                audio_tasks = [
-                    (subtopic_name, self.lang_code),
-                    (subtopic_name, 'iw')
-                ]
-                audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                clip_subtopic = self.video_creator.create_clip(
-                    clip_subtopic,
-                    [
-                        audio_results.get((subtopic_name, self.lang_code), ""),
-                        audio_results.get((subtopic_name, 'iw'), "")
-                    ],
-                    min_duration=4.5
-                )
-
-                if clips:
-                    previous_clip = clips[-1]
-                    transition = self.video_creator.slide_transition(previous_clip, clip_subtopic)
-                    clips.append(transition)
-
-                clips.append(clip_subtopic)
-
-                for word in subtopic['words']:
-                    word_text = word['word']
-                    word_translation = word['translation']
-                    examples = word['examples']
-
-                    logging.info(f"    מעבד מילה: {word_text} - {word_translation}")
-
-                    text_lines_word = [word_text, word_translation]
-                    line_styles_word = ['word', 'normal']
-                    clip_word = self.video_creator.create_image_clip(text_lines_word, 'word', line_styles_word, self.lang_code)
-
-                    audio_tasks = [
-                        (word_text, self.lang_code, True),
-                        (word_translation, 'iw'),
-                        (word_text, self.lang_code, True)
-                    ]
-                    audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                    clip_word = self.video_creator.create_clip(
-                        clip_word,
-                        [
-                            audio_results.get((word_text, self.lang_code, True), ""),
-                            audio_results.get((word_translation, 'iw'), ""),
-                            audio_results.get((word_text, self.lang_code, True), "")
-                        ]
-                    )
-
-                    if clips:
-                        previous_clip = clips[-1]
-                        transition = self.video_creator.slide_transition(previous_clip, clip_word)
-                        clips.append(transition)
-
-                    clips.append(clip_word)
-
-                    for idx, example in enumerate(examples):
-                        sentence = example['sentence']
-                        translation = example['translation']
-
-                        logging.info(f"      מעבד משפט: {sentence} - {translation}")
-
-                        text_lines_example = [sentence, translation]
-                        line_styles_example = ['sentence', 'translation']
-                        clip_example = self.video_creator.create_image_clip(text_lines_example, 'normal', line_styles_example, self.lang_code)
-
-                        audio_tasks = [
-                            (sentence, self.lang_code, True),
-                            (translation, 'iw'),
-                            (sentence, self.lang_code, True)
-                        ]
-                        audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                        clip_example = self.video_creator.create_clip(
-                            clip_example,
-                            [
-                                audio_results.get((sentence, self.lang_code, True), ""),
-                                audio_results.get((translation, 'iw'), ""),
-                                audio_results.get((sentence, self.lang_code, True), "")
-                            ]
-                        )
-                        
-                        # הוספת השהייה בין קטעי משפט ותרגום
-                        if clips:
-                            previous_clip = clips[-1]
-                            # הארכת משך הקליפ הקודם אם הוא מסוג sentence או translation
-                            if line_styles_example[0] in ['sentence', 'translation']:
-                                 previous_clip = previous_clip.set_duration(previous_clip.duration + SENTENCE_TRANSITION_DURATION)
-                                 clips[-1] = previous_clip  # עדכון הקליפ ברשימה
-                            
-                            clips.append(clip_example)
-                        else:
-                            clips.append(clip_example)
-
-            clip_outro = self.video_creator.create_outro(self.lang_code)
-            transition = self.video_creator.slide_transition(clips[-1], clip_outro)
-            clips.append(transition)
-            clips.append(clip_outro)
+            timeline = self.build_level_timeline(level, self.lang_code)
+            logging.info(f"ציר הזמן של Level {level_num}: {len(timeline.segments)} מקטעים, {len(timeline.audio_tasks())} משימות TTS")
+
+            audio_creator = self.video_creator.audio_creator
+            sent_before = len(audio_creator.sent_tasks)
+            renderer = ClipRenderer(self.video_creator, thumbnails_dir)
+            for clip in renderer.render(timeline):
+                clips.append(clip)
+            check_tts_usage(timeline, audio_creator, audio_creator.sent_tasks[sent_before:])
 
             logging.info(f"איחוד הקליפים לסרטון Level {level_num}: {level_name}")
             final_clip = concatenate_videoclips(clips, method="compose")
@@ -660,6 +435,7 @@ class VideoAssembler:
 
             logging.info(f"שומר את הסרטון בנתיב: {video_path}")
             final_clip.write_videofile(video_path, fps=FPS, codec='libx264', audio_codec='aac', threads=THREADS)
+            self.render_stats.record('levels', final_clip.duration, time.perf_counter() - start_time)
 
         except Exception as e:
             logging.error(f"שגיאה בתהליך הרכבת הוידאו ל-Level {level_num}: {e}")
@@ -670,6 +446,13 @@ class VideoAssembler:
             if 'final_clip' in locals():
                 final_clip.close()
 
+    def iter_layout_slides(self, level, lang_code):
+        """
+        מחזיר את כל השקופיות של הרמה כ-(תיאור, text_lines, line_styles), לפי ציר הזמן של assemble_level_video.
+        """
+        for segment in self.build_level_timeline(level, lang_code).segments:
+            yield segment.label, list(segment.text_lines), list(segment.line_styles)
+
     def shutdown(self):
         self.video_creator.audio_creator.shutdown()
 
@@ -677,9 +460,60 @@ def close_clips(clips):
     for clip in clips:
         clip.close()
 
-def main():
-    lang_code = sys.argv[2]  # קבלת קוד השפה כארגומנט
-    file_manager = FileManager(OUTPUT_DIR, THUMBNAILS_DIR, lang_code)
+def layout_check(data, style_definitions, lang_settings):
+    """
+    מצב --layout-check: מודד את כל השקופיות בקובץ ומדווח על חריגות, ללא TTS וללא קידוד.
+    """
+    image_creator = ImageCreator(styles=style_definitions)
+    video_assembler = VideoAssembler(None, image_creator, None, style_definitions, lang_settings)
+    slides = [
+        slide
+        for level in data['levels']
+        for slide in video_assembler.iter_layout_slides(level, lang_code)
+    ]
+    offenders = run_layout_check(
+        slides,
+        lambda text_lines, line_styles: image_creator.measure_layout(text_lines, style_definitions, line_styles),
+        MAX_TEXT_WIDTH,
+        VIDEO_SIZE
+    )
+    sys.exit(1 if offenders else 0)
+
+def estimate(data, style_definitions, lang_settings):
+    """
+    מצב --estimate: אורך משוער, תווי TTS וזמן רינדור לכל רמה בקובץ, ללא TTS וללא קידוד.
+    """
+    video_assembler = VideoAssembler(None, None, None, style_definitions, lang_settings)
+    timelines = [video_assembler.build_level_timeline(level, lang_code) for level in data['levels']]
+    estimate_timelines(timelines, AudioCreator(None, lang_settings, THREADS), 'levels')
+    sys.exit(0)
+
+def parse_args(argv):
+    """
+    קורא את ארגומנטי שורת הפקודה: <מספר רמה> <קוד שפה> [--layout-check] [--estimate].
+    """
+    global LAYOUT_CHECK, ESTIMATE, json_name, lang_code, JSON_FILE
+    LAYOUT_CHECK, cli_args = split_layout_check_flag(argv)
+    ESTIMATE, cli_args = split_estimate_flag(cli_args)
+    json_name = str(cli_args[0])
+    lang_code = str(cli_args[1])
+    JSON_FILE = os.path.join(DATA_DIR, lang_code, f'words_level_{json_name}.json')
+
+def load_render_modules():
+    """
+    ייבוא MoviePy נדחה עד שמגיעים לרינדור בפועל (ספריית ה-TTS נטענת ב-AudioCreator),
+    כך ש---layout-check ושגיאות ארגומנטים לא משלמים על טעינתם ועל בדיקת ffmpeg.
+    """
+    global AudioFileClip, CompositeAudioClip, CompositeVideoClip, ImageClip, afx
+    global concatenate_videoclips
+    from moviepy.editor import (
+        AudioFileClip, CompositeAudioClip, CompositeVideoClip, ImageClip, afx,
+        concatenate_videoclips
+    )
+
+def main(argv=None):
+    parse_args(sys.argv[1:] if argv is None else argv)
+    file_manager = None
     video_assembler = None
 
     try:
@@ -687,11 +521,26 @@ def main():
             data = json.load(f)
 
         with open(STYLES_JSON_FILE, 'r', encoding='utf-8') as f:
-            style_definitions = json.load(f)
+            style_definitions = compile_styles(
+                json.load(f),
+                LINE_SPACING_NORMAL,
+                {
+                    'sentence': LINE_SPACING_WITHIN_SENTENCE,
+                    'translation': LINE_SPACING_BETWEEN_SENTENCE_AND_TRANSLATION,
+                }
+            )
 
         with open(LANG_SETTINGS_FILE, 'r', encoding='utf-8') as f:
             lang_settings = json.load(f)
 
+        if LAYOUT_CHECK:
+            layout_check(data, style_definitions, lang_settings)
+
+        if ESTIMATE:
+            estimate(data, style_definitions, lang_settings)
+
+        load_render_modules()
+        file_manager = FileManager(CONCEPTS_DIR, THUMBNAILS_DIR, lang_code)
         image_creator = ImageCreator(styles=style_definitions)
         audio_creator = AudioCreator(file_manager.temp_dir, lang_settings, THREADS)
         video_assembler = VideoAssembler(file_manager, image_creator, audio_creator, style_definitions, lang_settings)
@@ -0,0 +1,122 @@
+import time
+
+START_TIME = time.perf_counter()
+
+import os
+import re
+import sys
+import logging
+import argparse
+import importlib.util
+
+# נקודת כניסה קלה לכל סקריפטי הבנייה: רק ספריות סטנדרטיות נטענות כאן,
+# וסקריפט הבנייה עצמו (PIL, MoviePy, TTS) נטען רק אחרי שהארגומנטים נבדקו.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, '..', 'data')
+
+BUILDERS = {
+    'levels': 'build-v2-multi-languages.py',
+    'shorts': 'build-shorts-multi-languages.py',
+    'story': 'build_story-v2.py',
+    'assets': 'build-assets.py',
+}
+
+
+def log_startup(command):
+    logging.info(f"build.py {command}: זמן עד לוג ראשון {(time.perf_counter() - START_TIME) * 1000:.0f}ms")
+
+
+def load_builder(command):
+    path = os.path.join(BASE_DIR, BUILDERS[command])
+    spec = importlib.util.spec_from_file_location(os.path.splitext(BUILDERS[command])[0].replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def list_data(kind, lang_code=None):
+    """
+    מדפיס את קבצי הנתונים הזמינים לכל סוג סרטון, בלי לטעון את סקריפטי הבנייה.
+    """
+    if kind in ('levels', 'shorts'):
+        pattern = re.compile(r'^words_level_(.+)\.json$' if kind == 'levels' else r'^shorts_(.+)\.json$')
+        kind_dir = os.path.join(DATA_DIR, kind)
+        languages = [lang_code] if lang_code else sorted(
+            name for name in os.listdir(kind_dir) if os.path.isdir(os.path.join(kind_dir, name)) and name != '__pycache__'
+        )
+        for lang in languages:
+            lang_dir = os.path.join(kind_dir, lang)
+            if not os.path.isdir(lang_dir):
+                logging.warning(f"אין נתונים עבור שפה: {lang}")
+                continue
+            names = [match.group(1) for match in map(pattern.match, os.listdir(lang_dir)) if match]
+            names.sort(key=lambda name: (not name.isdigit(), int(name) if name.isdigit() else 0, name))
+            print(f"{kind} [{lang}]: {' '.join(names)}")
+    else:
+        stories_dir = os.path.join(DATA_DIR, 'stories')
+        names = [os.path.splitext(name)[0] for name in os.listdir(stories_dir) if name.endswith('.json')]
+        names.sort(key=lambda name: (len(name), name))
+        print(f"story: {' '.join(names)}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='build.py', description='יצירת סרטוני הערוץ')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    levels = commands.add_parser('levels', help='סרטוני רמות (build-v2-multi-languages.py)')
+    levels.add_argument('level', help='מספר הרמה (words_level_<level>.json)')
+    levels.add_argument('lang_code', help='קוד שפה (en, es, fr, ru)')
+
+    shorts = commands.add_parser('shorts', help='סרטונים קצרים (build-shorts-multi-languages.py)')
+    shorts.add_argument('name', help='שם הקובץ (shorts_<name>.json)')
+    shorts.add_argument('lang_code', help='קוד שפה (en, es, fr)')
+
+    story = commands.add_parser('story', help='סרטוני סיפורים (build_story-v2.py)')
+    story.add_argument('name', help='שם הסיפור (data/stories/<name>.json)')
+
+    for command_parser in (levels, shorts, story):
+        command_parser.add_argument('--layout-check', action='store_true',
+                                    help='מדידת פריסה בלבד, ללא TTS וללא קידוד')
+        command_parser.add_argument('--estimate', action='store_true',
+                                    help='הערכת אורך הסרטון, תווי TTS וזמן רינדור, ללא TTS וללא קידוד')
+
+    assets = commands.add_parser('assets', help='הכנת נכסים מוקטנים (build-assets.py)')
+    assets.add_argument('profiles', nargs='*', help='landscape / shorts / songs (ברירת מחדל: כולם)')
+
+    listing = commands.add_parser('list', help='רשימת קבצי הנתונים הזמינים')
+    listing.add_argument('kind', nargs='?', choices=['levels', 'shorts', 'story'], default='levels')
+    listing.add_argument('--lang', dest='lang_code', help='קוד שפה (לרמות ולסרטונים קצרים)')
+
+    return parser.parse_args(argv)
+
+
+def builder_argv(args):
+    if args.command == 'levels':
+        argv = [args.level, args.lang_code]
+    elif args.command == 'shorts':
+        argv = [args.name, args.lang_code]
+    else:
+        argv = [args.name]
+    return argv + (['--layout-check'] if args.layout_check else []) + (['--estimate'] if args.estimate else [])
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    log_startup(args.command)
+
+    if args.command == 'list':
+        list_data(args.kind, args.lang_code)
+        return
+
+    builder = load_builder(args.command)
+    logging.info(f"{BUILDERS[args.command]} נטען תוך {(time.perf_counter() - START_TIME) * 1000:.0f}ms")
+    if args.command == 'assets':
+        builder.main(args.profiles)
+    else:
+        builder.main(builder_argv(args))
+
+
+if __name__ == '__main__':
+    main()
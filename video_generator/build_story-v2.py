@@ -3,27 +3,25 @@
 import json
 import sys
 import os
-import random
-import re
-import numpy as np
+import time
 # הסרה של gTTS
 # from gtts import gTTS
-from moviepy.editor import *
-from moviepy.audio.fx.audio_loop import audio_loop
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
-import arabic_reshaper
-from bidi.algorithm import get_display
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import tempfile
+from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
 import logging
-from functools import lru_cache
 from datetime import datetime
-from collections import Counter
-import colorsys
 import unicodedata
-
-# ייבוא ספריית Google Cloud Text-to-Speech
-from google.cloud import texttospeech
+import hashlib
+import audio_creator
+from render_core import (
+    FileManager, BaseImageCreator, BaseVideoCreator,
+    sanitize_filename, is_hebrew, process_hebrew_text, remove_asterisks
+)
+from style_compiler import compile_styles
+from layout_check import split_layout_check_flag, run_layout_check
+from palette_index import PaletteIndex, get_contrasting_color
+from asset_cache import load_scaled, load_round_logo
+from timeline import Segment, Timeline, ClipRenderer
+from estimator import RenderStats, split_estimate_flag, estimate_timelines, check_tts_usage
 
 # הגדרת נתיב למפתח ה-API (יש לוודא שהקובץ JSON נמצא במיקום זה)
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"C:\Users\me\OneDrive\וידאו\מפתחות גישה\youtube-channel-440320-fe17f0f0a940.json"
@@ -62,10 +60,13 @@ LOGOS_DIR = os.path.join(ASSETS_DIR, 'logos')
 BACKGROUNDS_DIR = os.path.join(ASSETS_DIR, 'backgrounds')
 OUTPUT_DIR = os.path.join(BASE_DIR, '..', 'output', 'stories')
 THUMBNAILS_DIR = os.path.join(OUTPUT_DIR, 'thumbnails')
+BACKGROUNDS_CACHE_DIR = os.path.join(BASE_DIR, '..', 'output', 'cache', 'story_backgrounds')  # רקעים מעובדים שמורים
 
-# נתיבים לקבצים
-json_name = str(sys.argv[1])
-JSON_FILE = os.path.join(DATA_DIR, f'{json_name}.json')
+# נתיבים לקבצים (JSON_FILE נקבע ב-parse_args)
+LAYOUT_CHECK = False  # --layout-check: מדידת פריסה בלבד
+ESTIMATE = False  # --estimate: הערכת אורך, תווי TTS וזמן רינדור בלבד
+json_name = None
+JSON_FILE = None
 STYLES_JSON_FILE = os.path.join(ASSETS_DIR, 'styles_stories.json')
 LOGO_PATH = os.path.join(LOGOS_DIR, 'logo_colored.png')
 
@@ -80,12 +81,28 @@ BACKGROUND_MUSIC_PATH = os.path.join(ASSETS_DIR, 'background_music.mp3')
 # הגדרות MoviePy
 VIDEO_SIZE = (1920, 1080)  # פורמט HD רגיל
 WIDTH, HEIGHT = VIDEO_SIZE
+MAX_TEXT_WIDTH = WIDTH - 200
+MAX_TEXT_HEIGHT = HEIGHT - 200
 FPS = 24
 THREADS = 8
 
+# טקסטים קבועים של מקטעי הסרטון
+STORY_INTRO_TEXT = (
+    "כְּדֵי לְהָפִיק אֶת הַמֵּיטָב מֵהַסִּרְטוֹן: "
+    "הַאֲזִינוּ לְהַקְרָאַת הַמִּשְׁפָּט בְּאַנְגְּלִית, "
+    "נַסּוּ לִקְרוֹא אוֹתוֹ בְּעַצְמְכֶם וּלְהָבִין אֶת הַמַּשְׁמָעוּת, "
+    "וּלְאַחַר מִכֵּן צְפוּ בַּתַרְגּוּם לְעִבְרִית כְּדֵי לִבְדּוֹק אֶת עַצְמְכֶם!"
+)
+STORY_START_TEXT = "הסיפור"
+STORY_END_TEXT = "הסוף"
+VOCAB_INTRO_TEXT = "מילים חדשות שלמדנו"
+QUESTIONS_INTRO_TEXT = "בחנו את עצמכם"
+LOGO_INTRO_TEXT = "תודה שצפיתם!"
+
 # צבע חדש להדגשת תשובה נכונה
 HIGHLIGHT_COLOR_CORRECT = (173, 216, 230, 180)
 GLOW_COLOR = (135, 206, 235)
+GLOW_RADIUS = 10
 
 
 def remove_niqqud(text):
@@ -97,159 +114,128 @@ def remove_niqqud(text):
     return without_niqqud
 
 
-# פונקציה לסניטיזציה של שמות קבצים
-def sanitize_filename(filename):
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
+class ImageCreator(BaseImageCreator):
+    max_text_width = MAX_TEXT_WIDTH
+    max_text_height = MAX_TEXT_HEIGHT
+    fit_styles = frozenset({'normal', 'bold'})
 
+    def __init__(self, styles):
+        super().__init__(styles)
+        self.overlay_color = (173, 216, 230, 150)  # תכלת עם שקיפות
+        self.brightness_factor = 1.2  # הגברת בהירות
+        self.blur_radius = 5  # רדיוס טשטוש
+        self.backgrounds = {}  # רקעים טעונים/מעובדים לפי נתיב ופרמטרי העיבוד
 
-# פונקציה לבדוק אם הטקסט בעברית
-def is_hebrew(text):
-    for char in text:
-        if '\u0590' <= char <= '\u05FF':
-            return True
-    return False
-
+    def load_background(self, background_image_path):
+        if background_image_path and os.path.exists(background_image_path):
+            try:
+                img = load_scaled(background_image_path, (WIDTH, HEIGHT))
+                logging.info(f"שימש רקע מהתמונה: {background_image_path}")
+                return img
+            except Exception as e:
+                logging.error(f"שגיאה בטעינת תמונת הרקע: {e}")
+        return Image.new('RGB', (WIDTH, HEIGHT), color=(255, 255, 255))
 
-# פונקציה לעיבוד טקסט בעברית
-def process_hebrew_text(text):
-    reshaped_text = arabic_reshaper.reshape(text)
-    bidi_text = get_display(reshaped_text)
-    return bidi_text
+    def process_background(self, img):
+        # הגברת בהירות
+        enhancer = ImageEnhance.Brightness(img)
+        img = enhancer.enhance(self.brightness_factor)
 
+        # טשטוש
+        img = img.filter(ImageFilter.GaussianBlur(radius=self.blur_radius))
 
-# פונקציות חדשות לבחירת צבעים מנוגדים ומגוונים
-def extract_main_colors(image_path, num_colors=2):
-    """
-    מחלץ את הצבעים העיקריים מתמונת הרקע.
-    :param image_path: נתיב לתמונת הרקע
-    :param num_colors: מספר הצבעים הראשיים לחילוץ
-    :return: רשימה של צבעים (RGB)
-    """
-    with Image.open(image_path) as img:
-        img = img.resize((100, 100))  # הפחתת גודל התמונה להאצת העיבוד
+        # הוספת שכבת צבע מעל
+        overlay = Image.new('RGBA', img.size, self.overlay_color)
+        img = img.convert('RGBA')
+        img = Image.alpha_composite(img, overlay)
         img = img.convert('RGB')
-        pixels = img.getcolors(100*100)
-        if not pixels:
-            pixels = img.getdata()
-            pixels = list(pixels)
-            pixels = Counter(pixels).most_common(num_colors)
-        else:
-            pixels = sorted(pixels, key=lambda x: x[0], reverse=True)
-            pixels = pixels[:num_colors]
-        main_colors = [color for count, color in pixels]
-        return main_colors
-
-
-def get_contrasting_color(rgb):
-    """
-    מחשב צבע מנוגד לצבע נתון על בסיס לומיננסיה.
-    :param rgb: tuple של (R, G, B)
-    :return: tuple של הצבע המנוגד (R, G, B)
-    """
-    # חשב את לומיננסיית הצבע
-    r, g, b = rgb
-    luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
-
-    # אם הלומיננסיה גבוהה, בחר צבע כהה, אחרת בחר צבע בהיר
-    if luminance > 0.5:
-        return (0, 0, 0)  # שחור
-    else:
-        return (255, 255, 255)  # לבן
-
-
-def get_diverse_contrasting_color(rgb):
-    """
-    מחשב צבע מנוגד מגוון לצבע נתון על בסיס לומיננסיה וחילוף גוונים.
-    :param rgb: tuple של (R, G, B)
-    :return: tuple של הצבע המנוגד והמעודן (R, G, B)
-    """
-    # חשב את לומיננסיית הצבע
-    r, g, b = rgb
-    luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
-
-    # המרה מ-RGB ל-HSL
-    h, l, s = colorsys.rgb_to_hls(r/255, g/255, b/255)
-
-    # הוספת שינוי לגוון כדי ליצור גיוון בצבעים המנוגדים
-    h_new = (h + 0.5) % 1.0  # הוספת 180 מעלות בגוון
-
-    # הגברת הסאטורציה כדי לשמור על צבעוניות
-    s_new = min(s * 1.2, 1.0)
-
-    # התאמת הלומיננסיה
-    if luminance > 0.5:
-        l_new = 0.2  # צבע כהה
-    else:
-        l_new = 0.8  # צבע בהיר
-
-    # המרה חזרה ל-RGB
-    r_new, g_new, b_new = colorsys.hls_to_rgb(h_new, l_new, s_new)
-    return (int(r_new * 255), int(g_new * 255), int(b_new * 255))
-
-
-class FileManager:
-    def __init__(self, output_dir, thumbnails_dir):
-        self.output_dir = output_dir
-        self.thumbnails_dir = thumbnails_dir
-        os.makedirs(self.output_dir, exist_ok=True)
-        os.makedirs(self.thumbnails_dir, exist_ok=True)
-        self.temp_dir = tempfile.TemporaryDirectory()
-
-    def get_temp_path(self, filename):
-        sanitized_filename = sanitize_filename(filename)
-        return os.path.join(self.temp_dir.name, sanitized_filename)
-
-    def cleanup(self):
-        self.temp_dir.cleanup()
-
+        logging.info("עיבוד רקע: הגברת בהירות, טשטוש ושכבת צבע נוספו")
+        return img
 
-class ImageCreator:
-    def __init__(self, styles):
-        self.styles = styles
-        self.cache = {}
-        self.overlay_color = (173, 216, 230, 150)  # תכלת עם שקיפות
-        self.brightness_factor = 1.2  # הגברת בהירות
-        self.blur_radius = 5  # רדיוס טשטוש
+    def processed_background_cache_path(self, background_image_path):
+        """
+        נתיב הקובץ השמור של הרקע המעובד. המפתח כולל את זמן השינוי של התמונה המקורית,
+        כך שעריכת הרקע יוצרת גרסה חדשה.
+        """
+        key = repr((
+            os.path.abspath(background_image_path),
+            os.path.getmtime(background_image_path),
+            self.brightness_factor,
+            self.blur_radius,
+            self.overlay_color,
+            (WIDTH, HEIGHT)
+        ))
+        return os.path.join(BACKGROUNDS_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.png')
+
+    def get_background(self, background_image_path, process_background=True):
+        """
+        מחזיר עותק של הרקע בגודל המסך, ואם process_background - אחרי הבהרה, טשטוש ושכבת צבע.
+        הרקע המעובד מחושב פעם אחת לכל (נתיב, בהירות, טשטוש, צבע שכבה, גודל) ונשמר בזיכרון ובדיסק.
+        """
+        if background_image_path and not os.path.exists(background_image_path):
+            background_image_path = None
+        params = (self.brightness_factor, self.blur_radius, self.overlay_color) if process_background else None
+        key = (background_image_path, params, (WIDTH, HEIGHT))
+
+        img = self.backgrounds.get(key)
+        if img is None:
+            cache_path = None
+            if process_background and background_image_path:
+                cache_path = self.processed_background_cache_path(background_image_path)
+                if os.path.exists(cache_path):
+                    img = Image.open(cache_path).convert("RGB")
+                    logging.info(f"שימוש ברקע מעובד שמור: {cache_path}")
+
+            if img is None:
+                img = self.load_background(background_image_path)
+                if process_background:
+                    img = self.process_background(img)
+                    if cache_path:
+                        os.makedirs(BACKGROUNDS_CACHE_DIR, exist_ok=True)
+                        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                        img.save(temp_path, "PNG")
+                        os.replace(temp_path, cache_path)
+
+            self.backgrounds[key] = img
+        return img.copy()
+
+    def layout_lines(self, text_lines, style_definitions, line_styles, draw):
+        """
+        שלב המדידה והגלישה של create_image: מחזיר את השורות המעובדות (לפי קטעים) והגובה הכולל.
+        """
+        processed_lines = []
+        total_height = 0
+        for i, line in enumerate(text_lines):
+            style_name = line_styles[i] if line_styles and i < len(line_styles) else 'normal'
+            current_style = style_definitions.get(style_name, style_definitions['normal'])
+            bold_style = style_definitions.get('bold', current_style)
+            font = current_style.font
 
-    @lru_cache(maxsize=None)
-    def get_font(self, font_path, font_size):
-        try:
-            font_full_path = os.path.join(FONTS_DIR, font_path)
-            return ImageFont.truetype(font_full_path, font_size)
-        except IOError:
-            logging.error(f"לא ניתן למצוא את הגופן בנתיב: {font_path}")
-            raise
-
-    def split_text_into_lines(self, text, font, max_width, draw):
-        words = text.split()
-        lines = []
-        current_line = ""
-
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            width = bbox[2] - bbox[0]
-            if width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
+            if is_hebrew(line):
+                # כאן מוסיפים את הפונקציה להסרת ניקוד
+                line = remove_niqqud(line)
 
-        if current_line:
-            lines.append(current_line)
+            split_lines = self.split_text_into_lines(line, font, MAX_TEXT_WIDTH, draw)
+            for split_line in split_lines:
+                processed_line = process_hebrew_text(split_line) if is_hebrew(line) else split_line
+                segments = self.parse_bold(processed_line)
+                line_info = []
+                line_height = 0
+                for segment_text, is_bold in segments:
+                    segment_style = bold_style if is_bold else current_style
+                    bbox = draw.textbbox((0, 0), segment_text, font=segment_style.font)
+                    width = bbox[2] - bbox[0]
+                    height = bbox[3] - bbox[1]
+                    line_info.append((segment_text, width, height, segment_style.font, segment_style.text_color))
+                    if height > line_height:
+                        line_height = height
+                processed_lines.append((line_info, line_height, current_style))
+                total_height += line_height + current_style.line_spacing
 
-        return lines
+        if processed_lines:
+            total_height -= current_style.line_spacing  # הסרת רווח נוסף בסוף
 
-    def parse_bold(self, text):
-        parts = re.split(r'(\*\*[^*]+\*\*)', text)
-        segments = []
-        for part in parts:
-            if part.startswith('**') and part.endswith('**'):
-                segments.append((part[2:-2], True))
-            else:
-                segments.append((part, False))
-        return segments
+        return processed_lines, total_height
 
     def create_image(self, text_lines, style_definitions, line_styles=None,
                      background_image_path=None, process_background=True, highlight_option=None):
@@ -269,102 +255,23 @@ class ImageCreator:
             return self.cache[cache_key]
 
         # יצירת רקע
-        if background_image_path and os.path.exists(background_image_path):
-            try:
-                img = Image.open(background_image_path).convert("RGB")
-                img = img.resize((WIDTH, HEIGHT), RESAMPLING)
-                logging.info(f"שימש רקע מהתמונה: {background_image_path}")
-            except Exception as e:
-                logging.error(f"שגיאה בטעינת תמונת הרקע: {e}")
-                img = Image.new('RGB', (WIDTH, HEIGHT), color=(255, 255, 255))
-        else:
-            img = Image.new('RGB', (WIDTH, HEIGHT), color=(255, 255, 255))
-
-        if process_background:
-            # הגברת בהירות
-            enhancer = ImageEnhance.Brightness(img)
-            img = enhancer.enhance(self.brightness_factor)
-
-            # טשטוש
-            img = img.filter(ImageFilter.GaussianBlur(radius=self.blur_radius))
-
-            # הוספת שכבת צבע מעל
-            overlay = Image.new('RGBA', img.size, self.overlay_color)
-            img = img.convert('RGBA')
-            img = Image.alpha_composite(img, overlay)
-            img = img.convert('RGB')
-            logging.info("עיבוד רקע: הגברת בהירות, טשטוש ושכבת צבע נוספו")
+        img = self.get_background(background_image_path, process_background)
 
         draw = ImageDraw.Draw(img)
+        processed_lines, total_height = self.fit_layout(text_lines, style_definitions, line_styles, draw)
+        # סגנון המסגרת והריווח של השקופית
+        current_style = processed_lines[-1][2] if processed_lines else style_definitions['normal']
 
-        MAX_TEXT_WIDTH = WIDTH - 200
-
-        processed_lines = []
-        total_height = 0
-        for i, line in enumerate(text_lines):
-            style_name = line_styles[i] if line_styles and i < len(line_styles) else 'normal'
-            current_style = style_definitions.get(style_name, style_definitions['normal'])
-            font = self.get_font(current_style['font_path'], current_style['font_size'])
-
-            if is_hebrew(line):
-                # כאן מוסיפים את הפונקציה להסרת ניקוד
-                line = remove_niqqud(line)
-
-                split_lines = self.split_text_into_lines(line, font, MAX_TEXT_WIDTH, draw)
-                for split_line in split_lines:
-                    processed_line = process_hebrew_text(split_line)
-                    segments = self.parse_bold(processed_line)
-                    line_info = []
-                    line_height = 0
-                    for segment_text, is_bold in segments:
-                        segment_style = current_style.copy()
-                        if is_bold:
-                            segment_style = style_definitions.get('bold', current_style)
-                            segment_font = self.get_font(segment_style['font_path'], segment_style['font_size'])
-                        else:
-                            segment_font = font
-                        bbox = draw.textbbox((0, 0), segment_text, font=segment_font)
-                        width = bbox[2] - bbox[0]
-                        height = bbox[3] - bbox[1]
-                        line_info.append((segment_text, width, height, segment_font, tuple(segment_style['text_color'])))
-                        if height > line_height:
-                            line_height = height
-                    processed_lines.append((line_info, line_height))
-                    total_height += line_height + LINE_SPACING_NORMAL
-            else:
-                split_lines = self.split_text_into_lines(line, font, MAX_TEXT_WIDTH, draw)
-                for split_line in split_lines:
-                    segments = self.parse_bold(split_line)
-                    line_info = []
-                    line_height = 0
-                    for segment_text, is_bold in segments:
-                        segment_style = current_style.copy()
-                        if is_bold:
-                            segment_style = style_definitions.get('bold', current_style)
-                            segment_font = self.get_font(segment_style['font_path'], segment_style['font_size'])
-                        else:
-                            segment_font = font
-                        bbox = draw.textbbox((0, 0), segment_text, font=segment_font)
-                        width = bbox[2] - bbox[0]
-                        height = bbox[3] - bbox[1]
-                        line_info.append((segment_text, width, height, segment_font, tuple(segment_style['text_color'])))
-                        if height > line_height:
-                            line_height = height
-                    processed_lines.append((line_info, line_height))
-                    total_height += line_height + LINE_SPACING_NORMAL
-
-        if processed_lines:
-            total_height -= LINE_SPACING_NORMAL  # הסרת רווח נוסף בסוף
         current_y = (HEIGHT - total_height) / 2
 
-        for line_idx, (line_info, line_height) in enumerate(processed_lines):
+        for line_idx, (line_info, line_height, _) in enumerate(processed_lines):
             line_width = sum([segment[1] for segment in line_info])
             x_text = (WIDTH - line_width) / 2
             for segment_idx, (segment_text, width, height, segment_font, segment_color) in enumerate(line_info):
                 # ציור המסגרת אם קיים
-                if 'outline_color' in current_style and 'outline_width' in current_style:
-                    outline_color = tuple(current_style['outline_color'])
-                    outline_width = current_style['outline_width']
+                if current_style.has_outline:
+                    outline_color = current_style.outline_color
+                    outline_width = current_style.outline_width
                     # ציור מסגרת בטקסט על ידי ציור הטקסט עם הזזות
                     for dx in range(-outline_width, outline_width + 1):
                         for dy in range(-outline_width, outline_width + 1):
@@ -394,17 +301,25 @@ class ImageCreator:
                             fill=HIGHLIGHT_COLOR_CORRECT
                         )
                         
-                        # אחר כך מוסיפים את אפקט הזוהר
-                        glow = Image.new('RGBA', img.size, (0, 0, 0, 0))
+                        # אחר כך מוסיפים את אפקט הזוהר - רק באזור הטקסט המרופד, לא על כל המסך
+                        glow_margin = 3 * GLOW_RADIUS
+                        glow_box = (
+                            max(0, int(text_bbox[0]) - glow_margin),
+                            max(0, int(text_bbox[1]) - glow_margin),
+                            min(img.width, int(text_bbox[2]) + glow_margin + 1),
+                            min(img.height, int(text_bbox[3]) + glow_margin + 1)
+                        )
+                        glow = Image.new('RGBA', (glow_box[2] - glow_box[0], glow_box[3] - glow_box[1]), (0, 0, 0, 0))
                         glow_draw = ImageDraw.Draw(glow)
                         glow_draw.text(
-                            (x_text, current_y + (line_height - height) / 2),
+                            (x_text - glow_box[0], current_y + (line_height - height) / 2 - glow_box[1]),
                             segment_text,
                             font=segment_font,
                             fill=GLOW_COLOR
                         )
-                        glow = glow.filter(ImageFilter.GaussianBlur(radius=10))
-                        img = Image.alpha_composite(img.convert('RGBA'), glow)
+                        glow = glow.filter(ImageFilter.GaussianBlur(radius=GLOW_RADIUS))
+                        img = img.convert('RGBA')
+                        img.paste(Image.alpha_composite(img.crop(glow_box), glow), glow_box[:2])
                         draw = ImageDraw.Draw(img)
                 draw.text(
                     (x_text, current_y + (line_height - height) / 2),
@@ -413,107 +328,36 @@ class ImageCreator:
                     fill=segment_color
                 )
                 x_text += width
-            current_y += line_height + LINE_SPACING_NORMAL
+            current_y += line_height + current_style.line_spacing
 
         img = img.convert("RGB")
         self.cache[cache_key] = img
         return img
 
 
-def remove_asterisks(text):
-    return text.replace("**", "")
-
-
-class AudioCreator:
+class AudioCreator(audio_creator.AudioCreator):
+    """
+    קולות פרימיום Wavenet קבועים לסיפורים:
+     - עברית: he-IL-Wavenet-C
+     - אנגלית: en-US-Wavenet-F
+    """
     def __init__(self, temp_dir):
-        self.temp_dir = temp_dir
-        self.executor = ThreadPoolExecutor(max_workers=THREADS)
-        self.client = texttospeech.TextToSpeechClient()
-
-    def create_audio_task(self, text, lang, slow=False):
-        """
-        יוצר קובץ אודיו באמצעות Google Cloud Text-to-Speech.
-        משתמש בקולות פרימיום Wavenet:
-         - עברית: he-IL-Wavenet-C
-         - אנגלית: en-US-Wavenet-F
-
-        פרמטר "slow" משנה את מהירות הדיבור (speaking_rate).
-        """
-        try:
-            clean_text = remove_asterisks(text)
+        super().__init__(temp_dir, None, THREADS)
 
-            # הגדרת שפה וקול לפי lang
-            if lang.startswith('he') or lang.startswith('iw'):
-                language_code = 'he-IL'
-                voice_name = 'he-IL-Wavenet-C'
-            else:
-                # ברירת המחדל: אנגלית
-                language_code = 'en-US'
-                voice_name = 'en-US-Wavenet-F'
-
-            # הגדרת בקשת הדיבור
-            synthesis_input = texttospeech.SynthesisInput(text=clean_text)
-            voice_params = texttospeech.VoiceSelectionParams(
-                language_code=language_code,
-                name=voice_name,
-                # אפשר להגדיר מגדר אם רוצים:
-                # ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-            )
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
-                speaking_rate=0.70 if slow else 0.95  # מהירות דיבור נמוכה/רגילה
-            )
+    def clean_text(self, text):
+        return remove_asterisks(text)
 
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice_params,
-                audio_config=audio_config
-            )
+    def voice_for(self, lang):
+        # הגדרת שפה וקול לפי lang
+        if lang.startswith('he') or lang.startswith('iw'):
+            return 'he-IL', 'he-IL-Wavenet-C'
+        # ברירת המחדל: אנגלית
+        return 'en-US', 'en-US-Wavenet-F'
 
-            # שמירה לקובץ זמני
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3', dir=self.temp_dir.name) as tmp_file:
-                tmp_file.write(response.audio_content)
-                return tmp_file.name
-
-        except ValueError as e:
-            logging.error(f"שגיאה ביצירת אודיו עבור הטקסט: '{text}' בשפה: '{lang}'. פרטים: {e}")
-            raise
-
-    def create_audios(self, tasks):
-        futures = {}
-        for task in tasks:
-            if len(task) == 3:
-                text, lang, slow = task
-                future = self.executor.submit(self.create_audio_task, text, lang, slow)
-            else:
-                text, lang = task
-                future = self.executor.submit(self.create_audio_task, text, lang, False)
-            futures[future] = task
 
-        results = {}
-        for future in as_completed(futures):
-            task = futures[future]
-            try:
-                audio_path = future.result()
-                results[tuple(task)] = audio_path
-                logging.info(
-                    f"אודיו נוצר עבור: '{task[0]}' בשפה: '{task[1]}' "
-                    f"עם slow={'True' if len(task) == 3 and task[2] else 'False'}"
-                )
-            except Exception as e:
-                logging.error(f"שגיאה ביצירת אודיו עבור: '{task[0]}' בשפה: '{task[1]}'. פרטים: {e}")
-        return results
-
-    def shutdown(self):
-        self.executor.shutdown(wait=True)
-
-
-class VideoCreator:
-    def __init__(self, file_manager, image_creator, audio_creator, style_definitions):
-        self.file_manager = file_manager
-        self.image_creator = image_creator
-        self.audio_creator = audio_creator
-        self.style_definitions = style_definitions
+class VideoCreator(BaseVideoCreator):
+    video_size = VIDEO_SIZE
+    transition_directions = ('up', 'down')  # מעברים אנכיים בלבד
 
     def create_image_clip(self, text_lines, style, line_styles=None,
                           background_image_path=None, process_background=True, highlight_option=None):
@@ -525,123 +369,31 @@ class VideoCreator:
             process_background,
             highlight_option
         )
-        filename = f"{'_'.join([sanitize_filename(line) for line in text_lines])}.png"
-        temp_image_path = self.file_manager.get_temp_path(filename)
-        img.save(temp_image_path)
-        image_clip = ImageClip(temp_image_path).set_duration(5 if highlight_option is None else 1)
-        return image_clip
-
-    def create_audio_clips(self, audio_paths):
-        audio_clips = []
-        for path in audio_paths:
-            if os.path.exists(path):
-                audio_clip = AudioFileClip(path)
-                audio_clips.append(audio_clip)
-            else:
-                logging.warning(f"אודיו לא נמצא בנתיב: {path}")
-        if audio_clips:
-            return concatenate_audioclips(audio_clips)
-        else:
-            return None
-
-    def create_clip(self, image_clip, audio_paths, min_duration=0, repeat_english=False):
-        audio_clips = []
-        if repeat_english:
-            # אם צריך לחזור על האנגלית, נוסיף אותה קודם, אחר כך עברית, ואז אנגלית שוב
-            english_path = audio_paths[0]  # נתיב לקובץ האודיו באנגלית
-            hebrew_path = audio_paths[1]  # נתיב לקובץ האודיו בעברית
-
-            if os.path.exists(english_path):
-                audio_clips.append(AudioFileClip(english_path))
-            else:
-                logging.warning(f"אודיו באנגלית לא נמצא בנתיב: {english_path}")
-
-            if os.path.exists(hebrew_path):
-                audio_clips.append(AudioFileClip(hebrew_path))
-            else:
-                logging.warning(f"אודיו בעברית לא נמצא בנתיב: {hebrew_path}")
-
-            if os.path.exists(english_path):  # מוסיף שוב את המילה באנגלית
-                audio_clips.append(AudioFileClip(english_path))
-            else:
-                logging.warning(f"אודיו באנגלית לא נמצא בנתיב: {english_path}")
-
-        else:
-            # אם לא צריך לחזור על האנגלית, נוסיף את הקליפים כרגיל
-            for path in audio_paths:
-                if os.path.exists(path):
-                    audio_clips.append(AudioFileClip(path))
-                else:
-                    logging.warning(f"אודיו לא נמצא בנתיב: {path}")
-
-        if audio_clips:
-            audio_total = concatenate_audioclips(audio_clips)
-            duration = max(audio_total.duration, min_duration)
-            image_clip = image_clip.set_duration(duration)
-            image_clip = image_clip.set_audio(audio_total)
-        else:
-            image_clip = image_clip.set_duration(min_duration)
-
-        return image_clip
-
-    def slide_transition(self, clip1, clip2, duration=1):
-        # בחר כיוון מלמעלה למטה או מלמטה למעלה
-        direction = random.choice(['down', 'up'])
-
-        if direction == 'down':
-            move_out = lambda t: ('center', -VIDEO_SIZE[1] * t / duration)
-            move_in = lambda t: ('center', VIDEO_SIZE[1] - VIDEO_SIZE[1] * t / duration)
-        elif direction == 'up':
-            move_out = lambda t: ('center', VIDEO_SIZE[1] * t / duration)
-            move_in = lambda t: ('center', -VIDEO_SIZE[1] + VIDEO_SIZE[1] * t / duration)
-
-        clip1_moving = clip1.set_position(move_out).set_duration(duration)
-        clip2_moving = clip2.set_position(move_in).set_duration(duration)
-
-        transition = CompositeVideoClip([clip1_moving, clip2_moving], size=VIDEO_SIZE).set_duration(duration)
-        transition = transition.set_audio(None)
-        return transition
+        return self.save_image_clip(img, text_lines).set_duration(5 if highlight_option is None else 1)
 
     def add_logo_clip(self, duration=5, background_image_path=None):
         try:
             if background_image_path and os.path.exists(background_image_path):
                 try:
-                    background = Image.open(background_image_path).convert("RGB")
-                    background = background.resize((WIDTH, HEIGHT), RESAMPLING)
+                    background = load_scaled(background_image_path, (WIDTH, HEIGHT))
                     logging.info(f"שימש רקע מהתמונה: {background_image_path} עבור הלוגו")
                 except Exception as e:
                     logging.error(f"שגיאה בטעינת תמונת הרקע עבור הלוגו: {e}")
                     background = Image.new('RGB', (WIDTH, HEIGHT), color=(173, 216, 230))
             else:
                 logo_style = self.style_definitions.get('logo', None)
-                if logo_style and 'bg_color' in logo_style:
-                    bg_color = tuple(logo_style['bg_color'])
+                if logo_style and logo_style.bg_color is not None:
+                    bg_color = logo_style.bg_color
                 else:
                     bg_color = (173, 216, 230)
                 background = Image.new('RGB', (WIDTH, HEIGHT), color=bg_color)
 
-            logo_image = Image.open(LOGO_PATH).convert("RGBA")
-            size = min(logo_image.size)
-            mask = Image.new('L', (size, size), 0)
-            draw = ImageDraw.Draw(mask)
-            draw.ellipse((0, 0, size, size), fill=255)
-
-            logo_image = logo_image.crop((0, 0, size, size))
-            logo_image.putalpha(mask)
-
-            logo_style = self.style_definitions.get('logo', {})
-            border_color = tuple(logo_style.get('border_color', [255, 255, 255]))
-            border_width = logo_style.get('border_width', 10)
-
-            bordered_size = (size + 2 * border_width, size + 2 * border_width)
-            bordered_logo = Image.new('RGBA', bordered_size, (0, 0, 0, 0))
-            bordered_logo_draw = ImageDraw.Draw(bordered_logo)
-            bordered_logo_draw.ellipse((0, 0, bordered_size[0], bordered_size[1]), fill=border_color)
-
-            bordered_logo.paste(logo_image, (border_width, border_width), logo_image)
+            logo_style = self.style_definitions.get('logo', None)
+            border_color = logo_style.border_color if logo_style and logo_style.border_color is not None else (255, 255, 255)
+            border_width = logo_style.border_width if logo_style and logo_style.border_width is not None else 10
 
             new_size = int(HEIGHT * 0.3)  # 30% מגובה המסך
-            bordered_logo = bordered_logo.resize((new_size, new_size), RESAMPLING)
+            bordered_logo = load_round_logo(LOGO_PATH, new_size, border_color, border_width)
 
             logo_position = ((WIDTH - new_size) // 2, (HEIGHT - new_size) // 2)
             background.paste(bordered_logo, logo_position, bordered_logo)
@@ -655,99 +407,6 @@ class VideoCreator:
             logging.error(f"שגיאה ביצירת קליפ הלוגו: {e}")
             return None
 
-    def create_intro_clip(self, title, language_level, story_type, background_image_path):
-        try:
-            # סדר השורות: כותרת, רמת שפה וסוג הסיפור בשורה אחת
-            intro_details = f"{language_level} | {story_type}"
-            text_lines_intro = [title, intro_details]
-            line_styles_intro = ['intro_title', 'intro_details']
-
-            clip_intro = self.create_image_clip(
-                text_lines_intro,
-                'intro_title',
-                line_styles_intro,
-                background_image_path,
-                process_background=False
-            )
-
-            # יצירת אודיו לכותרת ורמת שפה + סוג הסיפור
-            audio_tasks = [
-                (title, 'iw'),
-                (intro_details, 'iw')
-            ]
-            audio_results = self.audio_creator.create_audios(audio_tasks)
-
-            clip_intro = self.create_clip(
-                clip_intro,
-                [
-                    audio_results.get((title, 'iw'), ""),
-                    audio_results.get((intro_details, 'iw'), "")
-                ],
-                min_duration=5
-            )
-            return clip_intro
-        except Exception as e:
-            logging.error(f"שגיאה ביצירת קליפ הפתיחה: {e}")
-            return None
-
-    def create_outro(self, call_to_action, background_image_path):
-        try:
-            text_lines_outro = [
-                call_to_action
-            ]
-            line_styles_outro = ['call_to_action']
-
-            clip_outro = self.create_image_clip(
-                text_lines_outro,
-                'call_to_action',
-                line_styles_outro,
-                background_image_path,
-                process_background=False
-            )
-
-            # יצירת אודיו לקריאה לפעולה
-            audio_tasks = [
-                (call_to_action, 'iw')
-            ]
-            audio_results = self.audio_creator.create_audios(audio_tasks)
-            clip_outro = self.create_clip(
-                clip_outro,
-                [
-                    audio_results.get((call_to_action, 'iw'), "")
-                ],
-                min_duration=4
-            )
-            return clip_outro
-        except Exception as e:
-            logging.error(f"שגיאה ביצירת קליפ הסיום: {e}")
-            return None
-
-    def create_story_segment(self, text, style_name, background_image_path, duration=3):
-        """
-        יוצר קליפ עבור קטע "הסיפור" או "הסוף".
-        """
-        text_lines = [text]
-        line_styles = [style_name]
-        clip = self.create_image_clip(
-            text_lines,
-            style_name,
-            line_styles,
-            background_image_path,
-            process_background=True
-        )
-        audio_tasks = [
-            (text, 'iw')  # הנחה שהטקסט בעברית
-        ]
-        audio_results = self.audio_creator.create_audios(audio_tasks)
-        clip = self.create_clip(
-            clip,
-            [
-                audio_results.get((text, 'iw'), "")
-            ],
-            min_duration=duration
-        )
-        return clip
-
     def calculate_pause_duration(self, text, seconds_per_word=0.6):
         """
         מחשבת את משך ההשהייה על פי מספר המילים בטקסט.
@@ -756,72 +415,37 @@ class VideoCreator:
         duration = word_count * seconds_per_word
         return duration
 
-    def assemble_video_with_pause(self, text, hebrew_text, background_image_path):
-        """
-        יוצר את הקליפ באנגלית, מרחיב את משך ההשהייה בהתאם לטקסט, ומוסיף את הקליפ בעברית.
-        """
-        clips = []
-
-        # קליפ באנגלית (עם slow=True)
-        text_lines_en = [text]
-        line_styles_en = ['sentence']
-        clip_story_en = self.create_image_clip(
-            text_lines_en,
-            'sentence',
-            line_styles_en,
-            background_image_path,
-            process_background=True
-        )
-        audio_tasks_en = [
-            (text, 'en', True)  # אנגלית באיטיות
-        ]
-        audio_results_en = self.audio_creator.create_audios(audio_tasks_en)
-        clip_story_en = self.create_clip(
-            clip_story_en,
-            [
-                audio_results_en.get((text, 'en', True), "")
-            ],
-            min_duration=5
-        )
-        clips.append(clip_story_en)
-
-        # חישוב משך ההשהייה
-        pause_duration = self.calculate_pause_duration(text)
-        # הרחבת משך הקליפ
-        extended_duration = clip_story_en.duration + pause_duration
-        clip_story_en = clip_story_en.set_duration(extended_duration)
-        clips[-1] = clip_story_en
-
-        # קליפ בעברית
-        text_lines_he = [hebrew_text]
-        line_styles_he = ['translation']
-        clip_story_he = self.create_image_clip(
-            text_lines_he,
-            'translation',
-            line_styles_he,
-            background_image_path,
-            process_background=True
-        )
-        audio_tasks_he = [
-            (hebrew_text, 'iw')
-        ]
-        audio_results_he = self.audio_creator.create_audios(audio_tasks_he)
-        clip_story_he = self.create_clip(
-            clip_story_he,
-            [
-                audio_results_he.get((hebrew_text, 'iw'), "")
-            ],
-            min_duration=5
+class StoryClipRenderer(ClipRenderer):
+    """
+    רנדרר הסיפורים: כל השקופיות על רקע הסיפור, והמקטע האחרון הוא קליף הלוגו.
+    """
+    def __init__(self, video_creator, background_image_path):
+        super().__init__(video_creator)
+        self.background_image_path = background_image_path
+
+    def image_clip(self, segment):
+        if segment.kind == 'logo':
+            return self.video_creator.add_logo_clip(
+                duration=segment.min_duration,
+                background_image_path=self.background_image_path
+            )
+        return self.video_creator.create_image_clip(
+            list(segment.text_lines),
+            segment.kind,
+            list(segment.line_styles),
+            self.background_image_path,
+            process_background=segment.kind not in ('intro_title', 'call_to_action'),
+            highlight_option=segment.highlight
         )
-        clips.append(clip_story_he)
-
-        return clips
 
 
 class VideoAssembler:
     def __init__(self, file_manager, image_creator, audio_creator, style_definitions):
         self.video_creator = VideoCreator(file_manager, image_creator, audio_creator, style_definitions)
         self.style_definitions = style_definitions
+        self.palette_index = PaletteIndex()
+        self.background_styles = {}
+        self.render_stats = RenderStats()
 
     def determine_background_image_path(self, title):
         background_image_filename = f"{sanitize_filename(title)}.png"
@@ -833,48 +457,131 @@ class VideoAssembler:
             background_image_path = None
         return background_image_path
 
-    def update_style_definitions_with_contrasting_colors(self, background_image_path):
+    def styles_for_background(self, background_image_path):
         """
-        מעדכן את style_definitions עם הצבעים המנוגדים שנמצאו מתמונת הרקע.
+        מחזיר סט סגנונות לסרטון, עם צבעים מנוגדים לפי תמונת הרקע מתוך אינדקס הצבעים.
+        סט הבסיס אינו משתנה; כל רקע מקבל מילון משלו שנשמר במטמון.
         """
         if not background_image_path or not os.path.exists(background_image_path):
-            logging.info("לא נמצאה תמונת רקע. לא מעדכנים צבעים מנוגדים.")
-            return
-
-        main_colors = extract_main_colors(background_image_path, num_colors=2)
-        if not main_colors:
-            logging.warning("לא נמצאו צבעים בתמונת הרקע. לא מעדכנים צבעים מנוגדים.")
-            return
-
-        dominant_color = main_colors[0]
-        contrasting_color = get_diverse_contrasting_color(dominant_color)
-        logging.info(f"צבע עיקרי: {dominant_color}, צבע מנוגד מגוון: {contrasting_color}")
-
-        if 'intro_title' in self.style_definitions:
-            self.style_definitions['intro_title']['text_color'] = list(contrasting_color)
+            logging.info("לא נמצאה תמונת רקע. משתמשים בצבעי ברירת המחדל.")
+            return self.style_definitions
+
+        if background_image_path in self.background_styles:
+            return self.background_styles[background_image_path]
+
+        palette = self.palette_index.lookup(background_image_path)
+        self.palette_index.save()
+        styles = dict(self.style_definitions)
+        if not palette['dominant']:
+            logging.warning("לא נמצאו צבעים בתמונת הרקע. משתמשים בצבעי ברירת המחדל.")
+            self.background_styles[background_image_path] = styles
+            return styles
+
+        contrasting_color = palette['contrasting']
+        contrasting_color2 = palette['contrasting_secondary']
+        logging.info(f"צבע עיקרי: {palette['dominant']}, צבע מנוגד מגוון: {contrasting_color}")
+        logging.info(f"צבע שני: {palette['secondary']}, צבע מנוגד מגוון שני: {contrasting_color2}")
+
+        if 'intro_title' in styles:
             outline_color_intro = get_contrasting_color(contrasting_color)
-            self.style_definitions['intro_title']['outline_color'] = list(outline_color_intro)
+            styles['intro_title'] = styles['intro_title'].with_colors(
+                text_color=contrasting_color,
+                outline_color=outline_color_intro
+            )
             logging.debug(
-                f"עדכון סגנון 'intro_title' עם צבע טקסט: {contrasting_color} וצבע מסגרת: {outline_color_intro}"
+                f"סגנון 'intro_title' עם צבע טקסט: {contrasting_color} וצבע מסגרת: {outline_color_intro}"
             )
 
-        if len(main_colors) > 1:
-            secondary_color = main_colors[1]
-            contrasting_color2 = get_diverse_contrasting_color(secondary_color)
-            logging.info(f"צבע שני: {secondary_color}, צבע מנוגד מגוון שני: {contrasting_color2}")
-        else:
-            contrasting_color2 = contrasting_color
-
-        if 'call_to_action' in self.style_definitions:
-            self.style_definitions['call_to_action']['text_color'] = list(
-                get_contrasting_color(contrasting_color2)
+        if 'call_to_action' in styles:
+            styles['call_to_action'] = styles['call_to_action'].with_colors(
+                text_color=get_contrasting_color(contrasting_color2),
+                outline_color=contrasting_color2
             )
-            self.style_definitions['call_to_action']['outline_color'] = list(contrasting_color2)
             logging.debug(
-                f"עדכון סגנון 'call_to_action' עם צבע טקסט: {get_contrasting_color(contrasting_color2)} "
+                f"סגנון 'call_to_action' עם צבע טקסט: {get_contrasting_color(contrasting_color2)} "
                 f"וצבע מסגרת: {contrasting_color2}"
             )
 
+        self.background_styles[background_image_path] = styles
+        return styles
+
+    def build_story_timeline(self, video_data):
+        """
+        ציר הזמן של סיפור: הרצף, ההשהיות והמעברים שמהם נבנים הרינדור, בדיקת הפריסה וההערכה.
+        """
+        video_title = remove_niqqud(video_data['video_title'])
+        story = video_data['story']
+        intro_details = f"{video_data['language_level']} | {video_data['story_type']}"
+
+        def narrated(kind, label, text, min_duration, **rule):
+            return Segment(kind, f"{video_title} / {label}", (text,), (kind,), 'en', ((text, 'iw'),),
+                           min_duration=min_duration, **rule)
+
+        timeline = Timeline(video_title)
+        timeline = timeline.append(Segment(
+            'intro_title', f"{video_title} / intro", (video_title, intro_details), ('intro_title', 'intro_details'), 'en',
+            ((video_title, 'iw'), (intro_details, 'iw')), min_duration=5
+        ))
+
+        if story['text']:
+            timeline = timeline.append(narrated('story_intro', "story_intro", STORY_INTRO_TEXT, 3, hold=2, transition='slide'))
+            timeline = timeline.append(narrated('story_start', "story_start", STORY_START_TEXT, 3, transition='slide'))
+            for idx, paragraph in enumerate(story['text']):
+                english_text = paragraph['english']
+                timeline = timeline.append(Segment(
+                    'sentence', f"{video_title} / story #{idx + 1}", (english_text,), ('sentence',), 'en',
+                    ((english_text, 'en', True),), min_duration=5,
+                    hold=self.video_creator.calculate_pause_duration(english_text)
+                ))
+                timeline = timeline.append(Segment(
+                    'translation', f"{video_title} / story #{idx + 1} (he)", (paragraph['hebrew'],), ('translation',), 'en',
+                    ((paragraph['hebrew'], 'iw'),), min_duration=5
+                ))
+            timeline = timeline.append(narrated('story_end', "story_end", STORY_END_TEXT, 3, transition='slide'))
+
+        vocabulary = video_data.get('vocabulary', [])
+        if vocabulary:
+            timeline = timeline.append(narrated('subtopic', "vocabulary", VOCAB_INTRO_TEXT, 3, transition='slide'))
+            for word_entry in vocabulary:
+                word = word_entry['word']
+                timeline = timeline.append(Segment(
+                    'word', f"{video_title} / {word}", (word, word_entry['translation']), ('word', 'translation'), 'en',
+                    ((word, 'en', True), (word_entry['translation'], 'iw'), (word, 'en', True)), min_duration=4, hold=1
+                ))
+
+        comprehension_questions = video_data.get('comprehension_questions', [])
+        if comprehension_questions:
+            timeline = timeline.append(narrated('subtopic', "questions", QUESTIONS_INTRO_TEXT, 3, transition='slide'))
+            for idx, question_entry in enumerate(comprehension_questions):
+                options = question_entry['options']
+                text_lines = (question_entry['question'], *options)
+                line_styles = ('question',) + ('translation',) * len(options)
+                timeline = timeline.append(Segment(
+                    'question', f"{video_title} / question #{idx + 1}", text_lines, line_styles, 'en',
+                    tuple((text, 'iw') for text in text_lines), min_duration=5, hold=3
+                ))
+                timeline = timeline.append(Segment(
+                    'question', f"{video_title} / answer #{idx + 1}", text_lines, line_styles, 'en',
+                    (("התשובה הנכונה היא", 'iw'), (options[question_entry['answer']], 'iw')), min_duration=3, hold=3,
+                    highlight=(1 + question_entry['answer'], 0)  # שורה 1 + אינדקס התשובה, קטע 0
+                ))
+
+        call_to_action = video_data.get('call_to_action', {}).get('text', '')
+        if call_to_action:
+            timeline = timeline.append(narrated('call_to_action', "call_to_action", call_to_action, 4, transition='slide'))
+        timeline = timeline.append(narrated('subtopic', "outro", LOGO_INTRO_TEXT, 3, transition='slide'))
+        return timeline.append(Segment('logo', f"{video_title} / logo", (), (), 'en', min_duration=5, transition='slide'))
+
+    def iter_layout_slides(self, data):
+        """
+        מחזיר את כל השקופיות של הסיפורים כ-(תיאור, text_lines, line_styles), לפי ציר הזמן של assemble_videos.
+        """
+        videos = [data] if isinstance(data, dict) else data
+        for video_data in videos:
+            for segment in self.build_story_timeline(video_data).segments:
+                if segment.text_lines:
+                    yield segment.label, list(segment.text_lines), list(segment.line_styles)
+
     def assemble_videos(self, data, output_dir, thumbnails_dir):
         if isinstance(data, dict):
             videos = [data]
@@ -889,13 +596,6 @@ class VideoAssembler:
             # הסרת ניקוד מכותרת הסרטון
             video_title = remove_niqqud(video_title)
 
-            language_level = video_data['language_level']
-            story_type = video_data['story_type']
-            story = video_data['story']
-            vocabulary = video_data.get('vocabulary', [])
-            comprehension_questions = video_data.get('comprehension_questions', [])
-            call_to_action = video_data.get('call_to_action', {}).get('text', '')
-
             logging.info(f"מעבד סרטון: {video_title}")
 
             safe_title = sanitize_filename(video_title.replace(" ", "_"))
@@ -904,260 +604,22 @@ class VideoAssembler:
 
             background_image_path = self.determine_background_image_path(video_title)
 
-            # עדכון צבעים מנוגדים
-            self.update_style_definitions_with_contrasting_colors(background_image_path)
+            # סט סגנונות עם צבעים מנוגדים לרקע של הסרטון הנוכחי
+            self.video_creator.style_definitions = self.styles_for_background(background_image_path)
 
             clips = []
+            start_time = time.perf_counter()
 
             try:
-                # קליפ פתיחה
-                intro_clip = self.video_creator.create_intro_clip(
-                    video_title,
-                    language_level,
-                    story_type,
-                    background_image_path
-                )
-                if intro_clip:
-                    clips.append(intro_clip)
-
-                # מעבר לקטע הסיפור
-                if story['text']:
-                    story_intro = (
-                        "כְּדֵי לְהָפִיק אֶת הַמֵּיטָב מֵהַסִּרְטוֹן: "
-                        "הַאֲזִינוּ לְהַקְרָאַת הַמִּשְׁפָּט בְּאַנְגְּלִית, "
-                        "נַסּוּ לִקְרוֹא אוֹתוֹ בְּעַצְמְכֶם וּלְהָבִין אֶת הַמַּשְׁמָעוּת, "
-                        "וּלְאַחַר מִכֵּן צְפוּ בַּתַרְגּוּם לְעִבְרִית כְּדֵי לִבְדּוֹק אֶת עַצְמְכֶם!"
-                    )
-                    text_lines_intro_story = [story_intro]
-                    line_styles_intro_story = ['story_intro']
-                    clip_story_intro = self.video_creator.create_image_clip(
-                        text_lines_intro_story,
-                        'story_intro',
-                        line_styles_intro_story,
-                        background_image_path,
-                        process_background=True
-                    )
-                    audio_tasks = [(story_intro, 'iw')]
-                    audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                    clip_story_intro = self.video_creator.create_clip(
-                        clip_story_intro,
-                        [audio_results.get((story_intro, 'iw'), "")],
-                        min_duration=3
-                    )
-                    transition = self.video_creator.slide_transition(clips[-1], clip_story_intro)
-                    clips.append(transition)
-
-                    # הארכת הקליפ
-                    clip_story_intro = clip_story_intro.set_duration(clip_story_intro.duration + 2)
-                    clips.append(clip_story_intro)
-
-                    # כותרת "הסיפור"
-                    story_start_text = "הסיפור"
-                    clip_story_start = self.video_creator.create_story_segment(
-                        story_start_text,
-                        'story_start',
-                        background_image_path,
-                        duration=3
-                    )
-                    transition = self.video_creator.slide_transition(clips[-1], clip_story_start)
-                    clips.append(transition)
-                    clips.append(clip_story_start)
-
-                    # הצגת הסיפור
-                    for paragraph in story['text']:
-                        english_text = paragraph['english']
-                        hebrew_text = paragraph['hebrew']
-                        story_clips = self.video_creator.assemble_video_with_pause(
-                            english_text,
-                            hebrew_text,
-                            background_image_path
-                        )
-                        clips.extend(story_clips)
-
-                    # כותרת "הסוף"
-                    story_end_text = "הסוף"
-                    clip_story_end = self.video_creator.create_story_segment(
-                        story_end_text,
-                        'story_end',
-                        background_image_path,
-                        duration=3
-                    )
-                    transition = self.video_creator.slide_transition(clips[-1], clip_story_end)
-                    clips.append(transition)
-                    clips.append(clip_story_end)
-
-                # אוצר מילים
-                if vocabulary:
-                    vocab_intro = "מילים חדשות שלמדנו"
-                    text_lines_vocab_intro = [vocab_intro]
-                    line_styles_vocab_intro = ['subtopic']
-                    clip_vocab_intro = self.video_creator.create_image_clip(
-                        text_lines_vocab_intro,
-                        'subtopic',
-                        line_styles_vocab_intro,
-                        background_image_path,
-                        process_background=True
-                    )
-                    audio_tasks = [(vocab_intro, 'iw')]
-                    audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                    clip_vocab_intro = self.video_creator.create_clip(
-                        clip_vocab_intro,
-                        [audio_results.get((vocab_intro, 'iw'), "")],
-                        min_duration=3
-                    )
-                    transition = self.video_creator.slide_transition(clips[-1], clip_vocab_intro)
-                    clips.append(transition)
-                    clips.append(clip_vocab_intro)
-
-                    for word_entry in vocabulary:
-                        word = word_entry['word']
-                        translation = word_entry['translation']
-                        text_lines = [word, translation]
-                        line_styles = ['word', 'translation']
-                        clip_word = self.video_creator.create_image_clip(
-                            text_lines,
-                            'word',
-                            line_styles,
-                            background_image_path,
-                            process_background=True
-                        )
-                        audio_tasks = [
-                            (word, 'en', True),
-                            (translation, 'iw')
-                        ]
-                        audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                        audio_paths = [
-                            audio_results.get((word, 'en', True), ""),
-                            audio_results.get((translation, 'iw'), "")
-                        ]
-
-                        clip_word = self.video_creator.create_clip(
-                            clip_word,
-                            audio_paths,
-                            min_duration=4,
-                            repeat_english=True
-                        )
+                timeline = self.build_story_timeline(video_data)
+                logging.info(f"ציר הזמן של {video_title}: {len(timeline.segments)} מקטעים, {len(timeline.audio_tasks())} משימות TTS")
 
-                        # הארכת הקליפ בשנייה
-                        clip_word = clip_word.set_duration(clip_word.duration + 1)
-                        clips.append(clip_word)
-
-                # שאלות הבנה
-                if comprehension_questions:
-                    questions_intro = "בחנו את עצמכם"
-                    text_lines_questions_intro = [questions_intro]
-                    line_styles_questions_intro = ['subtopic']
-                    clip_questions_intro = self.video_creator.create_image_clip(
-                        text_lines_questions_intro,
-                        'subtopic',
-                        line_styles_questions_intro,
-                        background_image_path,
-                        process_background=True
-                    )
-                    audio_tasks = [(questions_intro, 'iw')]
-                    audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                    clip_questions_intro = self.video_creator.create_clip(
-                        clip_questions_intro,
-                        [audio_results.get((questions_intro, 'iw'), "")],
-                        min_duration=3
-                    )
-                    transition = self.video_creator.slide_transition(clips[-1], clip_questions_intro)
-                    clips.append(transition)
-                    clips.append(clip_questions_intro)
-
-                    for question_entry in comprehension_questions:
-                        question = question_entry['question']
-                        options = question_entry['options']
-                        correct_answer = question_entry['answer']  # אינדקס בין 0 ל-...
-                        text_lines = [question] + options
-                        line_styles = ['question'] + ['translation'] * len(options)
-
-                        clip_question = self.video_creator.create_image_clip(
-                            text_lines,
-                            'question',
-                            line_styles,
-                            background_image_path,
-                            process_background=True
-                        )
-                        audio_tasks = [(question, 'iw')] + [(opt, 'iw') for opt in options]
-                        audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                        audio_paths = [audio_results.get((text, 'iw'), "") for text in [question] + options]
-                        clip_question = self.video_creator.create_clip(
-                            clip_question,
-                            audio_paths,
-                            min_duration=5
-                        )
-                        clips.append(clip_question)
-
-                        # הארכת הקליפ ב-3 שניות
-                        clip_question = clip_question.set_duration(clip_question.duration + 3)
-                        clips[-1] = clip_question
-
-                        # סימון התשובה הנכונה
-                        correct_answer_text = options[correct_answer]
-                        highlight_option = (1 + correct_answer, 0)  # שורה 1 + אינדקס התשובה, קטע 0
-                        clip_answer = self.video_creator.create_image_clip(
-                            text_lines,
-                            'question',
-                            line_styles,
-                            background_image_path,
-                            process_background=True,
-                            highlight_option=highlight_option
-                        )
-
-                        narration_text = "התשובה הנכונה היא"
-                        audio_tasks = [
-                            (narration_text, 'iw'),
-                            (correct_answer_text, 'iw')
-                        ]
-                        audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                        audio_paths = [
-                            audio_results.get((narration_text, 'iw'), ""),
-                            audio_results.get((correct_answer_text, 'iw'), "")
-                        ]
-                        clip_answer = self.video_creator.create_clip(
-                            clip_answer,
-                            audio_paths,
-                            min_duration=3
-                        )
-                        clip_answer = clip_answer.set_duration(clip_answer.duration + 3)
-                        clips.append(clip_answer)
-
-                # קריאה לפעולה
-                if call_to_action:
-                    clip_outro = self.video_creator.create_outro(call_to_action, background_image_path)
-                    if clip_outro:
-                        transition = self.video_creator.slide_transition(clips[-1], clip_outro)
-                        clips.append(transition)
-                        clips.append(clip_outro)
-
-                # קליפ לוגו
-                logo_intro = "תודה שצפיתם!"
-                text_lines_logo_intro = [logo_intro]
-                line_styles_logo_intro = ['subtopic']
-                clip_logo_intro = self.video_creator.create_image_clip(
-                    text_lines_logo_intro,
-                    'subtopic',
-                    line_styles_logo_intro,
-                    background_image_path,
-                    process_background=True
-                )
-                audio_tasks = [(logo_intro, 'iw')]
-                audio_results = self.video_creator.audio_creator.create_audios(audio_tasks)
-                clip_logo_intro = self.video_creator.create_clip(
-                    clip_logo_intro,
-                    [audio_results.get((logo_intro, 'iw'), "")],
-                    min_duration=3
-                )
-                transition = self.video_creator.slide_transition(clips[-1], clip_logo_intro)
-                clips.append(transition)
-                clips.append(clip_logo_intro)
-
-                logo_clip = self.video_creator.add_logo_clip(duration=5, background_image_path=background_image_path)
-                if logo_clip:
-                    transition = self.video_creator.slide_transition(clips[-1], logo_clip)
-                    clips.append(transition)
-                    clips.append(logo_clip)
+                audio_creator = self.video_creator.audio_creator
+                sent_before = len(audio_creator.sent_tasks)
+                renderer = StoryClipRenderer(self.video_creator, background_image_path)
+                for clip in renderer.render(timeline):
+                    clips.append(clip)
+                check_tts_usage(timeline, audio_creator, audio_creator.sent_tasks[sent_before:])
 
                 # איחוד הקליפים
                 logging.info(f"איחוד הקליפים לסרטון: {video_title}")
@@ -1180,6 +642,7 @@ class VideoAssembler:
                     audio_codec='aac',
                     threads=THREADS
                 )
+                self.render_stats.record('story', final_clip.duration, time.perf_counter() - start_time)
 
                 # יצירת תמונת תצוגה מקדימה
                 thumbnail_path = os.path.join(thumbnails_dir, f"{safe_title}_thumbnail.png")
@@ -1195,8 +658,56 @@ class VideoAssembler:
                     final_clip.close()
 
 
-def main():
-    file_manager = FileManager(OUTPUT_DIR, THUMBNAILS_DIR)
+def layout_check(data, style_definitions):
+    """
+    מצב --layout-check: מודד את כל השקופיות בקובץ ומדווח על חריגות, ללא TTS וללא קידוד.
+    """
+    image_creator = ImageCreator(styles=style_definitions)
+    video_assembler = VideoAssembler(None, image_creator, None, style_definitions)
+    offenders = run_layout_check(
+        list(video_assembler.iter_layout_slides(data)),
+        lambda text_lines, line_styles: image_creator.measure_layout(text_lines, style_definitions, line_styles),
+        MAX_TEXT_WIDTH,
+        VIDEO_SIZE
+    )
+    sys.exit(1 if offenders else 0)
+
+
+def estimate(data, style_definitions):
+    """
+    מצב --estimate: אורך משוער, תווי TTS וזמן רינדור לכל סיפור בקובץ, ללא TTS וללא קידוד.
+    """
+    video_assembler = VideoAssembler(None, None, None, style_definitions)
+    videos = [data] if isinstance(data, dict) else data
+    timelines = [video_assembler.build_story_timeline(video_data) for video_data in videos]
+    estimate_timelines(timelines, AudioCreator(None), 'story')
+    sys.exit(0)
+
+
+def parse_args(argv):
+    """
+    קורא את ארגומנטי שורת הפקודה: <שם הסיפור> [--layout-check] [--estimate].
+    """
+    global LAYOUT_CHECK, ESTIMATE, json_name, JSON_FILE
+    LAYOUT_CHECK, cli_args = split_layout_check_flag(argv)
+    ESTIMATE, cli_args = split_estimate_flag(cli_args)
+    json_name = str(cli_args[0])
+    JSON_FILE = os.path.join(DATA_DIR, f'{json_name}.json')
+
+
+def load_render_modules():
+    """
+    ייבוא MoviePy נדחה עד שמגיעים לרינדור בפועל (ספריית ה-TTS נטענת ב-AudioCreator),
+    כך ש---layout-check ושגיאות ארגומנטים לא משלמים על טעינתם ועל בדיקת ffmpeg.
+    """
+    global AudioFileClip, CompositeAudioClip, ImageClip, concatenate_videoclips, audio_loop
+    from moviepy.editor import AudioFileClip, CompositeAudioClip, ImageClip, concatenate_videoclips
+    from moviepy.audio.fx.audio_loop import audio_loop
+
+
+def main(argv=None):
+    parse_args(sys.argv[1:] if argv is None else argv)
+    file_manager = None
     audio_creator = None
 
     try:
@@ -1204,7 +715,11 @@ def main():
             data = json.load(f)
 
         with open(STYLES_JSON_FILE, 'r', encoding='utf-8') as f:
-            style_definitions = json.load(f)
+            raw_style_definitions = json.load(f)
+        style_definitions = compile_styles(
+            raw_style_definitions,
+            raw_style_definitions.get('line_spacing_normal', LINE_SPACING_NORMAL)
+        )
 
         required_styles = {
             "normal",
@@ -1235,6 +750,14 @@ def main():
             )
             sys.exit(1)
 
+        if LAYOUT_CHECK:
+            layout_check(data, style_definitions)
+
+        if ESTIMATE:
+            estimate(data, style_definitions)
+
+        load_render_modules()
+        file_manager = FileManager(OUTPUT_DIR, THUMBNAILS_DIR)
         image_creator = ImageCreator(styles=style_definitions)
         audio_creator = AudioCreator(file_manager.temp_dir)
         video_assembler = VideoAssembler(file_manager, image_creator, audio_creator, style_definitions)
@@ -0,0 +1,149 @@
+import os
+import json
+import logging
+
+from audio_creator import speaking_rate
+
+# הערכה לפני רינדור: אורך כל סרטון, תווי TTS לחיוב (לפי קול) וזמן רינדור צפוי.
+# אורכי האודיו נלקחים ממדידות קודמות (TtsDurations) או ממודל תווים לשנייה לכל קול,
+# וזמן הרינדור מקצב הרינדור שנמדד בהרצות קודמות (RenderStats).
+
+ESTIMATE_FLAG = '--estimate'
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RENDER_STATS_PATH = os.path.join(BASE_DIR, '..', 'output', 'cache', 'render_stats.json')
+
+# קצב רינדור ברירת מחדל (שניות וידאו לכל שניית עבודה, כולל TTS וקידוד) כשאין מדידות לסוג הסרטון
+DEFAULT_RENDER_SPEED = 0.5
+
+
+def split_estimate_flag(argv):
+    """
+    מפריד את הדגל --estimate מארגומנטי שורת הפקודה.
+    מחזיר (האם הדגל הופיע, שאר הארגומנטים).
+    """
+    args = [arg for arg in argv if arg != ESTIMATE_FLAG]
+    return len(args) != len(argv), args
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class RenderStats:
+    """
+    סך אורך הסרטונים וזמן היצירה שלהם לכל סוג סרטון (levels, shorts, story).
+    """
+    def __init__(self, path=RENDER_STATS_PATH):
+        self.path = path
+        self.stats = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.stats = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"לא ניתן לקרוא את קובץ מדידות הרינדור {path}: {e}")
+
+    def record(self, kind, video_seconds, render_seconds):
+        # MoviePy מחזיר משך מסוג numpy (int64) כשכל משכי הקליפים שלמים, ו-json לא יודע לשמור אותו
+        video_seconds, render_seconds = float(video_seconds), float(render_seconds)
+        entry = self.stats.setdefault(kind, {'videos': 0, 'video_seconds': 0, 'render_seconds': 0})
+        entry['videos'] += 1
+        entry['video_seconds'] = round(entry['video_seconds'] + video_seconds, 2)
+        entry['render_seconds'] = round(entry['render_seconds'] + render_seconds, 2)
+        logging.info(f"קצב רינדור: {video_seconds / render_seconds:.2f} שניות וידאו לשנייה ({format_duration(render_seconds)} לסרטון)")
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def speed(self, kind):
+        """
+        מחזיר (שניות וידאו לכל שניית רינדור, האם נמדד בפועל).
+        """
+        entry = self.stats.get(kind)
+        if entry and entry['render_seconds'] > 0:
+            return entry['video_seconds'] / entry['render_seconds'], True
+        return DEFAULT_RENDER_SPEED, False
+
+
+def tts_usage(tasks, audio_creator):
+    """
+    מחזיר (מספר בקשות TTS, תווים לחיוב לפי קול) עבור רשימת משימות.
+    """
+    chars = {}
+    for task in tasks:
+        voice_name = audio_creator.voice_for(task[1])[1]
+        chars[voice_name] = chars.get(voice_name, 0) + len(audio_creator.clean_text(task[0]))
+    return len(tasks), chars
+
+
+def check_tts_usage(timeline, audio_creator, sent_tasks):
+    """
+    משווה את בקשות ה-TTS שנשלחו בפועל ברינדור ציר הזמן להערכה של estimate_timelines, ומזהיר על סטייה.
+    מחזיר True אם הן תואמות.
+    """
+    expected_requests, expected_chars = tts_usage(timeline.audio_tasks(), audio_creator)
+    sent_requests, sent_chars = tts_usage(sent_tasks, audio_creator)
+    if (expected_requests, expected_chars) != (sent_requests, sent_chars):
+        logging.warning(
+            f"{timeline.name}: נשלחו {sent_requests} בקשות TTS ({sum(sent_chars.values())} תווים), "
+            f"אבל ההערכה היא {expected_requests} בקשות ({sum(expected_chars.values())} תווים)"
+        )
+        return False
+    return True
+
+
+def estimate_timelines(timelines, audio_creator, kind, render_stats=None):
+    """
+    מעריך את אורך הסרטונים, תווי ה-TTS וזמן הרינדור עבור רשימת צירי זמן, ומדפיס דוח.
+    audio_creator משמש רק לבחירת הקול (voice_for) ולניקוי הטקסט (clean_text), בלי להתחבר ל-TTS.
+    """
+    durations = audio_creator.durations
+    speed, speed_measured = (render_stats or RenderStats()).speed(kind)
+
+    def task_duration(task):
+        text, lang = task[0], task[1]
+        slow = len(task) == 3 and task[2]
+        voice_name = audio_creator.voice_for(lang)[1]
+        return durations.duration(voice_name, speaking_rate(slow), audio_creator.clean_text(text))
+
+    total_duration = 0
+    total_chars = {}
+    total_tasks = measured_tasks = 0
+
+    for timeline in timelines:
+        duration = timeline.estimate_duration(lambda task: task_duration(task)[0])
+        tasks = timeline.audio_tasks()
+        _, chars = tts_usage(tasks, audio_creator)
+        measured_tasks += sum(task_duration(task)[1] for task in tasks)
+
+        logging.info(
+            f"{timeline.name}: {len(timeline.segments)} מקטעים, אורך משוער {format_duration(duration)}, "
+            f"{len(tasks)} בקשות TTS, {sum(chars.values())} תווים, רינדור משוער {format_duration(duration / speed)}"
+        )
+        total_duration += duration
+        total_tasks += len(tasks)
+        for voice_name, count in chars.items():
+            total_chars[voice_name] = total_chars.get(voice_name, 0) + count
+
+    logging.info(
+        f"סה\"כ {len(timelines)} סרטונים: אורך משוער {format_duration(total_duration)}, "
+        f"רינדור משוער {format_duration(total_duration / speed)} "
+        f"({'לפי' if speed_measured else 'ללא'} מדידות קודמות, {speed:.2f} שניות וידאו לשנייה)"
+    )
+    logging.info(f"אורכי אודיו: {measured_tasks}/{total_tasks} בקשות TTS נמדדו בהרצות קודמות, השאר לפי תווים לשנייה")
+    for voice_name, count in sorted(total_chars.items()):
+        logging.info(f"תווי TTS לחיוב בקול {voice_name}: {count}")
+
+    return {
+        'videos': len(timelines),
+        'duration': total_duration,
+        'render_seconds': total_duration / speed,
+        'tts_requests': total_tasks,
+        'tts_chars': total_chars,
+    }
@@ -0,0 +1,46 @@
+import os
+import logging
+import threading
+from PIL import ImageFont
+
+# תיקיית הגופנים המשותפת לכל סקריפטי הבנייה
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'fonts')
+
+# מאגר גופנים ברמת התהליך, לפי (נתיב, גודל)
+_fonts = {}
+_lock = threading.Lock()
+
+
+def get_font(font_path, font_size):
+    """
+    מחזיר אובייקט FreeTypeFont משותף עבור (font_path, font_size).
+    הגופן נטען מהדיסק פעם אחת בלבד לכל תהליך.
+    נתיב יחסי נפתר ביחס ל-FONTS_DIR.
+    """
+    key = (font_path, font_size)
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+
+    with _lock:
+        font = _fonts.get(key)
+        if font is None:
+            try:
+                font = ImageFont.truetype(os.path.join(FONTS_DIR, font_path), font_size)
+            except IOError:
+                logging.error(f"לא ניתן למצוא את הגופן בנתיב: {font_path}")
+                raise
+            _fonts[key] = font
+    return font
+
+
+def preload_fonts(style_definitions):
+    """
+    טוען מראש את כל הגופנים שמוגדרים בקובץ העיצובים, כך שהציור עצמו לא ייגש לדיסק.
+    """
+    loaded = 0
+    for style in style_definitions.values():
+        if isinstance(style, dict) and style.get('font_path') and style.get('font_size'):
+            get_font(style['font_path'], style['font_size'])
+            loaded += 1
+    logging.info(f"נטענו מראש {len(_fonts)} גופנים ({loaded} סגנונות)")
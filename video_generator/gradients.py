@@ -0,0 +1,32 @@
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+
+@lru_cache(maxsize=None)
+def _gradient_image(size, start_color, end_color, direction):
+    width, height = size
+    length = height if direction == 'vertical' else width
+
+    # אינטרפולציה לינארית על כל הערוצים בבת אחת (int() חותך כמו בלולאת putpixel המקורית)
+    ratio = (np.arange(length, dtype=np.float64) / length)[:, None]
+    start = np.asarray(start_color, dtype=np.float64)
+    end = np.asarray(end_color, dtype=np.float64)
+    line = (start * (1 - ratio) + end * ratio).astype(np.uint8)
+
+    if direction == 'vertical':
+        pixels = np.broadcast_to(line[:, None, :], (height, width, len(start_color)))
+    else:
+        pixels = np.broadcast_to(line[None, :, :], (height, width, len(start_color)))
+
+    mode = 'RGBA' if len(start_color) == 4 else 'RGB'
+    return Image.fromarray(np.ascontiguousarray(pixels), mode)
+
+
+def linear_gradient(size, start_color, end_color, direction='vertical'):
+    """
+    מחזיר תמונת מעבר צבע לינארי (RGB או RGBA לפי מספר הערוצים בצבעים).
+    התמונה נבנית כמערך NumPy ונשמרת במטמון לפי (גודל, צבעים, כיוון); מוחזר עותק שניתן לצייר עליו.
+    """
+    return _gradient_image(tuple(size), tuple(start_color), tuple(end_color), direction).copy()
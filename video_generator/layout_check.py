@@ -0,0 +1,67 @@
+import logging
+import time
+
+from PIL import Image, ImageDraw
+
+# דגל שורת הפקודה להפעלת בדיקת פריסה בלבד (ללא TTS וללא קידוד)
+LAYOUT_CHECK_FLAG = '--layout-check'
+
+
+def split_layout_check_flag(argv):
+    """
+    מפריד את הדגל --layout-check מארגומנטי שורת הפקודה.
+    מחזיר (האם הדגל הופיע, שאר הארגומנטים).
+    """
+    args = [arg for arg in argv if arg != LAYOUT_CHECK_FLAG]
+    return len(args) != len(argv), args
+
+
+def measuring_draw():
+    """
+    אובייקט ציור זעיר לצורך מדידת טקסט בלבד - textbbox אינו תלוי בגודל התמונה.
+    """
+    return ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+
+def run_layout_check(slides, measure, max_text_width, video_size, worst_count=10):
+    """
+    מריץ את שלב המדידה והגלישה על כל השקופיות ומדווח על חריגות.
+    slides - רשימת (תיאור, text_lines, line_styles).
+    measure - פונקציה שמקבלת (text_lines, line_styles) ומחזירה (רוחבי השורות, גובה כולל).
+    מחזיר את מספר השקופיות החורגות.
+    """
+    start_time = time.perf_counter()
+    _, frame_height = video_size
+    offenders = []
+    slide_count = 0
+
+    for label, text_lines, line_styles in slides:
+        slide_count += 1
+        line_widths, total_height = measure(text_lines, line_styles)
+
+        width_overflow = max(line_widths, default=0) - max_text_width
+        height_overflow = total_height - frame_height
+
+        for line_idx, width in enumerate(line_widths):
+            if width > max_text_width:
+                logging.warning(
+                    f"[{label}] שורה {line_idx + 1} ברוחב {width:.0f}px חורגת מ-MAX_TEXT_WIDTH ({max_text_width}px)"
+                )
+        if height_overflow > 0:
+            logging.warning(
+                f"[{label}] גובה כולל {total_height:.0f}px חורג מגובה המסך ({frame_height}px)"
+            )
+
+        if width_overflow > 0 or height_overflow > 0:
+            offenders.append((max(width_overflow, height_overflow), label, text_lines))
+
+    elapsed = time.perf_counter() - start_time
+    logging.info(f"בדיקת פריסה: {slide_count} שקופיות נמדדו תוך {elapsed:.2f} שניות, {len(offenders)} חורגות")
+
+    if offenders:
+        offenders.sort(key=lambda offender: offender[0], reverse=True)
+        logging.info(f"החריגות הגדולות ביותר ({min(worst_count, len(offenders))}):")
+        for overflow, label, text_lines in offenders[:worst_count]:
+            logging.info(f"  {overflow:.0f}px  [{label}]  {' | '.join(text_lines)}")
+
+    return len(offenders)
@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import logging
+import hashlib
+import colorsys
+import threading
+
+import numpy as np
+from PIL import Image
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKGROUNDS_DIR = os.path.join(BASE_DIR, '..', 'assets', 'backgrounds')
+PALETTE_INDEX_PATH = os.path.join(BASE_DIR, '..', 'output', 'cache', 'palette_index.json')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+SAMPLE_SIZE = (100, 100)   # הקטנת התמונה לפני האשכול
+QUANTIZE_BITS = 5          # 32 רמות לכל ערוץ - מאחד גוונים כמעט זהים
+NUM_COLORS = 2             # צבע עיקרי ומשני
+KMEANS_ITERATIONS = 10
+
+
+def get_contrasting_color(rgb):
+    """
+    מחשב צבע מנוגד לצבע נתון על בסיס לומיננסיה.
+    :param rgb: tuple של (R, G, B)
+    :return: tuple של הצבע המנוגד (R, G, B)
+    """
+    # חשב את לומיננסיית הצבע
+    r, g, b = rgb
+    luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
+
+    # אם הלומיננסיה גבוהה, בחר צבע כהה, אחרת בחר צבע בהיר
+    if luminance > 0.5:
+        return (0, 0, 0)  # שחור
+    else:
+        return (255, 255, 255)  # לבן
+
+
+def get_diverse_contrasting_color(rgb):
+    """
+    מחשב צבע מנוגד מגוון לצבע נתון על בסיס לומיננסיה וחילוף גוונים.
+    :param rgb: tuple של (R, G, B)
+    :return: tuple של הצבע המנוגד והמעודן (R, G, B)
+    """
+    # חשב את לומיננסיית הצבע
+    r, g, b = rgb
+    luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
+
+    # המרה מ-RGB ל-HSL
+    h, l, s = colorsys.rgb_to_hls(r/255, g/255, b/255)
+
+    # הוספת שינוי לגוון כדי ליצור גיוון בצבעים המנוגדים
+    h_new = (h + 0.5) % 1.0  # הוספת 180 מעלות בגוון
+
+    # הגברת הסאטורציה כדי לשמור על צבעוניות
+    s_new = min(s * 1.2, 1.0)
+
+    # התאמת הלומיננסיה
+    if luminance > 0.5:
+        l_new = 0.2  # צבע כהה
+    else:
+        l_new = 0.8  # צבע בהיר
+
+    # המרה חזרה ל-RGB
+    r_new, g_new, b_new = colorsys.hls_to_rgb(h_new, l_new, s_new)
+    return (int(r_new * 255), int(g_new * 255), int(b_new * 255))
+
+
+def extract_main_colors(image_path, num_colors=NUM_COLORS):
+    """
+    מחלץ את הצבעים העיקריים מתמונה באשכול KMeans על תמונה מוקטנת ומכומתת.
+    הצבעים ההתחלתיים הם הגוונים המכומתים הנפוצים ביותר, כך שהתוצאה דטרמיניסטית.
+    :return: רשימה של צבעים (RGB) ממוינת לפי גודל האשכול
+    """
+    with Image.open(image_path) as img:
+        img = img.convert('RGB').resize(SAMPLE_SIZE)
+        pixels = np.asarray(img, dtype=np.uint8).reshape(-1, 3)
+
+    # כימות: כל ערוץ נחתך ל-QUANTIZE_BITS ביטים, ומרכז התא משמש כנציג
+    shift = 8 - QUANTIZE_BITS
+    quantized = ((pixels >> shift) << shift) + (1 << shift >> 1)
+    colors, counts = np.unique(quantized, axis=0, return_counts=True)
+    if len(colors) == 0:
+        return []
+
+    # KMeans משוקלל על הגוונים הייחודיים במקום על כל הפיקסלים
+    k = min(num_colors, len(colors))
+    colors = colors.astype(np.float64)
+    weights = counts.astype(np.float64)
+    centers = colors[np.argsort(-counts, kind='stable')[:k]]
+    for _ in range(KMEANS_ITERATIONS):
+        distances = ((colors[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        new_centers = centers.copy()
+        for cluster in range(k):
+            mask = labels == cluster
+            if mask.any():
+                new_centers[cluster] = np.average(colors[mask], axis=0, weights=weights[mask])
+        if np.allclose(new_centers, centers):
+            break
+        centers = new_centers
+
+    sizes = np.bincount(labels, weights=weights, minlength=k)
+    order = np.argsort(-sizes, kind='stable')
+    return [tuple(int(round(channel)) for channel in centers[cluster]) for cluster in order]
+
+
+def _file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _build_entry(image_path, stat, file_hash):
+    main_colors = extract_main_colors(image_path)
+    dominant = main_colors[0] if main_colors else None
+    secondary = main_colors[1] if len(main_colors) > 1 else dominant
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': file_hash,
+        'dominant': dominant,
+        'secondary': secondary,
+        'contrasting': get_diverse_contrasting_color(dominant) if dominant else None,
+        'contrasting_secondary': get_diverse_contrasting_color(secondary) if secondary else None,
+    }
+
+
+class PaletteIndex:
+    """
+    אינדקס צבעים של תמונות הרקע, נשמר כקובץ JSON.
+    רשומה נבדקת לפי mtime וגודל הקובץ; אם השתנו, ה-sha1 מכריע אם לחשב מחדש.
+    """
+
+    def __init__(self, index_path=PALETTE_INDEX_PATH, backgrounds_dir=BACKGROUNDS_DIR):
+        self.index_path = index_path
+        self.backgrounds_dir = backgrounds_dir
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"לא ניתן לקרוא את אינדקס הצבעים {index_path}: {e}")
+
+    def _key(self, image_path):
+        return os.path.relpath(os.path.abspath(image_path), os.path.abspath(self.backgrounds_dir)).replace(os.sep, '/')
+
+    def lookup(self, image_path):
+        """
+        מחזיר את רשומת הצבעים של התמונה, ומחשב אותה רק אם הקובץ השתנה מאז האינדוקס.
+        """
+        key = self._key(image_path)
+        stat = os.stat(image_path)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                return entry
+
+            file_hash = _file_hash(image_path)
+            if entry and entry['sha1'] == file_hash:
+                # התוכן זהה (למשל אחרי checkout) - רק מרעננים את חותמת הזמן
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            else:
+                logging.info(f"מחשב צבעים עבור תמונת הרקע: {key}")
+                entry = _build_entry(image_path, stat, file_hash)
+            self.entries[key] = entry
+            self.dirty = True
+            return entry
+
+    def build(self):
+        """
+        מעדכן את האינדקס עבור כל התמונות בתיקיית הרקעים ומסיר רשומות של קבצים שנמחקו.
+        """
+        seen = set()
+        for root, _, files in os.walk(self.backgrounds_dir):
+            for filename in sorted(files):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    image_path = os.path.join(root, filename)
+                    self.lookup(image_path)
+                    seen.add(self._key(image_path))
+        for key in set(self.entries) - seen:
+            del self.entries[key]
+            self.dirty = True
+        return self
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temp_path, self.index_path)
+        self.dirty = False
+        logging.info(f"אינדקס הצבעים נשמר: {len(self.entries)} תמונות")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    index = PaletteIndex(backgrounds_dir=sys.argv[1] if len(sys.argv) > 1 else BACKGROUNDS_DIR)
+    index.build().save()
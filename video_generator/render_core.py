@@ -0,0 +1,201 @@
+import os
+import re
+import random
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+from auto_fit import auto_fit, fits_box
+from layout_check import measuring_draw
+
+# ליבת הרינדור המשותפת לכל סקריפטי הבנייה (רמות, סרטונים קצרים, סיפורים).
+# כל סקריפט מגדיר רק את מה שייחודי לפורמט שלו: מידות, רקעים, סגנונות ורצף המקטעים.
+# MoviePy נטען בתוך המתודות, כך שמדידת פריסה אינה טוענת אותו.
+
+
+def sanitize_filename(filename):
+    """
+    מסיר תווים בלתי חוקיים משם קובץ ומחליף אותם ב-underscore.
+    """
+    return re.sub(r'[<>:"/\\|?*]', '_', filename)
+
+
+def is_hebrew(text):
+    for char in text:
+        if '\u0590' <= char <= '\u05FF':
+            return True
+    return False
+
+
+def process_hebrew_text(text):
+    reshaped_text = arabic_reshaper.reshape(text)
+    bidi_text = get_display(reshaped_text)
+    return bidi_text
+
+
+def remove_asterisks(text):
+    return text.replace("**", "")
+
+
+class FileManager:
+    def __init__(self, output_dir, thumbnails_dir, lang_code=None):
+        # תיקיות פלט ותמונות ממוזערות, עם תת-תיקייה לפי שפה אם ניתן קוד שפה
+        self.output_dir = os.path.join(output_dir, lang_code) if lang_code else output_dir
+        self.thumbnails_dir = os.path.join(thumbnails_dir, lang_code) if lang_code else thumbnails_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.thumbnails_dir, exist_ok=True)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def get_temp_path(self, filename):
+        sanitized_filename = sanitize_filename(filename)
+        return os.path.join(self.temp_dir.name, sanitized_filename)
+
+    def cleanup(self):
+        self.temp_dir.cleanup()
+
+
+class BaseImageCreator(ABC):
+    """
+    מדידה, גלישת שורות והתאמת גודל גופן משותפות. כל פורמט מממש layout_lines ו-create_image.
+    """
+    max_text_width = None
+    max_text_height = None
+    fit_styles = frozenset({'normal'})  # סגנונות שמוקטנים תמיד יחד עם סגנונות השורות
+
+    def __init__(self, styles):
+        self.styles = styles
+        self.cache = {}
+
+    def split_text_into_lines(self, text, font, max_width, draw):
+        words = text.split()
+        lines = []
+        current_line = ""
+
+        for word in words:
+            test_line = f"{current_line} {word}".strip()
+            bbox = draw.textbbox((0, 0), test_line, font=font)
+            width = bbox[2] - bbox[0]
+            if width <= max_width:
+                current_line = test_line
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = word
+
+        if current_line:
+            lines.append(current_line)
+
+        return lines
+
+    def parse_bold(self, text):
+        parts = re.split(r'(\*\*[^*]+\*\*)', text)
+        segments = []
+        for part in parts:
+            if part.startswith('**') and part.endswith('**'):
+                segments.append((part[2:-2], True))
+            else:
+                segments.append((part, False))
+        return segments
+
+    @abstractmethod
+    def layout_lines(self, text_lines, style_definitions, line_styles, draw):
+        """
+        שלב המדידה והגלישה: מחזיר (processed_lines, total_height).
+        """
+
+    def line_widths(self, processed_lines):
+        return [sum(segment[1] for segment in line_info) for line_info, _, _ in processed_lines]
+
+    def fit_layout(self, text_lines, style_definitions, line_styles, draw):
+        """
+        פריסה עם התאמת גודל גופן אוטומטית: הגודל הגדול ביותר (בגבולות min_font_size/max_font_size של הסגנונות)
+        שבו הטקסט נכנס לתיבה max_text_width x max_text_height.
+        """
+        box = (self.max_text_width, self.max_text_height)
+        _, layout = auto_fit(
+            (tuple(text_lines), tuple(line_styles or []), box),
+            style_definitions,
+            set(line_styles or []) | self.fit_styles,
+            lambda styles: self.layout_lines(text_lines, styles, line_styles, draw),
+            lambda layout: fits_box(self.line_widths(layout[0]), layout[1], box)
+        )
+        return layout
+
+    def measure_layout(self, text_lines, style_definitions, line_styles=None):
+        processed_lines, total_height = self.fit_layout(text_lines, style_definitions, line_styles, measuring_draw())
+        return self.line_widths(processed_lines), total_height
+
+
+class BaseVideoCreator:
+    """
+    יצירת קליפים משותפת: שמירת שקופית כקליפ, חיבור אודיו ומעברי החלקה.
+    """
+    video_size = None
+    transition_directions = ('left', 'right', 'up', 'down')
+
+    def __init__(self, file_manager, image_creator, audio_creator, style_definitions):
+        self.file_manager = file_manager
+        self.image_creator = image_creator
+        self.audio_creator = audio_creator
+        self.style_definitions = style_definitions
+
+    def save_image_clip(self, img, text_lines):
+        from moviepy.editor import ImageClip
+
+        filename = f"{'_'.join([sanitize_filename(line) for line in text_lines])}.png"
+        temp_image_path = self.file_manager.get_temp_path(filename)
+        img.save(temp_image_path)
+        return ImageClip(temp_image_path)
+
+    def create_audio_clips(self, audio_paths):
+        from moviepy.editor import AudioFileClip, concatenate_audioclips
+
+        audio_clips = []
+        for path in audio_paths:
+            if os.path.exists(path):
+                audio_clip = AudioFileClip(path)
+                audio_clips.append(audio_clip)
+            else:
+                logging.warning(f"אודיו לא נמצא בנתיב: {path}")
+        if audio_clips:
+            return concatenate_audioclips(audio_clips)
+        else:
+            return None
+
+    def create_clip(self, image_clip, audio_paths, min_duration=0):
+        audio_total = self.create_audio_clips(audio_paths)
+        if audio_total:
+            duration = max(audio_total.duration, min_duration)
+            image_clip = image_clip.set_duration(duration)
+            image_clip = image_clip.set_audio(audio_total)
+        else:
+            image_clip = image_clip.set_duration(min_duration)
+        return image_clip
+
+    def slide_transition(self, clip1, clip2, duration=1):
+        from moviepy.editor import CompositeVideoClip
+
+        width, height = self.video_size
+        direction = random.choice(self.transition_directions)
+        if direction == 'left':
+            move_out = lambda t: (-width * t / duration, 'center')
+            move_in = lambda t: (width - width * t / duration, 'center')
+        elif direction == 'right':
+            move_out = lambda t: (width * t / duration, 'center')
+            move_in = lambda t: (-width + width * t / duration, 'center')
+        elif direction == 'up':
+            move_out = lambda t: ('center', -height * t / duration)
+            move_in = lambda t: ('center', height - height * t / duration)
+        else:  # direction == 'down'
+            move_out = lambda t: ('center', height * t / duration)
+            move_in = lambda t: ('center', -height + height * t / duration)
+
+        clip1_moving = clip1.set_position(move_out).set_duration(duration)
+        clip2_moving = clip2.set_position(move_in).set_duration(duration)
+
+        transition = CompositeVideoClip([clip1_moving, clip2_moving], size=self.video_size).set_duration(duration)
+        transition = transition.set_audio(None)
+        return transition
@@ -0,0 +1,100 @@
+import logging
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+from PIL import ImageFont
+
+import font_registry
+
+
+@dataclass(frozen=True, slots=True)
+class TextStyle:
+    """
+    סגנון מהודר ובלתי ניתן לשינוי: גופן טעון, צבעים כ-tuple וכלל ריווח.
+    נבנה פעם אחת בעליית הסקריפט במקום העתקות והמרות בכל שורה.
+    """
+    name: str
+    font_path: str
+    font_size: int
+    font: ImageFont.FreeTypeFont
+    text_color: Tuple[int, ...]
+    line_spacing: int
+    min_font_size: int
+    max_font_size: int
+    stroke_color: Optional[Tuple[int, ...]] = None
+    stroke_width: Optional[int] = None
+    outline_color: Optional[Tuple[int, ...]] = None
+    outline_width: Optional[int] = None
+    bg_color: Optional[Tuple[int, ...]] = None
+    border_color: Optional[Tuple[int, ...]] = None
+    border_width: Optional[int] = None
+    gradient: Optional[Tuple[Tuple[int, ...], ...]] = None
+    gradient_direction: str = 'vertical'
+    background_image: bool = False
+
+    @property
+    def has_stroke(self):
+        return self.stroke_color is not None and self.stroke_width is not None
+
+    @property
+    def has_outline(self):
+        return self.outline_color is not None and self.outline_width is not None
+
+    def scaled(self, percent):
+        """
+        מחזיר את הסגנון בגודל גופן של percent אחוזים, בתוך גבולות min_font_size/max_font_size.
+        """
+        font_size = min(max(round(self.font_size * percent / 100), self.min_font_size), self.max_font_size)
+        if font_size == self.font_size:
+            return self
+        return replace(self, font_size=font_size, font=font_registry.get_font(self.font_path, font_size))
+
+    def with_colors(self, **colors):
+        """
+        מחזיר עותק של הסגנון עם צבעים חדשים (רשימות מומרות ל-tuple).
+        """
+        return replace(self, **{key: _color(value) for key, value in colors.items()})
+
+
+def _color(value):
+    return tuple(value) if value is not None else None
+
+
+def compile_style(name, definition, line_spacing):
+    gradient = definition.get('gradient')
+    return TextStyle(
+        name=name,
+        font_path=definition['font_path'],
+        font_size=definition['font_size'],
+        font=font_registry.get_font(definition['font_path'], definition['font_size']),
+        text_color=_color(definition.get('text_color', (0, 0, 0))),
+        line_spacing=line_spacing,
+        min_font_size=definition.get('min_font_size', definition['font_size']),
+        max_font_size=definition.get('max_font_size', definition['font_size']),
+        stroke_color=_color(definition.get('stroke_color')),
+        stroke_width=definition.get('stroke_width'),
+        outline_color=_color(definition.get('outline_color')),
+        outline_width=definition.get('outline_width'),
+        bg_color=_color(definition.get('bg_color')),
+        border_color=_color(definition.get('border_color')),
+        border_width=definition.get('border_width'),
+        gradient=tuple(tuple(color) for color in gradient) if gradient else None,
+        gradient_direction=definition.get('gradient_direction', 'vertical'),
+        background_image=bool(definition.get('background_image')),
+    )
+
+
+def compile_styles(style_definitions, line_spacing, spacing_rules=None):
+    """
+    מהדר את קובץ העיצובים (JSON) למילון של TextStyle לפי שם הסגנון.
+    line_spacing הוא מרווח ברירת המחדל אחרי שורה, ו-spacing_rules ממפה שם סגנון למרווח שונה.
+    ערכים שאינם סגנונות (כמו line_spacing_normal בקובץ הסיפורים) מדולגים.
+    """
+    spacing_rules = spacing_rules or {}
+    compiled = {}
+    for name, definition in style_definitions.items():
+        if not isinstance(definition, dict) or 'font_path' not in definition:
+            continue
+        compiled[name] = compile_style(name, definition, spacing_rules.get(name, line_spacing))
+    logging.info(f"הודרו {len(compiled)} סגנונות")
+    return compiled
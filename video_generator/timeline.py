@@ -0,0 +1,124 @@
+import os
+import json
+import hashlib
+import logging
+from dataclasses import dataclass, replace
+
+# ייצוג ביניים של ציר הזמן: רשימת מקטעים שנבנית מקובץ ה-JSON ללא רינדור,
+# ורנדרר שהופך אותה לקליפים. כל מקטע מתאר תמונה (שורות וסגנונות), אודיו (משימות TTS),
+# כלל משך ומעבר אל המקטע, כך שאפשר לחשב מפתח לכל מקטע, להריץ את ה-TTS של כל הסרטון
+# במקביל ולהעריך את אורך הסרטון לפני הרינדור.
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    מקטע בציר הזמן. משך המקטע הוא max(אורך האודיו, min_duration) ועוד hold.
+    transition הוא המעבר מהמקטע הקודם אל המקטע הזה (None - חיתוך ישיר).
+    """
+    kind: str
+    label: str
+    text_lines: tuple
+    line_styles: tuple
+    lang_code: str
+    audio: tuple = ()  # משימות TTS: (טקסט, שפה) או (טקסט, שפה, האטה), מושמעות ברצף
+    min_duration: float = 0
+    hold: float = 0  # השהייה אחרי סוף האודיו
+    transition: str = None
+    transition_duration: float = 1
+    thumbnail: str = None  # שם קובץ לשמירת הפריים הראשון כתמונה ממוזערת
+    highlight: tuple = None  # (שורה, קטע) להדגשה בתמונה, למשל התשובה הנכונה בשאלה
+
+    def key(self):
+        """
+        מפתח יציב לתוכן המקטע (תמונה, אודיו ומשך), ללא התווית והמעבר.
+        """
+        content = [self.kind, self.text_lines, self.line_styles, self.lang_code, self.highlight,
+                   self.audio, self.min_duration, self.hold]
+        return hashlib.sha1(json.dumps(content, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def estimate_duration(self, audio_duration):
+        """
+        משך המקטע לפי audio_duration(task) - אורך מוערך בשניות לכל משימת TTS.
+        """
+        return max(sum(audio_duration(task) for task in self.audio), self.min_duration) + self.hold
+
+
+@dataclass(frozen=True)
+class Timeline:
+    name: str
+    segments: tuple = ()
+
+    def append(self, segment, pause_before=0):
+        """
+        מחזיר ציר זמן חדש עם המקטע בסופו. pause_before מאריך את המקטע הקודם.
+        """
+        segments = list(self.segments)
+        if pause_before and segments:
+            segments[-1] = replace(segments[-1], hold=segments[-1].hold + pause_before)
+        return replace(self, segments=tuple(segments) + (segment,))
+
+    def audio_tasks(self):
+        """
+        כל משימות ה-TTS של ציר הזמן, ללא כפילויות ולפי סדר הופעתן.
+        """
+        return list(dict.fromkeys(task for segment in self.segments for task in segment.audio))
+
+    def estimate_duration(self, audio_duration):
+        return sum(
+            segment.estimate_duration(audio_duration) + (segment.transition_duration if segment.transition and index else 0)
+            for index, segment in enumerate(self.segments)
+        )
+
+
+class ClipRenderer:
+    """
+    רנדרר MoviePy: יוצר את ה-TTS של כל ציר הזמן בבת אחת, ואז קליף לכל מקטע וקליף מעבר לפניו.
+    משתמש ב-create_image_clip, create_clip ו-slide_transition של ה-VideoCreator.
+    פורמטים עם רקע לכל סרטון או שקופיות מיוחדות (לוגו) דורסים את image_clip.
+    """
+    def __init__(self, video_creator, thumbnails_dir=None):
+        self.video_creator = video_creator
+        self.thumbnails_dir = thumbnails_dir
+
+    def image_clip(self, segment):
+        """
+        קליף התמונה של המקטע, או None אם לא ניתן ליצור אותו (המקטע מדולג).
+        """
+        return self.video_creator.create_image_clip(
+            list(segment.text_lines), segment.kind, list(segment.line_styles), segment.lang_code
+        )
+
+    def render_segment(self, segment, audio_results):
+        clip = self.image_clip(segment)
+        if clip is None:
+            return None
+        clip = self.video_creator.create_clip(
+            clip,
+            [audio_results.get(task, "") for task in segment.audio],
+            min_duration=segment.min_duration
+        )
+        if segment.hold:
+            clip = clip.set_duration(clip.duration + segment.hold)
+        return clip
+
+    def render(self, timeline):
+        """
+        מחזיר (generator) את קליפי המקטעים והמעברים לפי הסדר.
+        """
+        audio_results = self.video_creator.audio_creator.create_audios(timeline.audio_tasks())
+        previous_clip = None
+        for segment in timeline.segments:
+            clip = self.render_segment(segment, audio_results)
+            if clip is None:
+                continue
+
+            if segment.thumbnail and self.thumbnails_dir:
+                thumbnail_path = os.path.join(self.thumbnails_dir, segment.thumbnail)
+                clip.save_frame(thumbnail_path, t=0)
+                logging.info(f"שומר תמונת תצוגה מקדימה בנתיב: {thumbnail_path}")
+
+            if segment.transition == 'slide' and previous_clip is not None:
+                yield self.video_creator.slide_transition(previous_clip, clip, segment.transition_duration)
+            yield clip
+            previous_clip = clip